@@ -0,0 +1,279 @@
+"""
+KPI·분석 계산
+일별/상품 시트 DataFrame에서 KPI, 기간 필터, 성장률/효율성/변동성 지표를 계산 (Streamlit 없이 사용 가능)
+app.py와 벤치마크(benchmark.py)가 같은 함수를 사용
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from column_roles import resolve_roles
+from profiler import timed
+
+
+@timed("calc_kpis")
+def calc_kpis(df: pd.DataFrame):
+    # 컬럼 역할은 헤더 구성별로 한 번만 계산됨 (column_roles 캐시)
+    roles = resolve_roles(df.columns, "kpi")
+    total_revenue_col = roles["revenue"]
+    total_profit_col = roles["profit"]
+    avg_profit_rate_col = roles["profit_rate"]
+
+    total_revenue = pd.to_numeric(df[total_revenue_col], errors="coerce").sum() if total_revenue_col else 0
+    total_profit = pd.to_numeric(df[total_profit_col], errors="coerce").sum() if total_profit_col else 0
+
+    if total_revenue > 0 and total_profit != 0:
+        avg_profit_rate = (total_profit / total_revenue) * 100
+    elif avg_profit_rate_col:
+        avg_profit_rate = pd.to_numeric(df[avg_profit_rate_col], errors="coerce").mean()
+        if avg_profit_rate < 1: avg_profit_rate = avg_profit_rate * 100
+    else:
+        avg_profit_rate = 0
+
+    ad_cost_col = roles["ad_cost"]
+    
+    if ad_cost_col and total_revenue > 0:
+        total_ad_cost = pd.to_numeric(df[ad_cost_col], errors="coerce").sum()
+        if total_ad_cost > 0:
+            roas = total_revenue / total_ad_cost
+        else:
+            roas = 0
+    else:
+        roas = 0
+
+    return {
+        "total_revenue": total_revenue,
+        "total_profit": total_profit,
+        "avg_profit_rate": avg_profit_rate,
+        "roas": roas,
+        "total_revenue_col": total_revenue_col,
+        "total_profit_col": total_profit_col,
+    }
+
+
+@timed("prepare_daily_trend_data")
+def prepare_daily_trend_data(channel_data):
+    """일별 트렌드 데이터 준비"""
+    trend_data = {}
+    for ch, data in channel_data.items():
+        df = data["df"]
+        if "날짜" not in df.columns or df.empty:
+            continue
+        
+        date_col = "날짜"
+        revenue_col = data["kpi"]["total_revenue_col"]
+        profit_col = data["kpi"]["total_profit_col"]
+        
+        if revenue_col is None:
+            continue
+        
+        # 날짜별 데이터 정리
+        daily_df = df[[date_col, revenue_col]].copy()
+        if profit_col:
+            daily_df[profit_col] = df[profit_col]
+        
+        daily_df = daily_df.dropna(subset=[date_col])
+        daily_df = daily_df.sort_values(date_col)
+        daily_df[date_col] = pd.to_datetime(daily_df[date_col])
+        
+        trend_data[ch] = {
+            "df": daily_df,
+            "revenue_col": revenue_col,
+            "profit_col": profit_col
+        }
+    
+    return trend_data
+
+
+def calculate_growth_rates(channel_data, previous_month_data=None):
+    """성장률 계산 (전주, 전월, MoM, WoW)"""
+    growth_data = {}
+    today = datetime.now()
+    week_ago = today - timedelta(days=7)
+    
+    for ch, data in channel_data.items():
+        df = data["df"]
+        if "날짜" not in df.columns or df.empty:
+            continue
+        
+        date_col = "날짜"
+        revenue_col = data["kpi"]["total_revenue_col"]
+        if revenue_col is None:
+            continue
+        
+        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+        df = df.dropna(subset=[date_col])
+        
+        # 전주 대비 (최근 7일 vs 그 전 7일)
+        recent_7d = df[df[date_col] >= week_ago][revenue_col].sum()
+        prev_7d = df[(df[date_col] >= week_ago - timedelta(days=7)) & (df[date_col] < week_ago)][revenue_col].sum()
+        wow_growth = ((recent_7d - prev_7d) / prev_7d * 100) if prev_7d > 0 else 0
+        
+        # 전일 대비
+        if len(df) > 0:
+            latest_date = df[date_col].max()
+            latest_revenue = df[df[date_col] == latest_date][revenue_col].sum()
+            prev_date = latest_date - timedelta(days=1)
+            prev_revenue = df[df[date_col] == prev_date][revenue_col].sum() if len(df[df[date_col] == prev_date]) > 0 else 0
+            day_over_day = ((latest_revenue - prev_revenue) / prev_revenue * 100) if prev_revenue > 0 else 0
+        else:
+            day_over_day = 0
+        
+        # 전월 대비 (아카이빙 데이터 활용)
+        mom_growth = None
+        if previous_month_data and ch in previous_month_data:
+            prev_month_revenue = previous_month_data[ch].get("revenue", 0)
+            current_revenue = data["revenue"]
+            mom_growth = ((current_revenue - prev_month_revenue) / prev_month_revenue * 100) if prev_month_revenue > 0 else 0
+        
+        growth_data[ch] = {
+            "wow": wow_growth,
+            "day_over_day": day_over_day,
+            "mom": mom_growth,
+            "recent_7d": recent_7d,
+            "prev_7d": prev_7d
+        }
+    
+    return growth_data
+
+
+def calculate_efficiency_metrics(channel_data):
+    """효율성 지표 계산 (ROI, 광고비 효율성, 단위 광고비당 매출)"""
+    efficiency_data = {}
+    
+    for ch, data in channel_data.items():
+        revenue = data["revenue"]
+        profit = data["profit"]
+        roas = data["roas"]
+        
+        # 광고비 계산
+        ad_cost = (revenue / roas) if roas > 0 else 0
+        
+        # ROI (투자 대비 수익률)
+        roi = ((profit - ad_cost) / ad_cost * 100) if ad_cost > 0 else 0
+        
+        # 단위 광고비당 매출
+        revenue_per_ad_cost = (revenue / ad_cost) if ad_cost > 0 else 0
+        
+        efficiency_data[ch] = {
+            "roi": roi,
+            "ad_cost": ad_cost,
+            "revenue_per_ad_cost": revenue_per_ad_cost,
+            "efficiency_score": roi * 0.5 + roas * 0.3 + (revenue_per_ad_cost / 10) * 0.2  # 종합 효율성 점수
+        }
+    
+    return efficiency_data
+
+
+def calculate_volatility_metrics(channel_data):
+    """변동성 지표 계산 (표준편차, 변동계수)"""
+    volatility_data = {}
+    
+    for ch, data in channel_data.items():
+        df = data["df"]
+        if "날짜" not in df.columns or df.empty:
+            continue
+        
+        date_col = "날짜"
+        revenue_col = data["kpi"]["total_revenue_col"]
+        if revenue_col is None:
+            continue
+        
+        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+        df = df.dropna(subset=[date_col, revenue_col])
+        
+        if len(df) == 0:
+            continue
+        
+        revenues = df[revenue_col].values
+        mean_revenue = np.mean(revenues)
+        std_revenue = np.std(revenues)
+        cv = (std_revenue / mean_revenue * 100) if mean_revenue > 0 else 0  # 변동계수
+        
+        # 최고일 vs 평균
+        max_revenue = np.max(revenues)
+        avg_revenue = mean_revenue
+        max_vs_avg = ((max_revenue - avg_revenue) / avg_revenue * 100) if avg_revenue > 0 else 0
+        
+        volatility_data[ch] = {
+            "std": std_revenue,
+            "cv": cv,
+            "max_revenue": max_revenue,
+            "avg_revenue": avg_revenue,
+            "max_vs_avg": max_vs_avg
+        }
+    
+    return volatility_data
+
+
+def get_period_bounds(period_filter):
+    """기간 필터 → (시작일, 종료일). 제한이 없는 쪽은 None ("전체"면 (None, None))"""
+    if isinstance(period_filter, dict):
+        filter_type = period_filter.get("type", "전체")
+    else:
+        # 이전 형식 호환성
+        filter_type = period_filter
+    
+    # 오늘 날짜 (시간 제거, 날짜만)
+    today = datetime.now().date()
+    
+    if filter_type == "최근 7일":
+        return today - timedelta(days=7), None
+    elif filter_type == "최근 30일":
+        return today - timedelta(days=30), None
+    elif filter_type == "custom" and isinstance(period_filter, dict):
+        start_date = period_filter.get("start")
+        end_date = period_filter.get("end")
+        if start_date and end_date:
+            # Timestamp/datetime을 date로 변환
+            if hasattr(start_date, 'date'):
+                start_date = start_date.date()
+            if hasattr(end_date, 'date'):
+                end_date = end_date.date()
+            return start_date, end_date
+    
+    return None, None
+
+
+def apply_date_filter(df, date_col, period_filter):
+    """날짜 필터 적용 헬퍼 함수"""
+    if date_col not in df.columns:
+        return df
+    
+    # 날짜 컬럼이 datetime이 아니면 변환
+    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+    
+    # 날짜가 없는 행 제거
+    df = df.dropna(subset=[date_col])
+    
+    if len(df) == 0:
+        return df
+    
+    start_date, end_date = get_period_bounds(period_filter)
+    
+    # 행마다 date 객체를 만들지 않고 Timestamp 경계와 바로 비교 (시간은 무시)
+    if start_date is not None:
+        df = df[df[date_col] >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        df = df[df[date_col] < pd.Timestamp(end_date) + pd.Timedelta(days=1)]
+    
+    return df
+
+
+def build_daily_frame(df, kpi):
+    """일별 집계용 DataFrame(date, revenue, profit, ad_cost)과 광고비 컬럼 존재 여부 반환"""
+    ad_cost_col = resolve_roles(df.columns, "kpi")["ad_cost"]
+    
+    def numeric(col):
+        return pd.to_numeric(df[col], errors="coerce") if col and col in df.columns else 0.0
+    
+    daily = pd.DataFrame({
+        "date": pd.to_datetime(df["날짜"], errors="coerce"),
+        "revenue": numeric(kpi["total_revenue_col"]),
+        "profit": numeric(kpi["total_profit_col"]),
+        "ad_cost": numeric(ad_cost_col),
+    })
+    return daily.dropna(subset=["date"]), ad_cost_col is not None
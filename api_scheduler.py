@@ -0,0 +1,238 @@
+"""
+Google API 요청 스케줄러
+Sheets/Drive 호출을 프로세스 하나에서 모아 분당 쿼터 안에서 우선순위 순으로 내보냄
+
+- 쿼터: API별 토큰 버킷 (Sheets 읽기는 서비스 계정당 분당 60회가 기본 한도)
+- 우선순위: 실시간 시트 > 보고 있는 탭 > 백그라운드(미리 로딩/스냅샷 갱신) > 아카이브
+- 429/5xx/네트워크 오류는 지터를 준 지수 백오프로 재시도 (429면 같은 API의 다른 요청도 잠시 멈춤)
+→ 여러 사용자가 동시에 새로고침해도 빈 탭 대신 느린 로딩이 됨
+
+우선순위는 호출한 스레드 기준 (워커 스레드로 넘길 때는 with_priority로 감쌈)
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+import requests
+
+from profiler import count
+
+PRIORITY_LIVE = 0        # 실시간(이번 달) 스프레드시트
+PRIORITY_VISIBLE = 1     # 지금 보고 있는 탭 (기본값)
+PRIORITY_BACKGROUND = 2  # 이웃 탭 미리 로딩, 스냅샷 백그라운드 갱신
+PRIORITY_ARCHIVE = 3     # 아카이브 목록/저장, 기간 비교 미리 로딩
+
+PRIORITY_LABELS = {
+    PRIORITY_LIVE: "실시간",
+    PRIORITY_VISIBLE: "현재 탭",
+    PRIORITY_BACKGROUND: "백그라운드",
+    PRIORITY_ARCHIVE: "아카이브",
+}
+
+# API별 분당 요청 수 (버킷 크기 = 순간 최대 요청 수)
+API_QUOTAS_PER_MINUTE = {
+    "sheets": 60,
+    "drive": 600,
+}
+
+# 재시도: 최대 횟수, 백오프 기준/상한 (초)
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 32.0
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+_local = threading.local()
+
+
+def current_priority() -> int:
+    return getattr(_local, "priority", PRIORITY_VISIBLE)
+
+
+@contextmanager
+def api_priority(priority: int):
+    """이 블록 안에서 현재 스레드가 보내는 요청의 우선순위 지정"""
+    previous = current_priority()
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def with_priority(priority: int, func):
+    """다른 스레드에서 실행할 함수에 우선순위를 붙임 (ThreadPoolExecutor.submit용)"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with api_priority(priority):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def retry_status(error):
+    """
+    재시도할 오류면 HTTP 상태 코드(네트워크 오류는 0), 아니면 None
+
+    gspread APIError(response.status_code), googleapiclient HttpError(resp.status),
+    requests/httplib2 연결 오류를 모두 처리
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "resp", None), "status", None)
+    if status is not None:
+        status = int(status)
+        return status if status in RETRYABLE_STATUS else None
+    # gspread(requests)와 Drive 클라이언트(httplib2 소켓)의 연결 끊김/시간 초과
+    if isinstance(error, (ConnectionError, TimeoutError, requests.ConnectionError, requests.Timeout)):
+        return 0
+    return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """지터를 준 지수 백오프 (0 ~ min(상한, 기준 × 2^시도) 사이 균등 분포)"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def take(self, now: float) -> float:
+        """토큰을 하나 쓰고 0 반환, 없으면 다음 토큰까지 기다릴 시간(초)"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ApiScheduler:
+    """API별 토큰 버킷 + 우선순위 대기열 (스레드 안전, 호출은 요청한 스레드에서 실행)"""
+
+    def __init__(self, quotas: dict = None):
+        self._buckets = {api: _TokenBucket(n) for api, n in (quotas or API_QUOTAS_PER_MINUTE).items()}
+        self._waiting = {api: [] for api in self._buckets}  # API → [(우선순위, 순번)] 힙
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+
+    def _acquire(self, api: str, priority: int):
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            waiting = self._waiting[api]
+            heapq.heappush(waiting, ticket)
+            try:
+                while True:
+                    # 대기열 맨 앞(가장 높은 우선순위, 먼저 온 순)만 토큰을 가져감
+                    if waiting[0] == ticket:
+                        wait = self._buckets[api].take(time.monotonic())
+                        if wait == 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+                self._cond.notify_all()
+            self._in_flight += 1
+
+    def _release(self):
+        with self._cond:
+            self._in_flight -= 1
+
+    def _pause(self, api: str, seconds: float):
+        """쿼터 초과: 같은 API의 모든 요청을 잠시 멈춤"""
+        with self._cond:
+            bucket = self._buckets[api]
+            bucket.paused_until = max(bucket.paused_until, time.monotonic() + seconds)
+            bucket.tokens = 0.0
+            self._cond.notify_all()
+
+    def call(self, api: str, func, *args, priority: int = None, **kwargs):
+        """
+        쿼터/우선순위에 맞춰 func(*args, **kwargs) 실행, 재시도할 오류는 백오프 후 다시 시도
+
+        Args:
+            api: "sheets" 또는 "drive"
+            priority: None이면 현재 스레드의 우선순위 (api_priority)
+        """
+        if priority is None:
+            priority = current_priority()
+
+        attempt = 0
+        while True:
+            self._acquire(api, priority)
+            try:
+                with self._cond:
+                    self.calls += 1
+                return func(*args, **kwargs)
+            except Exception as e:
+                status = retry_status(e)
+                if status is None or attempt >= MAX_RETRIES:
+                    if status is not None:
+                        with self._cond:
+                            self.failures += 1
+                        count("api.failed")
+                    raise
+                delay = backoff_delay(attempt)
+                with self._cond:
+                    self.retries += 1
+                count("api.retry")
+                if status == 429:
+                    with self._cond:
+                        self.throttled += 1
+                    count("api.throttled")
+                    self._pause(api, delay)
+                attempt += 1
+            finally:
+                self._release()
+            time.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            return {
+                "queued": {api: len(w) for api, w in self._waiting.items()},
+                "queued_by_priority": {
+                    PRIORITY_LABELS.get(p, str(p)): n
+                    for p, n in sorted(Counter(t[0] for w in self._waiting.values() for t in w).items())
+                },
+                "in_flight": self._in_flight,
+                "paused_seconds": {api: round(max(0.0, b.paused_until - now), 1) for api, b in self._buckets.items()},
+                "calls": self.calls,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "failures": self.failures,
+            }
+
+
+# 프로세스 전체에서 공유 (모든 세션의 요청이 같은 쿼터를 씀)
+_scheduler = ApiScheduler()
+
+
+def get_scheduler() -> ApiScheduler:
+    return _scheduler
+
+
+def call_api(api: str, func, *args, priority: int = None, **kwargs):
+    """공유 스케줄러로 API 호출 (ApiScheduler.call 참고)"""
+    return _scheduler.call(api, func, *args, priority=priority, **kwargs)
@@ -1,30 +1,47 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 
 from datetime import datetime, timedelta
 import plotly.graph_objects as go
 import plotly.express as px
 
-from database import init_database, save_monthly_data, get_available_months, get_monthly_summary, delete_month_data, save_archive_metadata, get_daily_details
+from database import init_database, save_monthly_data, get_available_months, get_monthly_summary, delete_month_data, save_archive_metadata, get_daily_details, get_channel_daily_agg_fingerprint, save_channel_daily_agg, get_channel_range_totals, get_monthly_trend
+from snapshot_cache import get_sheet_values, invalidate_snapshots
+from sheet_parser import parse_sheet_values
+from column_roles import resolve_roles
+from analytics import calc_kpis, prepare_daily_trend_data, calculate_growth_rates, calculate_efficiency_metrics, calculate_volatility_metrics, get_period_bounds, apply_date_filter, build_daily_frame
+from sheets_client import SHEET_ID, ARCHIVE_FOLDER_ID, load_credentials, create_gspread_client, create_drive_service, fetch_tail_values, invalidate_spreadsheet_cache
+from archive_catalog import list_catalog_files
+from data_sources import create_data_source
+from single_flight import get_single_flight, single_flight
+from api_scheduler import PRIORITY_ARCHIVE, PRIORITY_BACKGROUND, api_priority, current_priority, get_scheduler, with_priority
+from archive_ingest import ingest_archives
+from local_archive import list_local_archives, load_archive_sheets, is_local_source, local_source_path
+from figure_cache import cached_figure
+from profiler import PROFILE_LOG_PATH, profiling_enabled, start_rerun, finish_rerun, mark, timed, count
+from downsample import downsample, chart_point_budget
 import io
 import json
-import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from io import BytesIO
+from gspread.exceptions import SpreadsheetNotFound, WorksheetNotFound
 
 # ============================
 # 0. 기본 설정
 # ============================
 
-SHEET_ID = "1lIiU5_agxG4PLsvMEIcGAJ6eVqHxLBBlzwxjiKX1mHE"
-JSON_PATH = "supermurray-dashboard-1ee87560d47f.json"
+# 시트/아카이브 폴더 ID와 인증 정보 경로는 sheets_client.py에서 관리 (CLI와 공유)
 
-# [신규] 아카이브 폴더 ID (Google Drive의 "supermurray 아카이브" 폴더)
-# 사용법: Google Drive에서 폴더 열기 → URL에서 folders/ 뒤의 ID 복사
-ARCHIVE_FOLDER_ID = "1buSvKM-TxFO6cwcHFmVuzMfAsyTp5veD"
+# [신규] 시트 병렬 로딩 시 동시에 요청할 최대 시트 수
+MAX_SHEET_WORKERS = 9
+
+# 탭 전환 시 이웃 탭 시트, 상세 비교 기간 선택 시 두 기간의 채널 시트를 미리 로딩하는 워커 수
+TAB_PREFETCH_WORKERS = 3
+
+# 트렌드 차트 전일 대비 증감률 라벨 최대 개수 (기간이 길면 일정 간격으로 솎아냄)
+TREND_CHANGE_LABEL_MAX = 31
 
 # [기존] 일별 매출 분석 시트
 SHEETS = {
@@ -43,6 +60,9 @@ PRODUCT_SHEETS = {
     "B2B_상품분석": "B2B_상품분석",
 }
 
+# Overview/월별 비교 대상 채널
+OVERVIEW_CHANNELS = ["이베이", "11번가", "B2B"]
+
 # [신규] 상품 분석 시트별 안내 문구 (Disclaimer)
 PRODUCT_DISCLAIMERS = {
     "통합_상품분석": """
@@ -585,217 +605,202 @@ def inject_css():
 # 2. Google Sheets 로딩 (캐싱 적용 & 배포 호환)
 # ============================
 
+@st.cache_resource
+def get_credentials():
+    try:
+        return load_credentials()
+    except json.JSONDecodeError:
+        st.error("환경 변수 GOOGLE_SHEETS_JSON 로딩 실패: JSON 형식이 올바르지 않습니다.")
+        return None
+
+# Sheets/Drive 클라이언트는 같은 인증 정보를 공유하고 프로세스당 한 번만 생성
 @st.cache_resource
 def get_gc():
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    
-    # [수정] 1. Railway 등 서버 환경 변수에서 JSON 키 확인
-    if "GOOGLE_SHEETS_JSON" in os.environ:
-        try:
-            creds_dict = json.loads(os.environ["GOOGLE_SHEETS_JSON"])
-            creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        except json.JSONDecodeError:
-            st.error("환경 변수 GOOGLE_SHEETS_JSON 로딩 실패: JSON 형식이 올바르지 않습니다.")
-            return None
-    
-    # [수정] 2. 로컬 파일 확인
-    else:
-        creds = Credentials.from_service_account_file(JSON_PATH, scopes=scopes)
-        
-    return gspread.authorize(creds)
+    creds = get_credentials()
+    return create_gspread_client(creds) if creds else None
+
+@st.cache_resource
+def get_drive_service():
+    creds = get_credentials()
+    return create_drive_service(creds) if creds else None
+
+# 시트 값 조회 백엔드 (DASHBOARD_DATA_SOURCE: sheets 기본, local:<디렉터리>, snapshot)
+@st.cache_resource
+def get_data_source():
+    return create_data_source(client_factory=get_gc)
 
 # [신규] 아카이브 폴더에서 스프레드시트 목록 가져오기
-@st.cache_data(ttl=600)  # 10분 캐싱
-def get_archive_files():
-    """Google Drive 아카이브 폴더에서 스프레드시트 목록을 가져옵니다."""
+def get_archive_files(force: bool = False):
+    """아카이브 폴더의 스프레드시트 목록 (로컬 카탈로그, 확인 간격마다 Drive 변경분만 반영)"""
+    # Google 외 데이터 소스에서는 Drive를 조회하지 않고 저장된 목록만 사용
+    if not get_data_source().live:
+        return list_catalog_files(None, ARCHIVE_FOLDER_ID)
     try:
-        from googleapiclient.discovery import build
-        
-        # credentials 직접 생성
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        
-        if "GOOGLE_SHEETS_JSON" in os.environ:
-            creds_dict = json.loads(os.environ["GOOGLE_SHEETS_JSON"])
-            creds = Credentials.from_service_account_info(creds_dict, scopes=scopes)
-        else:
-            creds = Credentials.from_service_account_file(JSON_PATH, scopes=scopes)
-        
-        # Drive API 서비스 생성
-        drive_service = build('drive', 'v3', credentials=creds)
-        
-        # 폴더 내 스프레드시트 검색
-        query = f"'{ARCHIVE_FOLDER_ID}' in parents and mimeType='application/vnd.google-apps.spreadsheet' and trashed=false"
-        results = drive_service.files().list(
-            q=query,
-            fields="files(id, name, modifiedTime)",
-            orderBy="name desc"
-        ).execute()
-        
-        files = results.get('files', [])
-        return files
+        # 여러 세션이 동시에 요청하면 진행 중인 동기화 결과를 함께 받음
+        with api_priority(PRIORITY_ARCHIVE):
+            return single_flight(("archive_files", ARCHIVE_FOLDER_ID), list_catalog_files,
+                                 get_drive_service(), ARCHIVE_FOLDER_ID, force)
     except Exception as e:
         st.error(f"아카이브 폴더 로딩 오류: {e}")
-        return []
+        # Drive에 연결할 수 없으면 마지막으로 저장된 목록 사용
+        return list_catalog_files(None, ARCHIVE_FOLDER_ID)
 
-# [신규] 특정 스프레드시트의 시트 목록 가져오기
-@st.cache_data(ttl=600)
+# [신규] 특정 스프레드시트의 시트 목록 가져오기 (메타데이터는 데이터 소스가 프로세스 단위로 보관)
 def get_spreadsheet_sheets(spreadsheet_id: str):
     """특정 스프레드시트의 시트 목록을 가져옵니다."""
     try:
-        gc = get_gc()
-        if gc is None:
-            return []
-        
-        spreadsheet = gc.open_by_key(spreadsheet_id)
-        return [ws.title for ws in spreadsheet.worksheets()]
+        return get_data_source().list_sheets(spreadsheet_id)
     except Exception as e:
         return []
 
+def fetch_sheet_values(spreadsheet_id: str, sheet_name: str) -> list:
+    """데이터 소스에서 시트 원본 값을 가져옵니다. (스냅샷 갱신, 아카이브 DB 반영에도 사용)
+
+    같은 시트를 동시에 요청하면(세션/미리 로딩/아카이브 반영) 한 번만 조회하고 결과를 함께 받습니다.
+    """
+    source = get_data_source()
+    return single_flight(("sheet_values", source.describe(), spreadsheet_id, sheet_name),
+                         source.fetch_values, spreadsheet_id, sheet_name)
+
+def fetch_sheet_tail_values(spreadsheet_id: str, sheet_name: str, previous_values: list):
+    """일별 시트 증분 조회 (머리 행과 끝부분만 받아 이전 값에 병합, 병합할 수 없으면 None → 전체 조회)"""
+    gc = get_gc()
+    if gc is None:
+        raise RuntimeError("Google Sheets 클라이언트를 만들 수 없습니다.")
+    return fetch_tail_values(gc, spreadsheet_id, sheet_name, previous_values, typed=get_data_source().typed)
+
 @st.cache_data(ttl=300)  # 5분 캐싱
-def load_sheet(sheet_name: str, spreadsheet_id: str = None) -> pd.DataFrame:
-    """시트 데이터를 로드합니다. spreadsheet_id가 None이면 기본 SHEET_ID 사용."""
+def load_sheet_cached(sheet_name: str, spreadsheet_id: str = None) -> pd.DataFrame:
+    """load_sheet의 캐시되는 부분. 없는 시트/스프레드시트는 빈 DataFrame(캐시),
+    그 밖의 조회 실패는 예외로 올려 캐시에 남기지 않습니다.
+
+    일별 시트는 읽은 스냅샷으로 일별 집계 테이블을 여기서(캐시 미스 때 한 번) 맞추고
+    df.attrs["daily_agg_synced"]로 표시 → 필터만 바뀐 재실행은 구간 조회만 함"""
+    count("load_sheet.miss")  # 캐시 미스일 때만 실행됨
+    df = read_sheet_frame(sheet_name, spreadsheet_id)
+    if sync_daily_aggregates(sheet_name, spreadsheet_id or SHEET_ID, df):
+        df.attrs["daily_agg_synced"] = True
+    return df
+
+def read_sheet_frame(sheet_name: str, spreadsheet_id: str = None) -> pd.DataFrame:
+    """시트(또는 로컬 아카이브 시트)를 읽어 DataFrame으로 변환 (캐시하지 않음)"""
+    # 로컬 아카이브(xlsx): 네트워크 없이 파일에서 읽음 (파일 단위로 한 번에 읽고 mtime 기준 캐시)
+    if is_local_source(spreadsheet_id):
+        try:
+            sheet_names = list(SHEETS.values()) + list(PRODUCT_SHEETS.values())
+            return load_archive_sheets(local_source_path(spreadsheet_id), sheet_names).get(sheet_name, pd.DataFrame())
+        except Exception as e:
+            return pd.DataFrame()
+
     try:
-        gc = get_gc()
-        if gc is None: return pd.DataFrame()
-        
         # spreadsheet_id가 지정되지 않으면 기본값 사용
         target_id = spreadsheet_id if spreadsheet_id else SHEET_ID
-        
-        ws = gc.open_by_key(target_id).worksheet(sheet_name)
-        values = ws.get_all_values()
-    except Exception as e:
-        # st.error(f"Google Sheet 로딩 오류: {e}") # 디버깅용
-        return pd.DataFrame()
 
-    if len(values) < 2:
+        # 로컬 재생/스냅샷 소스는 스냅샷 캐시를 거치지 않음 (목 데이터가 스냅샷 DB에 섞이지 않도록)
+        source = get_data_source()
+        if not source.live:
+            return parse_sheet_values(fetch_sheet_values(target_id, sheet_name))
+        
+        # 일별 시트는 아래로만 행이 추가되므로 증분 동기화 (상품 시트는 전체 행이 바뀜)
+        incremental = fetch_sheet_tail_values if sheet_name in SHEETS.values() else None
+        values = get_sheet_values(target_id, sheet_name, fetch_sheet_values, on_refreshed=clear_sheet_caches,
+                                  incremental_func=incremental)
+    except (WorksheetNotFound, SpreadsheetNotFound):
+        # 아카이브에 없는 채널 시트 등 (다시 조회해도 같으므로 캐시)
         return pd.DataFrame()
 
-    # 헤더 찾기
-    header_row_idx = 1 # 기본값
-    if "Model" in values[0] or "모델" in values[0]:
-        header_row_idx = 0
-    
-    header = values[header_row_idx]
-    rows = values[header_row_idx+1:]
-
-    # 중복된 컬럼명 처리
-    seen = {}
-    new_header = []
-    for col in header:
-        if col in seen:
-            seen[col] += 1
-            new_header.append(f"{col}_{seen[col]}")
-        else:
-            seen[col] = 0
-            new_header.append(col)
+    return parse_sheet_values(values)
 
-    df = pd.DataFrame(rows, columns=new_header)
+@timed("load_sheet")
+def load_sheet(sheet_name: str, spreadsheet_id: str = None) -> pd.DataFrame:
+    """시트 데이터를 로드합니다. spreadsheet_id가 None이면 기본 SHEET_ID 사용.
+    "local:<경로>" 형태면 로컬 아카이브 xlsx에서 읽습니다.
 
-    # "합계" 행 제거
-    if not df.empty:
-        if "날짜" in df.columns and str(df["날짜"].iloc[0]) == "합계":
-            df = df.iloc[1:].reset_index(drop=True)
-        elif str(df.iloc[0, 0]) == "합계":
-             df = df.iloc[1:].reset_index(drop=True)
+    로컬 스냅샷이 있으면 즉시 반환하고, 오래된 경우 백그라운드에서 갱신합니다.
+    갱신으로 내용이 바뀌면 메모리 캐시를 비워 다음 실행 때 새 스냅샷을 읽습니다.
+    Google API 요청은 api_scheduler가 쿼터에 맞춰 내보내고 429/5xx는 재시도합니다.
+    재시도로도 실패하면 빈 DataFrame을 반환하되 캐시하지 않아 다음 실행에서 다시 시도합니다.
+    """
+    try:
+        # 기본 스프레드시트는 None/SHEET_ID 어느 쪽으로 불러도 같은 캐시 항목 사용
+        # (같은 키의 동시 미스는 st.cache_data가 키별 잠금으로 한 번만 계산)
+        return load_sheet_cached(sheet_name, spreadsheet_id or SHEET_ID)
+    except Exception as e:
+        # st.error(f"Google Sheet 로딩 오류: {e}") # 디버깅용
+        count("load_sheet.failed")
+        return pd.DataFrame()
 
-    # 날짜 컬럼 파싱
-    if "날짜" in df.columns:
-        df["날짜"] = pd.to_datetime(df["날짜"], errors="coerce")
+load_sheet.clear = load_sheet_cached.clear
 
-    # 숫자형 컬럼 정리
-    for c in df.columns:
-        if c == "날짜" or c == "Model" or c == "카테고리" or "모델" in c:
-            continue
-        df[c] = (
-            df[c]
-            .astype(str)
-            .str.replace(",", "", regex=False)
-            .str.replace("%", "", regex=False)
-            .str.strip()
-        )
-        df[c] = pd.to_numeric(df[c], errors="ignore")
+@timed("load_sheets")
+def load_sheets(sheet_names, spreadsheet_id: str = None) -> dict:
+    """여러 시트를 병렬로 로드합니다. 시트 이름 -> DataFrame 딕셔너리를 반환합니다.
 
-    return df
+    각 시트는 load_sheet를 통해 로드되므로 결과가 load_sheet 캐시에 그대로 채워지고,
+    이후 개별 load_sheet 호출은 캐시에서 바로 반환됩니다.
+    전체 로딩 시간은 시트 수의 합이 아니라 가장 느린 시트 하나 수준이 됩니다.
+    """
+    sheet_names = list(dict.fromkeys(sheet_names))  # 중복 제거 (순서 유지)
+    if not sheet_names:
+        return {}
+
+    # 인증 클라이언트/데이터 소스는 메인 스레드에서 한 번만 생성 (워커마다 중복 생성 방지)
+    try:
+        if get_data_source().live:
+            get_gc()
+    except Exception:
+        pass
+
+    workers = min(MAX_SHEET_WORKERS, len(sheet_names))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="load_sheet") as executor:
+        # 워커 스레드도 호출한 스레드와 같은 API 우선순위로 요청
+        load = with_priority(current_priority(), load_sheet)
+        futures = {name: executor.submit(load, name, spreadsheet_id) for name in sheet_names}
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception:
+            results[name] = pd.DataFrame()
+    return results
 
 # ============================
 # 3. KPI & 분석 함수
 # ============================
 
-def calc_kpis(df: pd.DataFrame):
-    total_revenue_col = None
-    total_profit_col = None
-    avg_profit_rate_col = None
-    roas_col = None
-    total_ad_cost_col = None
-
-    # 1차 패스
-    for col in df.columns:
-        name = str(col)
-        if total_revenue_col is None and "정산매출" in name and "합계" in name:
-            if "ROAS" not in name: total_revenue_col = col
-        if total_profit_col is None and "순이익" in name and "합계" in name:
-            if "률" not in name and "율" not in name: total_profit_col = col
-        if total_ad_cost_col is None and "총광고비" in name:
-            total_ad_cost_col = col
-
-    # 2차 패스
-    for col in df.columns:
-        name = str(col)
-        if total_revenue_col is None and "정산매출" in name:
-            if "ROAS" not in name: total_revenue_col = col
-        if total_profit_col is None and "순이익" in name:
-            if "률" not in name and "율" not in name: total_profit_col = col
-        if avg_profit_rate_col is None and "순이익률" in name:
-            if "손익" not in name and "광고비" not in name: avg_profit_rate_col = col
-        if roas_col is None and ("ROAS" in name or "로아스" in name):
-            if "광고센터" not in name: roas_col = col
-        if total_ad_cost_col is None and "광고비" in name:
-            if "총" in name or "합계" in name: total_ad_cost_col = col
-
-    total_revenue = pd.to_numeric(df[total_revenue_col], errors="coerce").sum() if total_revenue_col else 0
-    total_profit = pd.to_numeric(df[total_profit_col], errors="coerce").sum() if total_profit_col else 0
-
-    if total_revenue > 0 and total_profit != 0:
-        avg_profit_rate = (total_profit / total_revenue) * 100
-    elif avg_profit_rate_col:
-        avg_profit_rate = pd.to_numeric(df[avg_profit_rate_col], errors="coerce").mean()
-        if avg_profit_rate < 1: avg_profit_rate = avg_profit_rate * 100
-    else:
-        avg_profit_rate = 0
-
-    ad_cost_col = None
-    for col in df.columns:
-        name = str(col)
-        if "광고비" in name and ("총" in name or "합계" in name):
-            ad_cost_col = col
-            break
-        elif "총광고비" in name:
-            ad_cost_col = col
-            break
+def clear_sheet_caches():
+    """시트 스냅샷이 갱신되면 시트 기반 메모리 캐시를 함께 비움"""
+    load_sheet.clear()
+
+@st.cache_resource
+def ensure_database():
+    """DB 테이블 생성 (프로세스당 한 번)"""
+    init_database()
+    return True
+
+@timed("sync_daily_aggregates")
+def sync_daily_aggregates(sheet_name: str, spreadsheet_id: str, df: pd.DataFrame) -> bool:
+    """
+    채널 시트의 일별 집계 테이블을 방금 읽은 DataFrame과 맞춤
     
-    if ad_cost_col and total_revenue > 0:
-        total_ad_cost = pd.to_numeric(df[ad_cost_col], errors="coerce").sum()
-        if total_ad_cost > 0:
-            roas = total_revenue / total_ad_cost
-        else:
-            roas = 0
-    else:
-        roas = 0
-
-    return {
-        "total_revenue": total_revenue,
-        "total_profit": total_profit,
-        "avg_profit_rate": avg_profit_rate,
-        "roas": roas,
-        "total_revenue_col": total_revenue_col,
-        "total_profit_col": total_profit_col,
-    }
+    load_sheet_cached의 캐시 미스(새 스냅샷)마다 한 번 실행되므로, 구간 합계와 DataFrame KPI가
+    항상 같은 스냅샷에서 나옴. 데이터 지문이 DB에 저장된 것과 같으면 쓰지 않음.
+    집계 테이블을 사용할 수 있으면 True 반환 (날짜 컬럼이 없는 시트는 False)
+    """
+    if df.empty or "날짜" not in df.columns:
+        return False
+    
+    try:
+        daily, has_ad_cost = build_daily_frame(df, calc_kpis(df))
+        fingerprint = str(pd.util.hash_pandas_object(daily, index=False).sum())
+        if get_channel_daily_agg_fingerprint(spreadsheet_id, sheet_name) == fingerprint:
+            return True
+        count("sync_daily_aggregates.write")
+        return save_channel_daily_agg(spreadsheet_id, sheet_name, daily, fingerprint, has_ad_cost)
+    except Exception as e:
+        print(f"❌ 일별 집계 동기화 실패: {e}")
+        return False
 
 def format_delta_text(current, previous):
     if previous is None or previous == 0: return None
@@ -803,12 +808,16 @@ def format_delta_text(current, previous):
     sign = "+" if rate >= 0 else ""
     return f"{sign}{rate:.1f}%"
 
-def make_combo_chart(df, x_col, revenue_col, profit_col):
+def make_combo_chart(df, x_col, revenue_col, profit_col, max_points=None):
+    # 기간이 길면 차트 폭에 맞게 점 개수를 줄임 (최고점/최저점 유지)
+    max_points = max_points or chart_point_budget()
     fig = go.Figure()
     if revenue_col:
-        fig.add_trace(go.Bar(x=df[x_col], y=df[revenue_col], name=str(revenue_col), opacity=0.7))
+        rev_df = downsample(df, x_col, revenue_col, max_points)
+        fig.add_trace(go.Bar(x=rev_df[x_col], y=rev_df[revenue_col], name=str(revenue_col), opacity=0.7))
     if profit_col:
-        fig.add_trace(go.Scatter(x=df[x_col], y=df[profit_col], mode="lines+markers", name=str(profit_col), line=dict(width=2.2)))
+        prof_df = downsample(df, x_col, profit_col, max_points)
+        fig.add_trace(go.Scatter(x=prof_df[x_col], y=prof_df[profit_col], mode="lines+markers", name=str(profit_col), line=dict(width=2.2)))
     
     # Y축 포맷 (콤마)
     fig.update_yaxes(tickformat=",")
@@ -867,218 +876,55 @@ def generate_performance_analysis(df, date_col, kpi, channel_name):
 # Overview 탭 전용 헬퍼 함수들
 # ============================
 
-def prepare_daily_trend_data(channel_data):
-    """일별 트렌드 데이터 준비"""
-    trend_data = {}
-    for ch, data in channel_data.items():
-        df = data["df"]
-        if "날짜" not in df.columns or df.empty:
-            continue
-        
-        date_col = "날짜"
-        revenue_col = data["kpi"]["total_revenue_col"]
-        profit_col = data["kpi"]["total_profit_col"]
-        
-        if revenue_col is None:
-            continue
-        
-        # 날짜별 데이터 정리
-        daily_df = df[[date_col, revenue_col]].copy()
-        if profit_col:
-            daily_df[profit_col] = df[profit_col]
-        
-        daily_df = daily_df.dropna(subset=[date_col])
-        daily_df = daily_df.sort_values(date_col)
-        daily_df[date_col] = pd.to_datetime(daily_df[date_col])
-        
-        trend_data[ch] = {
-            "df": daily_df,
-            "revenue_col": revenue_col,
-            "profit_col": profit_col
-        }
-    
-    return trend_data
-
-def calculate_growth_rates(channel_data, previous_month_data=None):
-    """성장률 계산 (전주, 전월, MoM, WoW)"""
-    growth_data = {}
-    today = datetime.now()
-    week_ago = today - timedelta(days=7)
-    
-    for ch, data in channel_data.items():
-        df = data["df"]
-        if "날짜" not in df.columns or df.empty:
-            continue
-        
-        date_col = "날짜"
-        revenue_col = data["kpi"]["total_revenue_col"]
-        if revenue_col is None:
-            continue
-        
-        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-        df = df.dropna(subset=[date_col])
-        
-        # 전주 대비 (최근 7일 vs 그 전 7일)
-        recent_7d = df[df[date_col] >= week_ago][revenue_col].sum()
-        prev_7d = df[(df[date_col] >= week_ago - timedelta(days=7)) & (df[date_col] < week_ago)][revenue_col].sum()
-        wow_growth = ((recent_7d - prev_7d) / prev_7d * 100) if prev_7d > 0 else 0
-        
-        # 전일 대비
-        if len(df) > 0:
-            latest_date = df[date_col].max()
-            latest_revenue = df[df[date_col] == latest_date][revenue_col].sum()
-            prev_date = latest_date - timedelta(days=1)
-            prev_revenue = df[df[date_col] == prev_date][revenue_col].sum() if len(df[df[date_col] == prev_date]) > 0 else 0
-            day_over_day = ((latest_revenue - prev_revenue) / prev_revenue * 100) if prev_revenue > 0 else 0
-        else:
-            day_over_day = 0
-        
-        # 전월 대비 (아카이빙 데이터 활용)
-        mom_growth = None
-        if previous_month_data and ch in previous_month_data:
-            prev_month_revenue = previous_month_data[ch].get("revenue", 0)
-            current_revenue = data["revenue"]
-            mom_growth = ((current_revenue - prev_month_revenue) / prev_month_revenue * 100) if prev_month_revenue > 0 else 0
-        
-        growth_data[ch] = {
-            "wow": wow_growth,
-            "day_over_day": day_over_day,
-            "mom": mom_growth,
-            "recent_7d": recent_7d,
-            "prev_7d": prev_7d
-        }
+@timed("get_period_totals")
+def get_period_totals(source_id, channel_data, period_filter):
+    """
+    기간 필터 구간의 채널별 매출/순이익/광고비 합계
     
-    return growth_data
-
-def calculate_efficiency_metrics(channel_data):
-    """효율성 지표 계산 (ROI, 광고비 효율성, 단위 광고비당 매출)"""
-    efficiency_data = {}
+    일별 집계 테이블(누적합)에서 구간 양 끝 두 행만 읽어 계산하므로 기간이 바뀌어도 DataFrame을 다시 훑지 않음.
+    날짜 컬럼이 없는 채널은 결과에서 빠짐 (호출 측에서 전체 데이터 사용).
     
-    for ch, data in channel_data.items():
-        revenue = data["revenue"]
-        profit = data["profit"]
-        roas = data["roas"]
-        
-        # 광고비 계산
-        ad_cost = (revenue / roas) if roas > 0 else 0
-        
-        # ROI (투자 대비 수익률)
-        roi = ((profit - ad_cost) / ad_cost * 100) if ad_cost > 0 else 0
-        
-        # 단위 광고비당 매출
-        revenue_per_ad_cost = (revenue / ad_cost) if ad_cost > 0 else 0
-        
-        efficiency_data[ch] = {
-            "roi": roi,
-            "ad_cost": ad_cost,
-            "revenue_per_ad_cost": revenue_per_ad_cost,
-            "efficiency_score": roi * 0.5 + roas * 0.3 + (revenue_per_ad_cost / 10) * 0.2  # 종합 효율성 점수
-        }
+    Returns:
+        dict: {채널: {"revenue", "profit", "ad_cost", "rows", "has_ad_cost"}}
+    """
+    channels = [
+        ch for ch, data in channel_data.items()
+        if "날짜" in data["df"].columns and not data["df"].empty
+    ]
+    start_date, end_date = get_period_bounds(period_filter)
+    start_key = start_date.strftime("%Y-%m-%d") if start_date else None
+    end_key = end_date.strftime("%Y-%m-%d") if end_date else None
     
-    return efficiency_data
-
-def calculate_volatility_metrics(channel_data):
-    """변동성 지표 계산 (표준편차, 변동계수)"""
-    volatility_data = {}
+    # 집계 테이블은 시트 이름 기준으로 저장됨
+    sheet_names = {ch: SHEETS.get(ch, ch) for ch in channels}
+    # 집계 동기화는 시트를 읽을 때(load_sheet_cached) 끝나 있음 → 여기서는 구간 조회만
+    synced = [sheet_names[ch] for ch in channels if channel_data[ch]["df"].attrs.get("daily_agg_synced")]
+    try:
+        sheet_totals = get_channel_range_totals(source_id, synced, start_key, end_key)
+    except Exception as e:
+        print(f"❌ 일별 집계 조회 실패: {e}")
+        sheet_totals = {}
+    totals = {ch: sheet_totals[sheet_names[ch]] for ch in channels if sheet_names[ch] in sheet_totals}
     
-    for ch, data in channel_data.items():
-        df = data["df"]
-        if "날짜" not in df.columns or df.empty:
-            continue
-        
-        date_col = "날짜"
-        revenue_col = data["kpi"]["total_revenue_col"]
-        if revenue_col is None:
+    # 집계 테이블을 쓸 수 없는 채널은 DataFrame에서 직접 계산
+    for ch in channels:
+        if ch in totals:
             continue
-        
-        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-        df = df.dropna(subset=[date_col, revenue_col])
-        
-        if len(df) == 0:
-            continue
-        
-        revenues = df[revenue_col].values
-        mean_revenue = np.mean(revenues)
-        std_revenue = np.std(revenues)
-        cv = (std_revenue / mean_revenue * 100) if mean_revenue > 0 else 0  # 변동계수
-        
-        # 최고일 vs 평균
-        max_revenue = np.max(revenues)
-        avg_revenue = mean_revenue
-        max_vs_avg = ((max_revenue - avg_revenue) / avg_revenue * 100) if avg_revenue > 0 else 0
-        
-        volatility_data[ch] = {
-            "std": std_revenue,
-            "cv": cv,
-            "max_revenue": max_revenue,
-            "avg_revenue": avg_revenue,
-            "max_vs_avg": max_vs_avg
-        }
-    
-    return volatility_data
-
-def apply_date_filter(df, date_col, period_filter):
-    """날짜 필터 적용 헬퍼 함수"""
-    if date_col not in df.columns:
-        return df
-    
-    # 날짜 컬럼이 datetime이 아니면 변환
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-    
-    # 날짜가 없는 행 제거
-    df = df.dropna(subset=[date_col])
-    
-    if len(df) == 0:
-        return df
-    
-    if isinstance(period_filter, dict):
-        filter_type = period_filter.get("type", "전체")
-        
-        if filter_type == "전체":
-            return df
-        
-        # 오늘 날짜 (시간 제거, 날짜만)
-        today = datetime.now().date()
-        
-        if filter_type == "최근 7일":
-            cutoff_date = today - timedelta(days=7)
-            # 날짜만 비교 (시간 무시)
-            filtered = df[df[date_col].dt.date >= cutoff_date]
-            return filtered
-        elif filter_type == "최근 30일":
-            cutoff_date = today - timedelta(days=30)
-            filtered = df[df[date_col].dt.date >= cutoff_date]
-            return filtered
-        elif filter_type == "custom":
-            start_date = period_filter.get("start")
-            end_date = period_filter.get("end")
-            if start_date and end_date:
-                # Timestamp를 date로 변환하여 비교
-                if isinstance(start_date, pd.Timestamp):
-                    start_date = start_date.date()
-                elif hasattr(start_date, 'date'):
-                    start_date = start_date.date()
-                if isinstance(end_date, pd.Timestamp):
-                    end_date = end_date.date()
-                elif hasattr(end_date, 'date'):
-                    end_date = end_date.date()
-                filtered = df[(df[date_col].dt.date >= start_date) & (df[date_col].dt.date <= end_date)]
-                return filtered
-    else:
-        # 이전 형식 호환성
-        today = datetime.now().date()
-        if period_filter == "최근 7일":
-            cutoff_date = today - timedelta(days=7)
-            return df[df[date_col].dt.date >= cutoff_date]
-        elif period_filter == "최근 30일":
-            cutoff_date = today - timedelta(days=30)
-            return df[df[date_col].dt.date >= cutoff_date]
-    
-    return df
-
-def create_enhanced_trend_chart(trend_data, selected_channels, period_filter="전체"):
-    """향상된 시계열 트렌드 차트 생성"""
+        daily, has_ad_cost = build_daily_frame(channel_data[ch]["df"], channel_data[ch]["kpi"])
+        daily = apply_date_filter(daily, "date", period_filter)
+        totals[ch] = {
+            "revenue": daily["revenue"].sum(),
+            "profit": daily["profit"].sum(),
+            "ad_cost": daily["ad_cost"].sum(),
+            "rows": len(daily),
+            "has_ad_cost": has_ad_cost,
+        }
+    return totals
+
+def create_enhanced_trend_chart(trend_data, selected_channels, period_filter="전체", max_points=None):
+    """향상된 시계열 트렌드 차트 생성 (기간이 길면 채널별로 max_points개까지 다운샘플링)"""
+    # Overview에서 st.columns([2, 1])의 왼쪽 칸에 표시
+    max_points = max_points or chart_point_budget(2 / 3)
     fig = go.Figure()
     
     channel_colors = {
@@ -1103,9 +949,10 @@ def create_enhanced_trend_chart(trend_data, selected_channels, period_filter="
         color = channel_colors.get(ch, "#64748b")
         
         # 매출 라인
+        rev_df = downsample(df, "날짜", data["revenue_col"], max_points)
         fig.add_trace(go.Scatter(
-            x=df["날짜"],
-            y=df[data["revenue_col"]],
+            x=rev_df["날짜"],
+            y=rev_df[data["revenue_col"]],
             mode="lines+markers",
             name=f"{ch} 매출",
             line=dict(color=color, width=3),
@@ -1116,9 +963,10 @@ def create_enhanced_trend_chart(trend_data, selected_channels, period_filter="
         
         # 순이익 라인 (있는 경우)
         if data["profit_col"] and data["profit_col"] in df.columns:
+            prof_df = downsample(df, "날짜", data["profit_col"], max_points)
             fig.add_trace(go.Scatter(
-                x=df["날짜"],
-                y=df[data["profit_col"]],
+                x=prof_df["날짜"],
+                y=prof_df[data["profit_col"]],
                 mode="lines+markers",
                 name=f"{ch} 순이익",
                 line=dict(color=color, width=2, dash="dash"),
@@ -1132,6 +980,8 @@ def create_enhanced_trend_chart(trend_data, selected_channels, period_filter="
         if len(df) >= 7:
             df_sorted = df.sort_values("날짜")
             df_sorted["ma7"] = df_sorted[data["revenue_col"]].rolling(window=7, min_periods=1).mean()
+            # 이동평균은 전체 데이터로 계산한 뒤 줄임
+            df_sorted = downsample(df_sorted, "날짜", "ma7", max_points)
             fig.add_trace(go.Scatter(
                 x=df_sorted["날짜"],
                 y=df_sorted["ma7"],
@@ -1156,31 +1006,33 @@ def create_enhanced_trend_chart(trend_data, selected_channels, period_filter="
                 first_df = first_df.sort_values("날짜")
                 revenue_col = first_data["revenue_col"]
                 
-                # 전일 대비 증감률 계산
-                first_df["prev_revenue"] = first_df[revenue_col].shift(1)
-                first_df["change_pct"] = ((first_df[revenue_col] - first_df["prev_revenue"]) / first_df["prev_revenue"] * 100).fillna(0)
+                # 전일 대비 증감률 계산 (전일 매출이 0이면 증감률 없음)
+                revenue = first_df[revenue_col]
+                change_pct = (revenue.diff() / revenue.shift(1) * 100).replace([np.inf, -np.inf], np.nan)
+                mask = change_pct.notna() & (change_pct != 0)
+                labeled = pd.DataFrame({"날짜": first_df["날짜"][mask].to_numpy(), "change_pct": change_pct[mask].to_numpy()})
                 
-                # 최소값을 기준으로 annotation 위치 계산
-                min_revenue = first_df[revenue_col].min()
-                annotation_y = min_revenue * 0.95  # 차트 하단 근처
+                # 기간이 길면 라벨 간격을 넓혀 최대 TREND_CHANGE_LABEL_MAX개만 표시
+                step = (len(labeled) + TREND_CHANGE_LABEL_MAX - 1) // TREND_CHANGE_LABEL_MAX
+                if step > 1:
+                    labeled = labeled.iloc[::step]
                 
-                # 각 날짜에 증감률 annotation 추가
-                for _, row in first_df.iterrows():
-                    change_pct = row["change_pct"]
-                    if pd.notna(change_pct) and change_pct != 0:
-                        color = "#22c55e" if change_pct > 0 else "#ef4444"
-                        fig.add_annotation(
-                            x=row["날짜"],
-                            y=annotation_y,
-                            text=f"{change_pct:+.1f}%",
-                            showarrow=False,
-                            font=dict(size=10, color=color),
-                            bgcolor="rgba(15, 23, 42, 0.8)",
-                            bordercolor=color,
-                            borderwidth=1,
-                            borderpad=2,
-                            yshift=-25
-                        )
+                # 최소값을 기준으로 라벨 위치 계산 (차트 하단 근처)
+                annotation_y = revenue.min() * 0.95
+                
+                # 증감률 라벨을 하나의 텍스트 트레이스로 표시
+                if len(labeled) > 0:
+                    fig.add_trace(go.Scatter(
+                        x=labeled["날짜"],
+                        y=np.full(len(labeled), annotation_y),
+                        mode="text",
+                        text=[f"{pct:+.1f}%" for pct in labeled["change_pct"]],
+                        textposition="bottom center",
+                        textfont=dict(size=10, color=np.where(labeled["change_pct"] > 0, "#22c55e", "#ef4444").tolist()),
+                        hoverinfo="skip",
+                        showlegend=False,
+                        name="전일 대비"
+                    ))
     
     fig.update_layout(
         template="plotly_dark",
@@ -1211,8 +1063,13 @@ def create_enhanced_trend_chart(trend_data, selected_channels, period_filter="
 # 4. Streamlit 레이아웃
 # ============================
 
+# 구간별 프로파일링 (opt-in: DASHBOARD_PROFILE=1 또는 URL ?profile=1)
+start_rerun(enabled=profiling_enabled(st.query_params))
+mark("페이지 설정")
+
 st.set_page_config(page_title="머레이 통합 대시보드", page_icon="📊", layout="wide")
 inject_css()
+ensure_database()
 
 current_month = datetime.now().strftime("%Y년 %m월")
 
@@ -1240,6 +1097,7 @@ st.markdown("---")
 # ============================
 # 4-1. 데이터 소스 선택 (사이드바)
 # ============================
+mark("사이드바")
 with st.sidebar:
     st.markdown("### 📂 데이터 소스 선택")
     
@@ -1255,6 +1113,13 @@ with st.sidebar:
         data_source_options.append(display_name)
         archive_file_map[display_name] = file['id']
     
+    # 로컬 아카이브 (archives/YYYY/MM/*.xlsx, 네트워크 없이 로딩)
+    local_archives = list_local_archives()
+    for file in local_archives:
+        display_name = f"💾 {file['name']}"
+        data_source_options.append(display_name)
+        archive_file_map[display_name] = file['id']
+    
     # 선택된 데이터 소스
     if 'selected_data_source' not in st.session_state:
         st.session_state.selected_data_source = data_source_options[0]
@@ -1275,6 +1140,10 @@ with st.sidebar:
     else:
         active_sheet_id = archive_file_map.get(selected_source, SHEET_ID)
         # 파일 정보 표시
+        for file in local_archives:
+            if file['id'] == active_sheet_id:
+                st.info(f"💾 로컬 파일 · 수정: {datetime.fromtimestamp(file['mtime']).strftime('%Y-%m-%d %H:%M')}")
+                break
         for file in archive_files:
             if file['id'] == active_sheet_id:
                 modified_time = file.get('modifiedTime', '')
@@ -1286,13 +1155,38 @@ with st.sidebar:
                     except:
                         pass
                 break
-        data_source_label = selected_source.replace("📁 ", "")
+        data_source_label = selected_source.replace("📁 ", "").replace("💾 ", "")
+    
+    # Google Sheets가 아닌 데이터 소스(로컬 재생/스냅샷)로 실행 중이면 표시
+    if not get_data_source().live:
+        st.caption(f"🧪 데이터 소스: {get_data_source().describe()}")
+    
+    # 쿼터 때문에 API 요청이 밀려 있으면 표시 (빈 화면 대신 로딩이 느려지는 중)
+    api_stats = get_scheduler().stats()
+    api_queued = sum(api_stats["queued"].values())
+    api_paused = max(api_stats["paused_seconds"].values(), default=0)
+    if api_queued or api_paused:
+        st.caption(f"⏳ Google API 요청 대기 {api_queued}건" + (f" · 쿼터 초과로 {api_paused:g}초 대기" if api_paused else ""))
     
     # 캐시 새로고침 버튼
     if st.button("🔄 데이터 새로고침", use_container_width=True):
         st.cache_data.clear()
+        invalidate_snapshots(active_sheet_id)
+        invalidate_spreadsheet_cache(active_sheet_id)
+        get_archive_files(force=True)
         st.rerun()
     
+    # 아카이브 → DB 반영 (월별 비교 탭은 DB에서 읽음, 수정된 파일만 다시 저장)
+    if st.button("🗄️ 아카이브 DB 반영", use_container_width=True, disabled=not archive_files):
+        with st.spinner("아카이브 파일을 DB에 저장하는 중..."), api_priority(PRIORITY_ARCHIVE):
+            ingest_report = ingest_archives(archive_files, fetch_sheet_values)
+        if ingest_report["saved"]:
+            st.success(f"✅ 저장 완료: {', '.join(ingest_report['saved'])}")
+        else:
+            st.info("변경된 아카이브 파일이 없습니다.")
+        for file_name, reason in ingest_report["failed"].items():
+            st.error(f"❌ {file_name}: {reason}")
+    
     # 안내 문구
     with st.expander("ℹ️ 아카이브 사용 안내"):
         st.markdown("""
@@ -1309,28 +1203,98 @@ with st.sidebar:
     
     st.markdown("---")
 
+mark("탭 선택/미리 로딩")
+
 # 시트 로딩 & KPI 계산 (선택된 데이터 소스 사용)
+# 보이는 탭에 필요한 시트만 로딩 (이번 실행에서 이미 로딩한 시트는 재사용)
 sheet_dfs = {}
 sheet_kpis = {}
-for label, sheet_name in SHEETS.items():
-    try:
-        df = load_sheet(sheet_name, active_sheet_id)
-        sheet_dfs[label] = df
-        sheet_kpis[label] = calc_kpis(df) if not df.empty else None
-    except Exception as e:
-        sheet_dfs[label] = pd.DataFrame()
-        sheet_kpis[label] = None
 
-# 탭 구성
+@timed("ensure_sheets_loaded")
+def ensure_sheets_loaded(labels):
+    """일별 시트를 병렬 로딩하고 KPI 계산 (이미 로딩한 시트는 건너뜀)"""
+    missing = [label for label in labels if label not in sheet_dfs]
+    if not missing:
+        return
+    loaded_sheets = load_sheets([SHEETS[label] for label in missing], active_sheet_id)
+    for label in missing:
+        try:
+            df = loaded_sheets.get(SHEETS[label], pd.DataFrame())
+            sheet_dfs[label] = df
+            sheet_kpis[label] = calc_kpis(df) if not df.empty else None
+        except Exception as e:
+            sheet_dfs[label] = pd.DataFrame()
+            sheet_kpis[label] = None
+
+# 탭 구성 (선택된 탭 하나만 계산/로딩/렌더링)
 tab_labels = ["Overview"] + list(SHEETS.keys()) + list(PRODUCT_SHEETS.keys()) + ["📊 월별 비교", "📊 월별 비교 (상세)"]
-tabs = st.tabs(tab_labels)
+product_tab_start_idx = 1 + len(SHEETS)
+
+def tab_sheet_names(index):
+    """탭을 그리는 데 필요한 시트 이름 목록"""
+    if index == 0:
+        return [SHEETS[label] for label in OVERVIEW_CHANNELS]
+    if index < product_tab_start_idx:
+        return [list(SHEETS.values())[index - 1]]
+    if index < product_tab_start_idx + len(PRODUCT_SHEETS):
+        return [list(PRODUCT_SHEETS.values())[index - product_tab_start_idx]]
+    if index == len(tab_labels) - 2:
+        # 월별 비교 (요약): 실시간 KPI
+        return list(SHEETS.values())
+    return []
+
+@st.cache_resource
+def get_prefetch_executor():
+    return ThreadPoolExecutor(max_workers=TAB_PREFETCH_WORKERS, thread_name_prefix="tab_prefetch")
+
+@st.cache_resource
+def get_prefetch_pending():
+    """(스프레드시트 ID, 시트 이름) → 진행 중인 미리 로딩 Future (재실행마다 같은 시트를 다시 넣지 않도록)"""
+    return {}
+
+def prefetch_sheets(spreadsheet_id, sheet_names, priority=PRIORITY_BACKGROUND):
+    """시트들을 백그라운드에서 미리 로딩 (load_sheet 캐시를 채움, 이미 진행 중인 시트는 건너뜀)
+
+    API 요청은 priority(기본: 백그라운드)로 내보내 보고 있는 탭의 로딩보다 뒤로 밀림
+    """
+    executor = get_prefetch_executor()
+    pending = get_prefetch_pending()
+    load = with_priority(priority, load_sheet)
+    for sheet_name in sheet_names:
+        key = (spreadsheet_id, sheet_name)
+        future = pending.get(key)
+        if future is None or future.done():
+            pending[key] = executor.submit(load, sheet_name, spreadsheet_id)
+
+def prefetch_tabs(indices, spreadsheet_id):
+    """이웃 탭의 시트를 백그라운드에서 미리 로딩"""
+    for index in indices:
+        if 0 <= index < len(tab_labels):
+            prefetch_sheets(spreadsheet_id, tab_sheet_names(index))
+
+active_tab_label = st.radio(
+    "탭 선택",
+    tab_labels,
+    horizontal=True,
+    key="active_tab",
+    label_visibility="collapsed",
+)
+active_tab = tab_labels.index(active_tab_label)
+prefetch_tabs([active_tab - 1, active_tab + 1], active_sheet_id)
+
+def show_tab(index):
+    """선택된 탭인지 여부 (선택되지 않은 탭은 본문을 실행하지 않음, 음수 인덱스는 뒤에서부터)"""
+    return index % len(tab_labels) == active_tab
+
+mark(f"탭: {active_tab_label}")
 
 # ============================
 # 5. Overview 탭 (대폭 개선)
 # ============================
-with tabs[0]:
+if show_tab(0):
     st.markdown("""<div class="section-title"><span>📊 채널 전체 Overview</span></div>""", unsafe_allow_html=True)
-    channels_for_overview = ["이베이", "11번가", "B2B"]
+    channels_for_overview = OVERVIEW_CHANNELS
+    ensure_sheets_loaded(channels_for_overview)
     
     # 채널별 데이터 수집
     channel_data = {}
@@ -1479,61 +1443,34 @@ with tabs[0]:
         
         # 필터된 기간의 데이터로 KPI 재계산
         def calculate_filtered_kpis(channel_data, period_filter):
-            """필터된 기간의 KPI 계산"""
+            """필터된 기간의 KPI 계산 (일별 집계 테이블 조회)"""
             filtered_revenue = 0
             filtered_profit = 0
             filtered_ad_cost = 0
+            period_totals = get_period_totals(active_sheet_id, channel_data, period_filter)
             
             for ch, data in channel_data.items():
-                df = data["df"].copy()
-                if "날짜" not in df.columns or df.empty:
+                totals = period_totals.get(ch)
+                if totals is None:
                     # 날짜가 없으면 전체 데이터 사용
                     filtered_revenue += data["revenue"]
                     filtered_profit += data["profit"]
                     filtered_ad_cost += (data["revenue"] / data["roas"] if data["roas"] > 0 else 0)
                     continue
                 
-                # 날짜 필터 적용
-                if "날짜" in df.columns:
-                    df["날짜"] = pd.to_datetime(df["날짜"], errors="coerce")
-                    df = df.dropna(subset=["날짜"])
-                    df_filtered = apply_date_filter(df, "날짜", period_filter)
-                else:
-                    # 날짜 컬럼이 없으면 전체 데이터 사용
-                    df_filtered = df
-                
-                if len(df_filtered) == 0:
+                if totals["rows"] == 0:
                     continue
                 
-                # 필터된 기간의 매출/순이익 계산
-                revenue_col = data["kpi"]["total_revenue_col"]
-                profit_col = data["kpi"]["total_profit_col"]
-                
-                if revenue_col and revenue_col in df_filtered.columns:
-                    revenue_sum = df_filtered[revenue_col].sum()
-                    if pd.notna(revenue_sum):
-                        filtered_revenue += revenue_sum
-                
-                if profit_col and profit_col in df_filtered.columns:
-                    profit_sum = df_filtered[profit_col].sum()
-                    if pd.notna(profit_sum):
-                        filtered_profit += profit_sum
-                
-                # 광고비 계산 (필터된 기간 기준)
-                ad_cost_col = None
-                for col in df_filtered.columns:
-                    col_name = str(col)
-                    if "광고비" in col_name and ("총" in col_name or "합계" in col_name):
-                        ad_cost_col = col
-                        break
+                # 필터된 기간의 매출/순이익
+                filtered_revenue += totals["revenue"]
+                filtered_profit += totals["profit"]
                 
-                if ad_cost_col and ad_cost_col in df_filtered.columns:
-                    filtered_ad_cost += df_filtered[ad_cost_col].sum()
-                else:
+                # 광고비 (필터된 기간 기준)
+                if totals["has_ad_cost"]:
+                    filtered_ad_cost += totals["ad_cost"]
+                elif data["roas"] > 0:
                     # 광고비 컬럼이 없으면 ROAS로 역산
-                    if data["roas"] > 0:
-                        ch_revenue = df_filtered[revenue_col].sum() if revenue_col and revenue_col in df_filtered.columns else 0
-                        filtered_ad_cost += (ch_revenue / data["roas"] if data["roas"] > 0 else 0)
+                    filtered_ad_cost += totals["revenue"] / data["roas"]
             
             filtered_roas = (filtered_revenue / filtered_ad_cost * 100) if filtered_ad_cost > 0 else 0
             filtered_profit_rate = (filtered_profit / filtered_revenue * 100) if filtered_revenue > 0 else 0
@@ -1635,94 +1572,56 @@ with tabs[0]:
         
         # 필터된 채널별 데이터 계산 함수 정의
         def calculate_filtered_channel_data(channel_data, period_filter):
-            """필터된 기간의 채널별 데이터 계산"""
+            """필터된 기간의 채널별 데이터 계산 (일별 집계 테이블 조회)"""
             filtered_channel_data = {}
             filter_type = period_filter.get("type", "전체") if isinstance(period_filter, dict) else "전체"
+            period_totals = get_period_totals(active_sheet_id, channel_data, period_filter) if filter_type != "전체" else {}
             
             for ch, data in channel_data.items():
-                if filter_type == "전체":
-                    # 필터가 "전체"면 전체 데이터 사용
+                totals = period_totals.get(ch)
+                if totals is None:
+                    # 필터가 "전체"이거나 날짜가 없으면 전체 데이터 사용
                     filtered_channel_data[ch] = {
                         "revenue": data["revenue"],
                         "profit": data["profit"],
                         "profit_rate": data["profit_rate"],
                         "roas": data["roas"]
                     }
-                else:
-                    # 필터 적용
-                    df = data["df"].copy()
-                    if "날짜" not in df.columns or df.empty:
-                        # 날짜가 없으면 전체 데이터 사용
-                        filtered_channel_data[ch] = {
-                            "revenue": data["revenue"],
-                            "profit": data["profit"],
-                            "profit_rate": data["profit_rate"],
-                            "roas": data["roas"]
-                        }
-                        continue
-                    
-                    # 날짜 필터 적용
-                    if "날짜" in df.columns:
-                        df["날짜"] = pd.to_datetime(df["날짜"], errors="coerce")
-                        df = df.dropna(subset=["날짜"])
-                        df_filtered = apply_date_filter(df, "날짜", period_filter)
-                    else:
-                        df_filtered = df
-                    
-                    if len(df_filtered) == 0:
-                        # 필터된 기간에 데이터가 없으면 0으로 설정
-                        filtered_channel_data[ch] = {
-                            "revenue": 0,
-                            "profit": 0,
-                            "profit_rate": 0,
-                            "roas": 0
-                        }
-                        continue
-                    
-                    # 필터된 기간의 매출/순이익 계산
-                    revenue_col = data["kpi"]["total_revenue_col"]
-                    profit_col = data["kpi"]["total_profit_col"]
-                    
-                    filtered_revenue = 0
-                    filtered_profit = 0
-                    
-                    if revenue_col and revenue_col in df_filtered.columns:
-                        revenue_sum = df_filtered[revenue_col].sum()
-                        if pd.notna(revenue_sum):
-                            filtered_revenue = revenue_sum
-                    
-                    if profit_col and profit_col in df_filtered.columns:
-                        profit_sum = df_filtered[profit_col].sum()
-                        if pd.notna(profit_sum):
-                            filtered_profit = profit_sum
-                    
-                    # 순이익률 계산
-                    filtered_profit_rate = (filtered_profit / filtered_revenue * 100) if filtered_revenue > 0 else 0
-                    
-                    # ROAS 계산
-                    ad_cost_col = None
-                    for col in df_filtered.columns:
-                        col_name = str(col)
-                        if "광고비" in col_name and ("총" in col_name or "합계" in col_name):
-                            ad_cost_col = col
-                            break
-                    
-                    if ad_cost_col and ad_cost_col in df_filtered.columns:
-                        filtered_ad_cost = df_filtered[ad_cost_col].sum()
-                        filtered_roas = (filtered_revenue / filtered_ad_cost * 100) if filtered_ad_cost > 0 else 0
-                    else:
-                        # 광고비 컬럼이 없으면 기존 ROAS 비율 사용
-                        if data["roas"] > 0 and data["revenue"] > 0:
-                            filtered_roas = (filtered_revenue / data["revenue"]) * data["roas"] * 100
-                        else:
-                            filtered_roas = 0
-                    
+                    continue
+                
+                if totals["rows"] == 0:
+                    # 필터된 기간에 데이터가 없으면 0으로 설정
                     filtered_channel_data[ch] = {
-                        "revenue": filtered_revenue,
-                        "profit": filtered_profit,
-                        "profit_rate": filtered_profit_rate,
-                        "roas": filtered_roas / 100 if filtered_roas > 0 else 0
+                        "revenue": 0,
+                        "profit": 0,
+                        "profit_rate": 0,
+                        "roas": 0
                     }
+                    continue
+                
+                filtered_revenue = totals["revenue"]
+                filtered_profit = totals["profit"]
+                
+                # 순이익률 계산
+                filtered_profit_rate = (filtered_profit / filtered_revenue * 100) if filtered_revenue > 0 else 0
+                
+                # ROAS 계산
+                if totals["has_ad_cost"]:
+                    filtered_ad_cost = totals["ad_cost"]
+                    filtered_roas = (filtered_revenue / filtered_ad_cost * 100) if filtered_ad_cost > 0 else 0
+                else:
+                    # 광고비 컬럼이 없으면 기존 ROAS 비율 사용
+                    if data["roas"] > 0 and data["revenue"] > 0:
+                        filtered_roas = (filtered_revenue / data["revenue"]) * data["roas"] * 100
+                    else:
+                        filtered_roas = 0
+                
+                filtered_channel_data[ch] = {
+                    "revenue": filtered_revenue,
+                    "profit": filtered_profit,
+                    "profit_rate": filtered_profit_rate,
+                    "roas": filtered_roas / 100 if filtered_roas > 0 else 0
+                }
             
             return filtered_channel_data
         
@@ -2103,7 +2002,11 @@ with tabs[0]:
             with col_trend1:
                 st.markdown("### 📊 일별 매출/순이익 추이")
                 # 차트 생성 및 표시
-                fig_trend = create_enhanced_trend_chart(trend_data, selected_channels, period_filter)
+                # 기간 필터는 오늘 기준 날짜로 바꾼 경계를 키로 사용 ("최근 7일" 라벨만 쓰면 날짜가 바뀌어도 이전 창의 차트를 재사용함)
+                fig_trend = cached_figure(
+                    "trend", (trend_data, selected_channels, get_period_bounds(period_filter)),
+                    lambda: create_enhanced_trend_chart(trend_data, selected_channels, period_filter)
+                )
                 if fig_trend and len(fig_trend.data) > 0:
                     st.plotly_chart(fig_trend, use_container_width=True, key="trend_chart")
                 else:
@@ -2500,7 +2403,8 @@ with tabs[0]:
 previous_kpis = {}
 
 for idx, label in enumerate(SHEETS.keys(), start=1):
-    with tabs[idx]:
+    if show_tab(idx):
+        ensure_sheets_loaded([label])
         df = sheet_dfs[label]
         kpi = sheet_kpis[label]
 
@@ -2527,11 +2431,19 @@ for idx, label in enumerate(SHEETS.keys(), start=1):
         st.markdown("---")
 
         date_col = "날짜" if "날짜" in df.columns else df.columns[0]
-        fig_combo = make_combo_chart(df, date_col, kpi["total_revenue_col"], kpi["total_profit_col"])
+        # 차트에 쓰이는 컬럼만 지문에 포함 (같은 데이터면 재실행 시 캐시된 차트 재사용)
+        combo_cols = [c for c in dict.fromkeys([date_col, kpi["total_revenue_col"], kpi["total_profit_col"]]) if c in df.columns]
+        fig_combo = cached_figure(
+            "combo", (df[combo_cols], date_col, kpi["total_revenue_col"], kpi["total_profit_col"]),
+            lambda: make_combo_chart(df, date_col, kpi["total_revenue_col"], kpi["total_profit_col"])
+        )
         if fig_combo: st.plotly_chart(fig_combo, use_container_width=True, key=f"combo_{label}")
         
         st.markdown("---")
-        fig_weekday = make_weekday_chart(df, date_col, kpi["total_revenue_col"])
+        fig_weekday = cached_figure(
+            "weekday", (df[[c for c in combo_cols if c != kpi["total_profit_col"]]], date_col, kpi["total_revenue_col"]),
+            lambda: make_weekday_chart(df, date_col, kpi["total_revenue_col"])
+        )
         if fig_weekday: st.plotly_chart(fig_weekday, use_container_width=True, key=f"weekday_{label}")
         
         st.markdown("---")
@@ -2561,10 +2473,8 @@ for idx, label in enumerate(SHEETS.keys(), start=1):
 # ============================
 # 6-4. 상품 분석 탭 (안내 문구 추가됨)
 # ============================
-product_tab_start_idx = 1 + len(SHEETS)
-
 for i, (label, sheet_name) in enumerate(PRODUCT_SHEETS.items()):
-    with tabs[product_tab_start_idx + i]:
+    if show_tab(product_tab_start_idx + i):
         st.markdown(f"""<div class="section-title">📦 {label} 대시보드</div><div class="section-caption">모델별 판매량, 매출, 순이익을 심층 분석합니다.</div>""", unsafe_allow_html=True)
         
         # [NEW] 상단 안내 문구 (Info Box) 렌더링
@@ -2581,33 +2491,14 @@ for i, (label, sheet_name) in enumerate(PRODUCT_SHEETS.items()):
             st.warning("데이터가 없거나 로딩 실패. 시트 이름을 확인해주세요.")
             continue
             
-        # 매출 컬럼 찾기
-        revenue_col = next((c for c in df.columns if ("총" in str(c) or "합계" in str(c)) and ("매출" in str(c) or "정산" in str(c))), None)
-        if not revenue_col:
-            revenue_col = next((c for c in df.columns if "매출" in str(c) or "정산" in str(c)), None)
-
-        # 판관비 차감 전 이익 컬럼 찾기 (총 판관비 우선) → 없으면 순이익 컬럼
-        profit_col = next((c for c in df.columns if "총" in str(c) and "판관비" in str(c) and "차감" in str(c) and "이익" in str(c) and "개당" not in str(c)), None)
-        if not profit_col:
-            profit_col = next((c for c in df.columns if "판관비" in str(c) and "차감" in str(c) and "이익" in str(c) and "개당" not in str(c) and "이베이" not in str(c) and "11번가" not in str(c) and "B2B" not in str(c)), None)
-        if not profit_col:
-            profit_col = next((c for c in df.columns if "판관비" in str(c) and "차감" in str(c) and "이익" in str(c) and "개당" not in str(c)), None)
-        if not profit_col:
-            profit_col = next((c for c in df.columns if ("총" in str(c) or "합계" in str(c)) and "순이익" in str(c) and "률" not in str(c) and "개당" not in str(c)), None)
-        if not profit_col:
-            profit_col = next((c for c in df.columns if "순이익" in str(c) and "률" not in str(c) and "개당" not in str(c)), None)
-        
-        # 판매량 컬럼 찾기
-        qty_col = next((c for c in df.columns if ("총" in str(c) or "합계" in str(c)) and ("판매" in str(c) or "수량" in str(c))), None)
-        if not qty_col:
-            qty_col = next((c for c in df.columns if "판매" in str(c) or "수량" in str(c)), None)
-
+        # 컬럼 역할 매핑 (판관비 차감 전 이익 우선 → 없으면 순이익)
+        roles = resolve_roles(df.columns, "product")
         col_map = {
-            "model": next((c for c in df.columns if "Model" in str(c) or "모델" in str(c)), None),
-            "category": next((c for c in df.columns if "카테고리" in str(c)), None),
-            "sales_qty": qty_col,
-            "revenue": revenue_col,
-            "profit": profit_col
+            "model": roles["model"],
+            "category": roles["category"],
+            "sales_qty": roles["quantity"],
+            "revenue": roles["revenue"],
+            "profit": roles["profit"]
         }
         
         if not (col_map["model"] and col_map["revenue"]):
@@ -2627,7 +2518,9 @@ for i, (label, sheet_name) in enumerate(PRODUCT_SHEETS.items()):
         avg_margin = (total_prof / total_rev * 100) if total_rev > 0 else 0
         
         # 총 판매 Model 수 계산 (빈 셀 제외)
-        total_models = df[col_map["model"]].replace('', pd.NA).dropna().nunique()
+        # (Model 컬럼이 category일 수 있으므로 replace 대신 비교로 제외)
+        models = df[col_map["model"]]
+        total_models = models[models != ''].dropna().nunique()
         
         # 상단 카드
         st.markdown('<div class="metric-row">', unsafe_allow_html=True)
@@ -2644,19 +2537,29 @@ for i, (label, sheet_name) in enumerate(PRODUCT_SHEETS.items()):
         
         with c1:
             top10_rev = df.nlargest(10, col_map["revenue"]).sort_values(col_map["revenue"], ascending=True)
-            fig_top = px.bar(top10_rev, x=col_map["revenue"], y=col_map["model"], orientation='h', title="🏆 매출 TOP 10 모델")
-            fig_top.update_traces(texttemplate='%{x:,.0f} 원', textposition='outside')
-            fig_top.update_xaxes(tickformat=",")
-            fig_top.update_layout(template="plotly_dark", height=400)
+
+            def build_top10_rev():
+                fig = px.bar(top10_rev, x=col_map["revenue"], y=col_map["model"], orientation='h', title="🏆 매출 TOP 10 모델")
+                fig.update_traces(texttemplate='%{x:,.0f} 원', textposition='outside')
+                fig.update_xaxes(tickformat=",")
+                fig.update_layout(template="plotly_dark", height=400)
+                return fig
+
+            fig_top = cached_figure("top10_rev", (top10_rev[[col_map["revenue"], col_map["model"]]],), build_top10_rev)
             st.plotly_chart(fig_top, use_container_width=True, key=f"top10_rev_{label}")
             
         with c2:
             if col_map["profit"]:
                 top10_prof = df.nlargest(10, col_map["profit"]).sort_values(col_map["profit"], ascending=True)
-                fig_prof = px.bar(top10_prof, x=col_map["profit"], y=col_map["model"], orientation='h', title="💰 순이익 TOP 10 모델", color_discrete_sequence=['#2ecc71'])
-                fig_prof.update_traces(texttemplate='%{x:,.0f} 원', textposition='outside')
-                fig_prof.update_xaxes(tickformat=",")
-                fig_prof.update_layout(template="plotly_dark", height=400)
+
+                def build_top10_prof():
+                    fig = px.bar(top10_prof, x=col_map["profit"], y=col_map["model"], orientation='h', title="💰 순이익 TOP 10 모델", color_discrete_sequence=['#2ecc71'])
+                    fig.update_traces(texttemplate='%{x:,.0f} 원', textposition='outside')
+                    fig.update_xaxes(tickformat=",")
+                    fig.update_layout(template="plotly_dark", height=400)
+                    return fig
+
+                fig_prof = cached_figure("top10_prof", (top10_prof[[col_map["profit"], col_map["model"]]],), build_top10_prof)
                 st.plotly_chart(fig_prof, use_container_width=True, key=f"top10_prof_{label}")
 
         # 카테고리 분석 그래프
@@ -2667,7 +2570,8 @@ for i, (label, sheet_name) in enumerate(PRODUCT_SHEETS.items()):
             with c3:
                 # 가장 많이 팔린 카테고리 (판매량 기준)
                 if col_map["sales_qty"]:
-                    cat_sales = df.groupby(col_map["category"])[col_map["sales_qty"]].sum().reset_index()
+                    # 카테고리 컬럼은 category 타입 → 실제로 있는 값만 묶음 (observed=True)
+                    cat_sales = df.groupby(col_map["category"], observed=True)[col_map["sales_qty"]].sum().reset_index()
                     cat_sales = cat_sales[cat_sales[col_map["category"]] != ''].nlargest(10, col_map["sales_qty"]).sort_values(col_map["sales_qty"], ascending=True)
                     fig_cat_sales = px.bar(cat_sales, x=col_map["sales_qty"], y=col_map["category"], orientation='h', title="📦 판매량 TOP 카테고리", color_discrete_sequence=['#f59e0b'])
                     fig_cat_sales.update_traces(texttemplate='%{x:,.0f} 개', textposition='outside')
@@ -2677,7 +2581,7 @@ for i, (label, sheet_name) in enumerate(PRODUCT_SHEETS.items()):
             
             with c4:
                 # 가장 상품 종류가 많은 카테고리 (Model 수 기준)
-                cat_models = df.groupby(col_map["category"])[col_map["model"]].nunique().reset_index()
+                cat_models = df.groupby(col_map["category"], observed=True)[col_map["model"]].nunique().reset_index()
                 cat_models.columns = [col_map["category"], 'model_count']
                 cat_models = cat_models[cat_models[col_map["category"]] != ''].nlargest(10, 'model_count').sort_values('model_count', ascending=True)
                 fig_cat_models = px.bar(cat_models, x='model_count', y=col_map["category"], orientation='h', title="🏷️ 상품 종류 TOP 카테고리", color_discrete_sequence=['#8b5cf6'])
@@ -2687,16 +2591,22 @@ for i, (label, sheet_name) in enumerate(PRODUCT_SHEETS.items()):
 
         if col_map["profit"]:
             st.markdown("### 🧩 상품 포트폴리오 분석 (매출 vs 이익)")
-            fig_scat = px.scatter(
-                df, x=col_map["revenue"], y=col_map["profit"], 
-                hover_name=col_map["model"], size=col_map["sales_qty"] if col_map["sales_qty"] else None,
-                color=col_map["category"] if col_map["category"] else None,
-                title="모델별 매출 대비 순이익 분포 (원 크기: 판매량)"
-            )
-            fig_scat.update_xaxes(tickformat=",")
-            fig_scat.update_yaxes(tickformat=",")
-            fig_scat.update_traces(hovertemplate="<b>%{hovertext}</b><br>매출: %{x:,.0f}원<br>이익: %{y:,.0f}원<extra></extra>")
-            fig_scat.update_layout(template="plotly_dark", height=500)
+
+            def build_scatter():
+                fig = px.scatter(
+                    df, x=col_map["revenue"], y=col_map["profit"], 
+                    hover_name=col_map["model"], size=col_map["sales_qty"] if col_map["sales_qty"] else None,
+                    color=col_map["category"] if col_map["category"] else None,
+                    title="모델별 매출 대비 순이익 분포 (원 크기: 판매량)"
+                )
+                fig.update_xaxes(tickformat=",")
+                fig.update_yaxes(tickformat=",")
+                fig.update_traces(hovertemplate="<b>%{hovertext}</b><br>매출: %{x:,.0f}원<br>이익: %{y:,.0f}원<extra></extra>")
+                fig.update_layout(template="plotly_dark", height=500)
+                return fig
+
+            scatter_cols = [c for c in dict.fromkeys(col_map[k] for k in ("revenue", "profit", "model", "sales_qty", "category")) if c]
+            fig_scat = cached_figure("scatter", (df[scatter_cols], col_map), build_scatter)
             st.plotly_chart(fig_scat, use_container_width=True, key=f"scatter_{label}")
 
         with st.expander("📋 전체 데이터 리스트"):
@@ -2706,7 +2616,7 @@ for i, (label, sheet_name) in enumerate(PRODUCT_SHEETS.items()):
 # ============================
 # 7. 월별 비교 탭 (요약)
 # ============================
-with tabs[-2]:
+if show_tab(-2):
     st.markdown("""<div class="section-title"><span>📊 월별 비교 분석</span></div>""", unsafe_allow_html=True)
     
     available_months = get_available_months()
@@ -2738,6 +2648,7 @@ with tabs[-2]:
                 
                 def get_data_for_month(m_label):
                     if "실시간" in m_label:
+                        ensure_sheets_loaded(SHEETS.keys())
                         return {k: v for k, v in sheet_kpis.items() if v is not None}, current_month.replace("년 ", "-").replace("월", "")
                     else:
                         df = get_monthly_summary(m_label)
@@ -2827,21 +2738,32 @@ with tabs[-2]:
             with col2: selected_months = st.multiselect("분석할 월 선택 (2개 이상)", all_options, default=all_options[:min(3, len(all_options))])
             
             if len(selected_months) >= 2 and st.button("📈 트렌드 분석 실행", type="primary", use_container_width=True):
-                trend_data = []
-                for m_opt in selected_months:
-                    if "실시간" in m_opt:
-                        raw_d = sheet_kpis
-                        m_label = current_month.replace("년 ", "-").replace("월", "")
-                        for ch, val in raw_d.items():
-                            if ch in ["이베이", "11번가", "B2B"] and val:
-                                trend_data.append({"월": m_label, "채널": ch, "매출": val['total_revenue'], "순이익": val['total_profit']})
-                    else:
-                        df = get_monthly_summary(m_opt)
-                        for _, row in df.iterrows():
-                            trend_data.append({"월": m_opt, "채널": row['channel'], "매출": float(row['total_revenue']), "순이익": float(row['total_profit'])})
+                trend_frames = []
+                
+                # 저장된 월은 한 번의 쿼리로 조회
+                archived_months = [m for m in selected_months if "실시간" not in m]
+                if archived_months:
+                    db_trend = get_monthly_trend(archived_months)
+                    trend_frames.append(pd.DataFrame({
+                        "월": db_trend["year_month"],
+                        "채널": db_trend["channel"],
+                        "매출": db_trend["revenue"].astype(float),
+                        "순이익": db_trend["profit"].astype(float),
+                    }))
+                
+                if len(archived_months) < len(selected_months):
+                    ensure_sheets_loaded(SHEETS.keys())
+                    m_label = current_month.replace("년 ", "-").replace("월", "")
+                    live_rows = [
+                        {"월": m_label, "채널": ch, "매출": val['total_revenue'], "순이익": val['total_profit']}
+                        for ch, val in sheet_kpis.items()
+                        if ch in OVERVIEW_CHANNELS and val
+                    ]
+                    trend_frames.append(pd.DataFrame(live_rows))
                 
-                if trend_data:
-                    tdf = pd.DataFrame(trend_data).sort_values("월")
+                tdf = pd.concat(trend_frames, ignore_index=True) if trend_frames else pd.DataFrame()
+                if not tdf.empty:
+                    tdf = tdf.sort_values("월")
                     st.markdown("### 📈 월별 매출 추이")
                     fig_rev = px.line(tdf, x="월", y="매출", color="채널", markers=True, text="매출")
                     # X축 포맷 수정 (월별 트렌드)
@@ -2865,20 +2787,20 @@ with tabs[-2]:
 # ============================
 # 8. 월별 비교 (상세) 탭 - Overview 스타일
 # ============================
-with tabs[-1]:
+if show_tab(-1):
     st.markdown("""<div class="section-title"><span>📊 월별 비교 (상세)</span></div>""", unsafe_allow_html=True)
     
-    # 아카이브 파일 목록 가져오기
-    archive_files = get_archive_files()
-    
-    if not archive_files:
+    # 아카이브 파일 목록은 사이드바에서 읽은 것(Drive 카탈로그 + 로컬)을 그대로 사용
+    if not archive_files and not local_archives:
         st.warning("⚠️ 아카이브 파일이 없습니다.")
-        st.info("Google Drive의 'supermurray 아카이브' 폴더에 과거 데이터 파일을 추가하세요.")
+        st.info("Google Drive의 'supermurray 아카이브' 폴더나 로컬 archives/YYYY/MM/ 폴더에 과거 데이터 파일을 추가하세요.")
     else:
         # 현재 실시간 + 아카이브 파일 옵션
         file_options = [("🔴 실시간 (현재)", SHEET_ID, "실시간")]
         for f in archive_files:
             file_options.append((f"📁 {f['name']}", f['id'], f['name']))
+        for f in local_archives:
+            file_options.append((f"💾 {f['name']}", f['id'], f['name']))
         
         st.markdown("### 🆚 두 기간 선택")
         col1, col2 = st.columns(2)
@@ -2912,6 +2834,11 @@ with tabs[-1]:
                 st.warning("비교할 다른 기간이 없습니다.")
                 period_b_id = None
         
+        # 기간을 고르는 즉시 두 기간의 채널 시트를 미리 로딩 → 실행 버튼을 누르면 캐시에서 바로 표시
+        prefetch_sheets(period_a_id, OVERVIEW_CHANNELS, priority=PRIORITY_ARCHIVE)
+        if period_b_id:
+            prefetch_sheets(period_b_id, OVERVIEW_CHANNELS, priority=PRIORITY_ARCHIVE)
+        
         if period_b_id and st.button("📊 상세 비교 실행", type="primary", use_container_width=True, key="run_detail_compare"):
             st.markdown("---")
             
@@ -3125,9 +3052,9 @@ with tabs[-1]:
                 chart_data = []
                 for ch in ["이베이", "11번가", "B2B"]:
                     if ch in data_a:
-                        chart_data.append({"채널": ch, "기간": period_a_name.replace("📁 ", "").replace("🔴 ", ""), "매출": data_a[ch]["revenue"], "순이익": data_a[ch]["profit"]})
+                        chart_data.append({"채널": ch, "기간": period_a_name.replace("📁 ", "").replace("💾 ", "").replace("🔴 ", ""), "매출": data_a[ch]["revenue"], "순이익": data_a[ch]["profit"]})
                     if ch in data_b:
-                        chart_data.append({"채널": ch, "기간": period_b_name.replace("📁 ", "").replace("🔴 ", ""), "매출": data_b[ch]["revenue"], "순이익": data_b[ch]["profit"]})
+                        chart_data.append({"채널": ch, "기간": period_b_name.replace("📁 ", "").replace("💾 ", "").replace("🔴 ", ""), "매출": data_b[ch]["revenue"], "순이익": data_b[ch]["profit"]})
                 
                 if chart_data:
                     chart_df = pd.DataFrame(chart_data)
@@ -3148,4 +3075,54 @@ with tabs[-1]:
                         fig_prof.update_traces(texttemplate='%{y:,.0f}', textposition='outside')
                         fig_prof.update_layout(template="plotly_dark", height=400)
                         fig_prof.update_yaxes(tickformat=",")
-                        st.plotly_chart(fig_prof, use_container_width=True, key="detail_prof_chart")
\ No newline at end of file
+                        st.plotly_chart(fig_prof, use_container_width=True, key="detail_prof_chart")
+
+# ============================
+# 9. 실행 시간 계측 (사이드바)
+# ============================
+profile_record = finish_rerun()
+
+# 최근 10번의 실행 기록 (탭 전환/필터 변경 시 비교용, 프로파일러 기록에서만 만듦)
+if profile_record:
+    rerun_history = st.session_state.setdefault("profile_history", [])
+    rerun_history.append({
+        "탭": active_tab_label,
+        "CPU(ms)": round(profile_record["cpu_ms"]),
+        "경과(ms)": round(profile_record["total_ms"]),
+    })
+    del rerun_history[:-10]
+
+with st.sidebar:
+    # 프로파일링을 켠 경우: 이번 실행의 구간별 워터폴과 캐시 카운터
+    if profile_record:
+        with st.expander("🧪 프로파일러", expanded=True):
+            st.caption(f"총 {profile_record['total_ms']:,.0f}ms · CPU {profile_record['cpu_ms']:,.0f}ms · 기록: {PROFILE_LOG_PATH}")
+            st.dataframe(pd.DataFrame(rerun_history[::-1]), hide_index=True, use_container_width=True)
+            sections = profile_record["sections"]
+            if sections:
+                fig_profile = go.Figure(go.Bar(
+                    y=list(range(len(sections))),
+                    customdata=[s["name"] for s in sections],
+                    x=[s["ms"] for s in sections],
+                    base=[s["start_ms"] for s in sections],
+                    orientation="h",
+                    marker_color=["#3b82f6" if s["depth"] == 0 else "#f59e0b" for s in sections],
+                    hovertemplate="%{customdata}<br>시작 %{base:,.1f}ms · %{x:,.1f}ms<extra></extra>",
+                ))
+                # 같은 이름의 구간도 각자 한 줄씩 (중첩 깊이만큼 들여쓰기)
+                fig_profile.update_yaxes(
+                    autorange="reversed",
+                    tickvals=list(range(len(sections))),
+                    ticktext=[f"{'· ' * s['depth']}{s['name']}" for s in sections],
+                )
+                fig_profile.update_xaxes(title="ms")
+                fig_profile.update_layout(template="plotly_dark", height=max(200, 22 * len(sections)), margin=dict(l=10, r=10, t=10, b=30))
+                st.plotly_chart(fig_profile, use_container_width=True, key="profile_waterfall")
+            st.caption("Google API 스케줄러 · 동시 요청 합치기")
+            st.json({**get_scheduler().stats(), "single_flight": get_single_flight().stats()}, expanded=False)
+            if profile_record["counters"]:
+                st.caption("카운터 (프로세스 전체, 백그라운드 작업 포함)")
+                st.dataframe(
+                    pd.DataFrame(sorted(profile_record["counters"].items()), columns=["이름", "횟수"]),
+                    hide_index=True, use_container_width=True
+                )
@@ -0,0 +1,113 @@
+"""
+아카이브 카탈로그
+Drive 아카이브 폴더의 파일 목록을 dashboard_data.db(archive_catalog)에 보관
+처음 한 번만 폴더 전체를 조회하고, 이후에는 Drive changes API(페이지 토큰)로 바뀐 파일만 반영
+→ 아카이브 목록 조회는 로컬 DB 읽기
+"""
+
+import threading
+import time
+
+from api_scheduler import call_api
+from database import get_archive_catalog, get_archive_catalog_state, save_archive_catalog
+from sheets_client import ARCHIVE_FOLDER_ID, SPREADSHEET_MIME_TYPE, list_archive_files
+
+# changes API 확인 간격 (초). 이 안에는 DB에 있는 목록을 그대로 사용
+CATALOG_POLL_SECONDS = 60
+
+CHANGE_FIELDS = "nextPageToken, newStartPageToken, changes(fileId, removed, file(id, name, mimeType, modifiedTime, parents, trashed))"
+
+# Drive 클라이언트(httplib2)는 스레드 안전하지 않으므로 동기화는 한 번에 하나씩
+_sync_lock = threading.Lock()
+
+
+def _full_sync(drive_service, folder_id: str):
+    # 목록을 읽기 전에 토큰을 받아 둠 → 목록 조회 중 생긴 변경도 다음 동기화 때 반영
+    page_token = call_api("drive", drive_service.changes().getStartPageToken().execute)["startPageToken"]
+    files = list_archive_files(drive_service, folder_id)
+    save_archive_catalog(folder_id, page_token, upserts=files, replace=True)
+
+
+def _incremental_sync(drive_service, folder_id: str, page_token: str):
+    # 같은 파일이 여러 번 바뀌었으면 마지막 상태만 반영 (파일 ID → 파일 정보, 폴더에서 빠졌으면 None)
+    latest = {}
+    new_token = page_token
+    while page_token:
+        request = drive_service.changes().list(
+            pageToken=page_token,
+            spaces="drive",
+            includeRemoved=True,
+            pageSize=1000,
+            fields=CHANGE_FIELDS
+        )
+        results = call_api("drive", request.execute)
+
+        for change in results.get("changes", []):
+            file = change.get("file") or {}
+            in_folder = (
+                not change.get("removed")
+                and not file.get("trashed")
+                and file.get("mimeType") == SPREADSHEET_MIME_TYPE
+                and folder_id in file.get("parents", [])
+            )
+            latest[change["fileId"]] = (
+                {"id": file["id"], "name": file.get("name"), "modifiedTime": file.get("modifiedTime")}
+                if in_folder else None
+            )
+
+        page_token = results.get("nextPageToken")
+        new_token = results.get("newStartPageToken", new_token)
+
+    save_archive_catalog(
+        folder_id,
+        new_token,
+        upserts=[f for f in latest.values() if f is not None],
+        removed_ids=[file_id for file_id, f in latest.items() if f is None],
+    )
+
+
+def sync_archive_catalog(drive_service, folder_id: str = ARCHIVE_FOLDER_ID, force: bool = False) -> bool:
+    """
+    카탈로그를 Drive와 동기화
+
+    Args:
+        drive_service: create_drive_service 결과 (프로세스에서 하나를 공유)
+        folder_id: 아카이브 폴더 ID
+        force: 확인 간격과 관계없이 바로 확인
+
+    Returns:
+        bool: Drive에 확인했으면 True (확인 간격 안이라 건너뛰었으면 False)
+    """
+    from googleapiclient.errors import HttpError
+
+    with _sync_lock:
+        state = get_archive_catalog_state(folder_id)
+        if state and not force and time.time() - state["checked_at"] < CATALOG_POLL_SECONDS:
+            return False
+
+        if state is None or not state["page_token"]:
+            _full_sync(drive_service, folder_id)
+            return True
+
+        try:
+            _incremental_sync(drive_service, folder_id, state["page_token"])
+        except HttpError as e:
+            # 토큰이 만료/무효하면 전체 목록을 다시 받음
+            if e.resp.status not in (400, 404, 410):
+                raise
+            _full_sync(drive_service, folder_id)
+        return True
+
+
+def list_catalog_files(drive_service=None, folder_id: str = ARCHIVE_FOLDER_ID, force: bool = False) -> list:
+    """
+    아카이브 파일 목록 (필요하면 동기화 후 DB에서 읽음)
+
+    drive_service가 None이면 동기화 없이 마지막으로 저장된 목록을 반환
+
+    Returns:
+        list: {id, name, modifiedTime} 목록 (이름 역순)
+    """
+    if drive_service is not None:
+        sync_archive_catalog(drive_service, folder_id, force)
+    return get_archive_catalog(folder_id)
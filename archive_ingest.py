@@ -0,0 +1,141 @@
+"""
+아카이브 수집기
+Google Drive 아카이브 폴더의 월별 스프레드시트를 읽어 dashboard_data.db(월별 요약/일별 상세)에 저장
+Drive 수정 시각이 마지막 저장 때와 같은 파일은 건너뜀
+
+사용법:
+    python archive_ingest.py [--force] [--folder 폴더ID]
+"""
+
+import argparse
+import re
+
+from gspread.exceptions import WorksheetNotFound
+
+from database import init_database, save_archive_metadata, get_archive_metadata, replace_month_data
+from dataframe_to_db import save_dataframe_to_db
+from sheet_parser import parse_sheet_values
+
+# 월별 비교 대상 채널 (아카이브 파일의 시트 이름)
+ARCHIVE_CHANNELS = ("이베이", "11번가", "B2B")
+
+_YEAR_MONTH_RE = re.compile(r"(\d{4})-(\d{2})")
+
+
+def archive_year_month(file_name: str):
+    """아카이브 파일명에서 연월 추출 ("2025-11_..." → "2025-11", 월 단위 파일이 아니면 None)"""
+    match = _YEAR_MONTH_RE.search(file_name)
+    return f"{match.group(1)}-{match.group(2)}" if match else None
+
+
+def ingest_archives(files: list, fetch_values, force: bool = False, progress=None) -> dict:
+    """
+    아카이브 파일들을 DB에 저장
+
+    Args:
+        files: get_archive_files 결과 ({id, name, modifiedTime} 목록, 최신 파일 우선)
+        fetch_values: (spreadsheet_id, sheet_name) -> get_all_values 형식 값
+        force: 수정 시각과 관계없이 다시 저장
+        progress: (처리한 파일 수, 전체 파일 수, 파일명) 콜백
+
+    Returns:
+        dict: {"saved": [연월], "skipped": [파일명], "failed": {파일명: 사유}}
+    """
+    metadata = get_archive_metadata()
+    report = {"saved": [], "skipped": [], "failed": {}}
+    seen_months = set()
+
+    for i, file in enumerate(files):
+        name = file.get("name", "")
+        year_month = archive_year_month(name)
+        recorded = metadata.get(year_month)
+
+        # 월 단위가 아닌 파일("통합 데이터" 등), 같은 월의 이전 파일, 수정되지 않은 파일은 건너뜀
+        unchanged = (
+            recorded is not None
+            and recorded["file_id"] == file["id"]
+            and recorded["modified_time"] == file.get("modifiedTime")
+        )
+        if year_month is None or year_month in seen_months or (unchanged and not force):
+            report["skipped"].append(name)
+            if year_month:
+                seen_months.add(year_month)
+            if progress:
+                progress(i + 1, len(files), name)
+            continue
+        seen_months.add(year_month)
+
+        # 채널 시트는 한 번씩만 읽음
+        frames = {}
+        errors = []
+        for channel in ARCHIVE_CHANNELS:
+            try:
+                df = parse_sheet_values(fetch_values(file["id"], channel))
+            except WorksheetNotFound:
+                continue
+            except Exception as e:
+                errors.append(f"{channel}: {e}")
+                continue
+            if not df.empty:
+                frames[channel] = df
+
+        if not errors and not frames:
+            errors.append("저장할 채널 데이터 없음")
+
+        # 모두 읽은 뒤에만 기존 월 데이터를 교체 (조회/저장 실패 시 이전 데이터 유지)
+        if not errors:
+            batches = []
+
+            def collect(*batch):
+                batches.append(batch)
+                return True
+
+            for channel, df in frames.items():
+                if not save_dataframe_to_db(df, channel, year_month, collect):
+                    errors.append(f"{channel}: 요약 계산 실패")
+        # 삭제와 모든 채널 저장을 한 트랜잭션으로 (중간에 실패하면 전체 롤백)
+        if not errors and not replace_month_data(year_month, batches):
+            errors.append("DB 저장 실패")
+
+        # 실패가 있으면 메타데이터를 남기지 않음 → 다음 실행 때 다시 시도
+        if errors:
+            report["failed"][name] = "; ".join(errors)
+        else:
+            save_archive_metadata(year_month, name, list(frames), file["id"], file.get("modifiedTime"))
+            report["saved"].append(year_month)
+
+        if progress:
+            progress(i + 1, len(files), name)
+
+    return report
+
+
+def main():
+    from sheets_client import ARCHIVE_FOLDER_ID, load_credentials, create_gspread_client, create_drive_service, fetch_values
+    from archive_catalog import list_catalog_files
+
+    parser = argparse.ArgumentParser(description="아카이브 폴더 → dashboard_data.db 수집")
+    parser.add_argument("--force", action="store_true", help="수정 시각과 관계없이 모두 다시 저장")
+    parser.add_argument("--folder", default=ARCHIVE_FOLDER_ID, help="아카이브 폴더 ID")
+    args = parser.parse_args()
+
+    init_database()
+    creds = load_credentials()
+    files = list_catalog_files(create_drive_service(creds), args.folder, force=True)
+    gc = create_gspread_client(creds)
+
+    report = ingest_archives(
+        files,
+        lambda spreadsheet_id, sheet_name: fetch_values(gc, spreadsheet_id, sheet_name),
+        force=args.force,
+        progress=lambda done, total, name: print(f"[{done}/{total}] {name}"),
+    )
+
+    print(f"✅ 저장: {', '.join(report['saved']) or '없음'}")
+    print(f"⏭️ 건너뜀: {len(report['skipped'])}개 파일")
+    for name, reason in report["failed"].items():
+        print(f"❌ {name}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,667 @@
+"""
+대시보드 성능 벤치마크
+Google 인증 없이 합성 데이터로 주요 처리 단계의 시간과 메모리를 측정
+
+사용법:
+    python benchmark.py parse [--rows 5000] [--channels 3]
+    python benchmark.py ingest [--months 12]
+    python benchmark.py suite [--quick] [--output benchmark_results.json] [--compare 이전결과.json]
+    python benchmark.py render [--source 기록디렉터리] [--latency-ms 300] [--output benchmark_results_render.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import database
+import snapshot_cache
+from data_sources import DATA_SOURCE_ENV, DEFAULT_RECORDING, LATENCY_ENV, record_values
+from analytics import calc_kpis, apply_date_filter, calculate_growth_rates, calculate_volatility_metrics
+from sheet_parser import convert_columns, dedupe_header, find_header_row, is_text_column, parse_sheet_values
+
+# 일별 시트가 있는 채널 (app.SHEETS)
+DAILY_CHANNELS = ("메인 A", "메인 B", "이베이", "11번가", "B2B")
+
+# Overview 채널 (app.OVERVIEW_CHANNELS)
+OVERVIEW_CHANNELS = ("이베이", "11번가", "B2B")
+
+# suite 측정 규모: 일별 시트 기간(개월), 상품 시트 모델 수
+SUITE_MONTHS = (1, 12, 60)
+SUITE_PRODUCT_ROWS = (100, 1_000, 10_000, 100_000)
+QUICK_MONTHS = (1, 12)
+QUICK_PRODUCT_ROWS = (100, 1_000)
+
+# 상품 분석 시트 (app.PRODUCT_SHEETS)
+PRODUCT_SHEETS = ("통합_상품분석", "이베이_상품분석", "11_상품분석", "B2B_상품분석")
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+# ============================
+# 합성 데이터 생성
+# ============================
+
+def make_product_sheet_values(rows: int = 5000, channels: int = 3, seed: int = 42) -> list:
+    """
+    통합_상품분석 형태의 넓은 상품 시트 원본 값 생성 (get_all_values 형식)
+
+    Model/카테고리 + 채널별 판매수량/정산매출/제조원가/순이익/순이익률 컬럼
+    """
+    rnd = random.Random(seed)
+    header = ["Model", "카테고리", "총 판매수량", "총 정산매출", "총 판관비 차감 전 이익"]
+    for ch in range(channels):
+        header += [f"채널{ch + 1} 판매수량", f"채널{ch + 1} 정산매출", f"채널{ch + 1} 제조원가",
+                   f"채널{ch + 1} 순이익", f"채널{ch + 1} 순이익률"]
+
+    categories = [f"카테고리{i}" for i in range(30)]
+    values = [header]
+    for i in range(rows):
+        row = [f"MD-{i:06d}", rnd.choice(categories)]
+        row += [f"{rnd.randint(0, 500):,}", f"{rnd.randint(0, 50_000_000):,}", f"{rnd.randint(-2_000_000, 9_000_000):,}"]
+        for _ in range(channels):
+            revenue = rnd.randint(0, 20_000_000)
+            row += [
+                f"{rnd.randint(0, 200):,}",
+                f"{revenue:,}",
+                f"{int(revenue * rnd.uniform(0.4, 0.8)):,}",
+                f"{int(revenue * rnd.uniform(-0.1, 0.3)):,}",
+                f"{rnd.uniform(-10, 30):.1f}%" if revenue else "",
+            ]
+        values.append(row)
+    return values
+
+
+def make_daily_sheet_values(months: int = 1, channel: str = "이베이", seed: int = 42, end=None) -> list:
+    """
+    일별 매출 시트 원본 값 생성 (get_all_values 형식)
+
+    제목 행 + 헤더(날짜/정산매출 합계/총광고비/ROAS/제조원가/순이익/순이익률 등) + 합계 행 + 일별 행
+    숫자는 시트 표시 형식 그대로 콤마/퍼센트 문자열 (오늘까지 months개월)
+    """
+    rnd = random.Random(seed)
+    end = pd.Timestamp(end or pd.Timestamp.today()).normalize()
+    dates = pd.date_range(end - pd.DateOffset(months=months) + pd.Timedelta(days=1), end, freq="D")
+
+    header = ["날짜", "요일", "주문수", "정산매출 합계", "쿠팡 정산매출", "자사몰 정산매출", "총광고비",
+              "광고센터 ROAS", "ROAS", "제조원가", "순이익", "순이익률", "비고"]
+    rows = []
+    totals = [0] * 7
+    for d in dates:
+        revenue = rnd.randint(0, 30_000_000)
+        coupang = int(revenue * rnd.uniform(0.3, 0.7))
+        ad_cost = int(revenue * rnd.uniform(0.05, 0.2))
+        cost = int(revenue * rnd.uniform(0.4, 0.7))
+        profit = revenue - ad_cost - cost
+        orders = rnd.randint(0, 400)
+        rows.append([
+            d.strftime("%Y-%m-%d"),
+            "월화수목금토일"[d.weekday()],
+            f"{orders:,}",
+            f"{revenue:,}",
+            f"{coupang:,}",
+            f"{revenue - coupang:,}",
+            f"{ad_cost:,}",
+            f"{rnd.uniform(100, 900):.0f}%",
+            f"{revenue / ad_cost * 100:.0f}%" if ad_cost else "",
+            f"{cost:,}",
+            f"{profit:,}",
+            f"{profit / revenue * 100:.1f}%" if revenue else "",
+            rnd.choice(["", "", "", "행사", "품절"]),
+        ])
+        for i, v in enumerate((orders, revenue, coupang, revenue - coupang, ad_cost, cost, profit)):
+            totals[i] += v
+
+    orders, revenue, coupang, own, ad_cost, cost, profit = totals
+    total_row = ["합계", "", f"{orders:,}", f"{revenue:,}", f"{coupang:,}", f"{own:,}", f"{ad_cost:,}", "",
+                 f"{revenue / ad_cost * 100:.0f}%" if ad_cost else "", f"{cost:,}", f"{profit:,}",
+                 f"{profit / revenue * 100:.1f}%" if revenue else "", ""]
+    title = [f"{channel} 일별 매출"] + [""] * (len(header) - 1)
+    return [title, header, total_row] + rows
+
+
+def to_typed_values(values: list) -> list:
+    """
+    서식 있는 시트 값을 fetch_typed_values 결과 형식으로 변환
+    (숫자 → int/float, 날짜 → 일련번호, % 셀과 텍스트 컬럼은 apply_typed_formats처럼 문자열 유지)
+    """
+    header_idx = find_header_row(values)
+    text_cols = {i for i, col in enumerate(values[header_idx]) if col != "날짜" and is_text_column(col)}
+    origin = datetime(1899, 12, 30)
+
+    def convert(i, cell):
+        if i in text_cols or not cell or cell.rstrip().endswith("%"):
+            return cell
+        try:
+            return (datetime.strptime(cell, "%Y-%m-%d") - origin).days
+        except ValueError:
+            pass
+        try:
+            number = float(cell.replace(",", ""))
+        except ValueError:
+            return cell
+        return int(number) if number.is_integer() else number
+
+    return values[:header_idx + 1] + [[convert(i, cell) for i, cell in enumerate(row)] for row in values[header_idx + 1:]]
+
+
+def make_monthly_batches(months: int = 12, channels=DAILY_CHANNELS, seed: int = 42) -> list:
+    """
+    save_monthly_batches 입력 형태의 월×채널 일별 데이터 생성
+
+    Returns:
+        list: (year_month, channel, summary_data, daily_df) 목록
+    """
+    rnd = random.Random(seed)
+    end = pd.Timestamp.today().normalize().replace(day=1)
+    batches = []
+    for i in range(months, 0, -1):
+        start = end - pd.DateOffset(months=i)
+        dates = pd.date_range(start, start + pd.offsets.MonthEnd(0), freq="D")
+        year_month = start.strftime("%Y-%m")
+        for channel in channels:
+            revenue = [rnd.randint(0, 30_000_000) for _ in dates]
+            ad_cost = [int(r * rnd.uniform(0.05, 0.2)) for r in revenue]
+            cost = [int(r * rnd.uniform(0.4, 0.7)) for r in revenue]
+            profit = [r - a - c for r, a, c in zip(revenue, ad_cost, cost)]
+            daily_df = pd.DataFrame({
+                "date": dates,
+                "ad_cost": ad_cost,
+                "revenue": revenue,
+                "manufacturing_cost": cost,
+                "profit": profit,
+                "profit_rate": [p / r * 100 if r else 0.0 for p, r in zip(profit, revenue)],
+            })
+            summary = {
+                "total_ad_cost": float(daily_df["ad_cost"].sum()),
+                "total_revenue": float(daily_df["revenue"].sum()),
+                "total_manufacturing_cost": float(daily_df["manufacturing_cost"].sum()),
+                "total_profit": float(daily_df["profit"].sum()),
+            }
+            batches.append((year_month, channel, summary, daily_df))
+    return batches
+
+
+# ============================
+# 기존 처리 방식 (비교 기준)
+# ============================
+
+def legacy_parse_sheet_values(values: list) -> pd.DataFrame:
+    """개선 전 load_sheet의 컬럼 정리 방식 (컬럼마다 여러 번의 문자열 패스)"""
+    if len(values) < 2:
+        return pd.DataFrame()
+
+    header_row_idx = 1
+    if "Model" in values[0] or "모델" in values[0]:
+        header_row_idx = 0
+    header = values[header_row_idx]
+    rows = values[header_row_idx + 1:]
+
+    seen = {}
+    new_header = []
+    for col in header:
+        if col in seen:
+            seen[col] += 1
+            new_header.append(f"{col}_{seen[col]}")
+        else:
+            seen[col] = 0
+            new_header.append(col)
+
+    df = pd.DataFrame(rows, columns=new_header)
+    if not df.empty:
+        if "날짜" in df.columns and str(df["날짜"].iloc[0]) == "합계":
+            df = df.iloc[1:].reset_index(drop=True)
+        elif str(df.iloc[0, 0]) == "합계":
+            df = df.iloc[1:].reset_index(drop=True)
+
+    if "날짜" in df.columns:
+        df["날짜"] = pd.to_datetime(df["날짜"], errors="coerce")
+
+    for c in df.columns:
+        if c == "날짜" or c == "Model" or c == "카테고리" or "모델" in c:
+            continue
+        df[c] = (
+            df[c]
+            .astype(str)
+            .str.replace(",", "", regex=False)
+            .str.replace("%", "", regex=False)
+            .str.strip()
+        )
+        # errors="ignore"와 같은 동작 (변환 실패 시 문자열 유지)
+        try:
+            df[c] = pd.to_numeric(df[c])
+        except (ValueError, TypeError):
+            pass
+    return df
+
+
+def rowwise_parse_sheet_values(values: list) -> pd.DataFrame:
+    """컬럼 단위 파서 이전의 parse_sheet_values (행 목록으로 object DataFrame을 만든 뒤 컬럼별 변환)"""
+    if len(values) < 2:
+        return pd.DataFrame()
+
+    header_row_idx = find_header_row(values)
+    df = pd.DataFrame(values[header_row_idx + 1:], columns=dedupe_header(values[header_row_idx]), dtype=object)
+    if not df.empty:
+        if "날짜" in df.columns and str(df["날짜"].iloc[0]) == "합계":
+            df = df.iloc[1:].reset_index(drop=True)
+        elif str(df.iloc[0, 0]) == "합계":
+            df = df.iloc[1:].reset_index(drop=True)
+    return convert_columns(df)
+
+
+def legacy_save_monthly_data(year_month: str, channel: str, summary_data: dict, daily_df: pd.DataFrame):
+    """개선 전 save_monthly_data (호출마다 연결, iterrows로 한 행씩 INSERT)"""
+    conn = sqlite3.connect(database.DB_PATH)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            INSERT OR REPLACE INTO monthly_summary
+            (year_month, channel, total_ad_cost, total_revenue,
+             total_manufacturing_cost, total_profit, avg_profit_rate, roas, ad_coverage)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, database._summary_row(year_month, channel, summary_data))
+        for _, row in daily_df.iterrows():
+            cursor.execute("""
+                INSERT OR REPLACE INTO daily_details
+                (year_month, date, channel, ad_cost, revenue,
+                 manufacturing_cost, profit, profit_rate)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                year_month,
+                # 기존 코드는 Timestamp를 바인딩하지 못하므로 문자열로 넘김
+                row.get('date').strftime("%Y-%m-%d"),
+                channel,
+                float(row.get('ad_cost', 0)),
+                float(row.get('revenue', 0)),
+                float(row.get('manufacturing_cost', 0)),
+                float(row.get('profit', 0)),
+                float(row.get('profit_rate', 0)),
+            ))
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+
+# ============================
+# 측정 도구
+# ============================
+
+def time_stats(func, repeat: int = 5, setup=None):
+    """(최소, 중앙값) 실행 시간(초)과 마지막 결과 반환 (setup은 매 반복 전에 실행, 시간에서 제외)"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times), result
+
+
+def time_call(func, *args, repeat: int = 5):
+    """가장 빠른 실행 시간(초)과 마지막 결과 반환"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def frame_memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def peak_memory_mb(func, *args) -> float:
+    """func 실행 중 최대 추가 할당량(MB, tracemalloc 기준, 입력 데이터 제외)"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+# ============================
+# 벤치마크
+# ============================
+
+def bench_parse(rows: int, channels: int, repeat: int):
+    values = make_product_sheet_values(rows, channels)
+    typed_values = to_typed_values(values)
+    print(f"📦 상품 시트 파싱: {rows:,}행 × {len(values[0])}열")
+
+    legacy_time, legacy_df = time_call(legacy_parse_sheet_values, values, repeat=repeat)
+    rowwise_time, rowwise_df = time_call(rowwise_parse_sheet_values, values, repeat=repeat)
+    new_time, new_df = time_call(parse_sheet_values, values, repeat=repeat)
+    rowwise_typed_time, rowwise_typed_df = time_call(rowwise_parse_sheet_values, typed_values, repeat=repeat)
+    typed_time, typed_df = time_call(parse_sheet_values, typed_values, repeat=repeat)
+
+    peaks = {
+        "legacy": peak_memory_mb(legacy_parse_sheet_values, values),
+        "rowwise": peak_memory_mb(rowwise_parse_sheet_values, values),
+        "new": peak_memory_mb(parse_sheet_values, values),
+        "rowwise_typed": peak_memory_mb(rowwise_parse_sheet_values, typed_values),
+        "typed": peak_memory_mb(parse_sheet_values, typed_values),
+    }
+
+    print(f"{'':16}{'시간(ms)':>12}{'결과(MB)':>12}{'최대 할당(MB)':>16}")
+    for label, key, elapsed, df in (
+        ("기존", "legacy", legacy_time, legacy_df),
+        ("행 단위", "rowwise", rowwise_time, rowwise_df),
+        ("컬럼 단위", "new", new_time, new_df),
+        ("행 단위 (형식 없음)", "rowwise_typed", rowwise_typed_time, rowwise_typed_df),
+        ("컬럼 단위 (형식 없음)", "typed", typed_time, typed_df),
+    ):
+        print(f"{label:16}{elapsed * 1000:>12.1f}{frame_memory_mb(df):>12.2f}{peaks[key]:>16.2f}")
+
+    print(f"속도 {legacy_time / new_time:.1f}배, 메모리 {frame_memory_mb(new_df) / frame_memory_mb(legacy_df) * 100:.0f}%")
+    print(f"형식 없는 값 조회 시 파싱 {new_time / typed_time:.1f}배")
+    print(
+        f"컬럼 단위 파서: 속도 {rowwise_time / new_time:.1f}배 (형식 없음 {rowwise_typed_time / typed_time:.1f}배), "
+        f"최대 할당 {peaks['new'] / peaks['rowwise'] * 100:.0f}% (형식 없음 {peaks['typed'] / peaks['rowwise_typed'] * 100:.0f}%), "
+        f"결과 {'일치' if new_df.equals(rowwise_df) and typed_df.equals(rowwise_typed_df) else '불일치'}"
+    )
+
+
+def bench_ingest(months: int, repeat: int):
+    batches = make_monthly_batches(months)
+    rows = sum(len(b[3]) for b in batches)
+    print(f"💾 월별 데이터 저장: {months}개월 × {len(DAILY_CHANNELS)}채널 = {rows:,}행")
+
+    original_path = database.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench.db")
+        try:
+            database.init_database()
+
+            def legacy():
+                for batch in batches:
+                    legacy_save_monthly_data(*batch)
+
+            legacy_time, _ = time_call(legacy, repeat=repeat)
+            bulk_time, ok = time_call(database.save_monthly_batches, batches, repeat=repeat)
+            stored = len(database.get_daily_details(batches[0][0]))
+        finally:
+            database.close_connections()
+            database.DB_PATH = original_path
+
+    print(f"{'':12}{'시간(ms)':>12}{'행/초':>14}")
+    print(f"{'기존':12}{legacy_time * 1000:>12.1f}{rows / legacy_time:>14,.0f}")
+    print(f"{'개선':12}{bulk_time * 1000:>12.1f}{rows / bulk_time:>14,.0f}")
+    print(f"속도 {legacy_time / bulk_time:.1f}배 (저장 {'성공' if ok else '실패'}, 첫 달 {stored}행)")
+
+
+def _suite_repeat(rows: int, repeat: int) -> int:
+    # 큰 규모는 반복 횟수를 줄임 (10만 행 파싱은 한 번에 수 초)
+    return max(1, repeat // 5) if rows >= 50_000 else repeat
+
+
+def bench_suite(months_list, product_rows_list, repeat: int) -> list:
+    """
+    주요 함수별 규모에 따른 실행 시간 측정
+
+    load_sheet는 Streamlit 캐시를 뺀 같은 경로(스냅샷 캐시 + 파싱)를 메모리 속 시트로 측정
+    (cold: 스냅샷 만료 → 조회/저장/파싱, warm: 스냅샷 적중 → 읽기/파싱)
+
+    Returns:
+        list: {"bench", "scale", "rows", "best_ms", "median_ms", "repeat"} 목록
+    """
+    results = []
+
+    def record(bench, scale, rows, runs, best, median):
+        results.append({
+            "bench": bench,
+            "scale": scale,
+            "rows": rows,
+            "best_ms": round(best * 1000, 3),
+            "median_ms": round(median * 1000, 3),
+            "repeat": runs,
+        })
+        print(f"{bench:<28}{scale:>10}{rows:>10,}{best * 1000:>12.2f}{median * 1000:>12.2f}")
+
+    original_db_path = database.DB_PATH
+    original_snapshot_path = snapshot_cache.SNAPSHOT_DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench.db")
+        snapshot_cache.SNAPSHOT_DB_PATH = os.path.join(tmp, "bench_snapshots.db")
+        try:
+            database.init_database()
+            print(f"{'측정 항목':<28}{'규모':>10}{'행 수':>10}{'최소(ms)':>12}{'중앙값(ms)':>12}")
+
+            def bench_load(scale, sheet_id, sheet_name, values, runs):
+                def fetch(spreadsheet_id, name):
+                    return values
+
+                def load():
+                    return parse_sheet_values(snapshot_cache.get_sheet_values(sheet_id, sheet_name, fetch))
+
+                rows = len(values)
+                best, median, df = time_stats(load, runs, setup=lambda: snapshot_cache.invalidate_snapshots(sheet_id))
+                record("load_sheet (cold)", scale, rows, runs, best, median)
+                best, median, df = time_stats(load, runs)
+                record("load_sheet (warm)", scale, rows, runs, best, median)
+                return df
+
+            for months in months_list:
+                scale = f"{months}m"
+                channel_data = {}
+                for i, channel in enumerate(OVERVIEW_CHANNELS):
+                    values = make_daily_sheet_values(months, channel, seed=i)
+                    if i == 0:
+                        df = bench_load(scale, f"bench-{scale}", channel, values, repeat)
+                    else:
+                        df = parse_sheet_values(values)
+                    kpi = calc_kpis(df)
+                    channel_data[channel] = {"df": df, "kpi": kpi, "revenue": kpi["total_revenue"],
+                                             "profit": kpi["total_profit"], "roas": kpi["roas"]}
+
+                df = channel_data[OVERVIEW_CHANNELS[0]]["df"]
+                rows = len(df)
+                best, median, _ = time_stats(lambda: calc_kpis(df), repeat)
+                record("calc_kpis", scale, rows, repeat, best, median)
+
+                end = df["날짜"].max()
+                custom = {"type": "custom", "start": end - pd.Timedelta(days=45), "end": end - pd.Timedelta(days=15)}
+                for label, period_filter in (("최근 30일", {"type": "최근 30일"}), ("custom", custom)):
+                    best, median, _ = time_stats(lambda: apply_date_filter(df, "날짜", period_filter), repeat)
+                    record(f"apply_date_filter ({label})", scale, rows, repeat, best, median)
+
+                total_rows = sum(len(d["df"]) for d in channel_data.values())
+                best, median, _ = time_stats(lambda: calculate_growth_rates(channel_data), repeat)
+                record("calculate_growth_rates", scale, total_rows, repeat, best, median)
+                best, median, _ = time_stats(lambda: calculate_volatility_metrics(channel_data), repeat)
+                record("calculate_volatility_metrics", scale, total_rows, repeat, best, median)
+
+                batches = make_monthly_batches(months)
+                batch_rows = sum(len(b[3]) for b in batches)
+
+                def save_all():
+                    for batch in batches:
+                        database.save_monthly_data(*batch)
+
+                best, median, _ = time_stats(save_all, repeat)
+                record("save_monthly_data", scale, batch_rows, repeat, best, median)
+
+            for product_rows in product_rows_list:
+                runs = _suite_repeat(product_rows, repeat)
+                values = make_product_sheet_values(product_rows)
+                bench_load(f"{product_rows}p", f"bench-{product_rows}p", "통합_상품분석", values, runs)
+        finally:
+            database.close_connections()
+            database.DB_PATH = original_db_path
+            snapshot_cache.SNAPSHOT_DB_PATH = original_snapshot_path
+
+    return results
+
+
+def write_mock_source(root: str, months: int = 12, product_rows: int = 1_000):
+    """합성 시트 값을 로컬 디렉터리 소스 형식으로 기록 (모든 스프레드시트 ID에 재생되도록 default)"""
+    for i, channel in enumerate(DAILY_CHANNELS):
+        record_values(root, DEFAULT_RECORDING, channel, make_daily_sheet_values(months, channel, seed=i))
+    for i, sheet_name in enumerate(PRODUCT_SHEETS):
+        record_values(root, DEFAULT_RECORDING, sheet_name, make_product_sheet_values(product_rows, seed=i))
+
+
+def bench_render(source_dir: str, latency_ms: float, repeat: int) -> list:
+    """
+    대시보드 전체 렌더링 시간 측정 (Streamlit AppTest, 로컬 재생 데이터 소스)
+
+    임시 작업 디렉터리에서 실행하므로 dashboard_data.db/sheet_snapshots.db를 건드리지 않음
+    cold: 프로세스 첫 실행/탭 첫 진입 (데이터 소스 지연 포함), warm: 같은 탭 재실행 (캐시 적중)
+
+    Returns:
+        list: suite와 같은 형식 ({"bench", "scale"(탭), "rows", "best_ms", "median_ms", "repeat"})
+    """
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+
+    def record(bench, tab, times):
+        best, median = min(times), statistics.median(times)
+        results.append({
+            "bench": bench,
+            "scale": tab,
+            "rows": 0,
+            "best_ms": round(best * 1000, 3),
+            "median_ms": round(median * 1000, 3),
+            "repeat": len(times),
+        })
+        print(f"{bench:<16}{tab:<24}{best * 1000:>12.1f}{median * 1000:>12.1f}")
+
+    def run(at):
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"대시보드 실행 오류: {at.exception[0].value}")
+        return elapsed
+
+    original_cwd = os.getcwd()
+    original_env = {key: os.environ.get(key) for key in (DATA_SOURCE_ENV, LATENCY_ENV)}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ[DATA_SOURCE_ENV] = f"local:{os.path.abspath(source_dir)}"
+        os.environ[LATENCY_ENV] = str(latency_ms)
+        os.chdir(tmp)
+        try:
+            print(f"🖥️ 렌더링 측정: local:{source_dir} (조회 지연 {latency_ms:g}ms)")
+            print(f"{'측정 항목':<16}{'탭':<24}{'최소(ms)':>12}{'중앙값(ms)':>12}")
+            at = AppTest.from_file(APP_PATH, default_timeout=600)
+            record("render (cold)", "첫 실행", [run(at)])
+
+            tabs = at.radio(key="active_tab").options
+            for tab in tabs:
+                at.radio(key="active_tab").set_value(tab)
+                record("render (cold)", tab, [run(at)])
+                record("render (warm)", tab, [run(at) for _ in range(repeat)])
+        finally:
+            os.chdir(original_cwd)
+            for key, value in original_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    return results
+
+
+def write_report(results: list, path: str):
+    """실행 환경 정보와 함께 JSON 리포트 저장"""
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📝 결과 저장: {path}")
+
+
+def compare_reports(results: list, baseline_path: str):
+    """이전 리포트와 (항목, 규모)별 중앙값 비교 (배율 < 1이면 빨라짐)"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["bench"], r["scale"]): r for r in json.load(f)["results"]}
+
+    print(f"\n📊 비교 기준: {baseline_path}")
+    print(f"{'측정 항목':<28}{'규모':>10}{'이전(ms)':>12}{'현재(ms)':>12}{'배율':>8}")
+    for r in results:
+        old = baseline.get((r["bench"], r["scale"]))
+        if old is None or not old["median_ms"]:
+            continue
+        ratio = r["median_ms"] / old["median_ms"]
+        print(f"{r['bench']:<28}{r['scale']:>10}{old['median_ms']:>12.2f}{r['median_ms']:>12.2f}{ratio:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 성능 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_parse = sub.add_parser("parse", help="시트 파싱 (load_sheet 컬럼 정리)")
+    p_parse.add_argument("--rows", type=int, default=5000)
+    p_parse.add_argument("--channels", type=int, default=3)
+    p_parse.add_argument("--repeat", type=int, default=5)
+
+    p_ingest = sub.add_parser("ingest", help="월별 데이터 DB 저장 (save_monthly_data)")
+    p_ingest.add_argument("--months", type=int, default=12)
+    p_ingest.add_argument("--repeat", type=int, default=3)
+
+    p_suite = sub.add_parser("suite", help="주요 함수 규모별 측정 → JSON 리포트")
+    p_suite.add_argument("--quick", action="store_true", help="작은 규모만 측정 (1·12개월, 100·1,000개 모델)")
+    p_suite.add_argument("--repeat", type=int, default=5)
+    p_suite.add_argument("--output", default="benchmark_results.json")
+    p_suite.add_argument("--compare", help="비교할 이전 리포트 경로")
+
+    p_render = sub.add_parser("render", help="대시보드 탭별 렌더링 시간 (로컬 재생 데이터 소스) → JSON 리포트")
+    p_render.add_argument("--source", help="data_sources 기록 디렉터리 (없으면 합성 데이터 생성)")
+    p_render.add_argument("--months", type=int, default=12, help="합성 일별 시트 기간 (개월)")
+    p_render.add_argument("--product-rows", type=int, default=1_000, help="합성 상품 시트 모델 수")
+    p_render.add_argument("--latency-ms", type=float, default=300, help="시트 조회당 지연 (Google API 흉내)")
+    p_render.add_argument("--repeat", type=int, default=3)
+    p_render.add_argument("--output", default="benchmark_results_render.json")
+    p_render.add_argument("--compare", help="비교할 이전 리포트 경로")
+
+    args = parser.parse_args()
+    if args.command == "render":
+        if args.source:
+            results = bench_render(args.source, args.latency_ms, args.repeat)
+        else:
+            with tempfile.TemporaryDirectory() as source_dir:
+                write_mock_source(source_dir, args.months, args.product_rows)
+                results = bench_render(source_dir, args.latency_ms, args.repeat)
+        write_report(results, args.output)
+        if args.compare:
+            compare_reports(results, args.compare)
+    elif args.command == "suite":
+        months_list = QUICK_MONTHS if args.quick else SUITE_MONTHS
+        product_rows_list = QUICK_PRODUCT_ROWS if args.quick else SUITE_PRODUCT_ROWS
+        results = bench_suite(months_list, product_rows_list, args.repeat)
+        write_report(results, args.output)
+        if args.compare:
+            compare_reports(results, args.compare)
+    elif args.command == "parse":
+        bench_parse(args.rows, args.channels, args.repeat)
+    elif args.command == "ingest":
+        bench_ingest(args.months, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+컬럼 역할 판별기
+시트 헤더(컬럼명 목록)를 의미 역할(매출, 순이익, 순이익률, ROAS, 광고비, 제조원가, 모델, 카테고리, 판매량)에 매핑
+같은 헤더 구성은 프로세스당 한 번만 계산하고 이후에는 캐시된 결과를 재사용
+"""
+
+from functools import lru_cache
+
+ROLES = ("revenue", "profit", "profit_rate", "roas", "ad_cost", "manufacturing_cost", "model", "category", "quantity")
+
+
+def rule(has=(), any_of=(), without=(), exact=None) -> dict:
+    """
+    컬럼 매칭 규칙
+
+    Args:
+        has: 모두 포함해야 하는 키워드
+        any_of: 키워드 그룹 목록 (각 그룹에서 하나 이상 포함)
+        without: 포함되면 안 되는 키워드
+        exact: 정확히 일치해야 하는 컬럼명
+    """
+    return {"has": has, "any_of": any_of, "without": without, "exact": exact}
+
+
+# 역할별 규칙 목록: 앞의 규칙부터 시도하고, 규칙마다 컬럼 순서대로 첫 번째 일치 컬럼 선택
+ROLE_RULES = {
+    # 일별 매출 시트 (calc_kpis, Overview 기간 필터)
+    "kpi": {
+        "revenue": [
+            rule(has=("정산매출", "합계"), without=("ROAS",)),
+            rule(has=("정산매출",), without=("ROAS",)),
+        ],
+        "profit": [
+            rule(has=("순이익", "합계"), without=("률", "율")),
+            rule(has=("순이익",), without=("률", "율")),
+        ],
+        "profit_rate": [
+            rule(has=("순이익률",), without=("손익", "광고비")),
+        ],
+        "roas": [
+            rule(any_of=(("ROAS", "로아스"),), without=("광고센터",)),
+        ],
+        "ad_cost": [
+            rule(has=("광고비",), any_of=(("총", "합계"),)),
+        ],
+    },
+    # DB 저장용 월별 요약 (dataframe_to_db.calculate_summary)
+    "summary": {
+        "revenue": [
+            rule(exact="정산매출"),
+            rule(any_of=(("정산매출", "총매출", "매출"),), without=("전환", "광고", "센터")),
+        ],
+        "profit": [
+            rule(any_of=(("순이익", "순손익"),), without=("률", "율")),
+        ],
+        "profit_rate": [
+            rule(any_of=(("순이익률", "순손익률"),)),
+        ],
+        "roas": [
+            rule(any_of=(("ROAS", "로아스"),)),
+        ],
+        "ad_cost": [
+            rule(any_of=(("광고비", "마케팅비", "광고 비용"),)),
+        ],
+        "manufacturing_cost": [
+            rule(has=("제조원가",), without=("순이익",)),
+        ],
+    },
+    # 상품 분석 시트 (상품 탭 col_map)
+    "product": {
+        "model": [
+            rule(any_of=(("Model", "모델"),)),
+        ],
+        "category": [
+            rule(has=("카테고리",)),
+        ],
+        "quantity": [
+            rule(any_of=(("총", "합계"), ("판매", "수량"))),
+            rule(any_of=(("판매", "수량"),)),
+        ],
+        "revenue": [
+            rule(any_of=(("총", "합계"), ("매출", "정산"))),
+            rule(any_of=(("매출", "정산"),)),
+        ],
+        # 판관비 차감 전 이익 (총 판관비 우선) → 없으면 순이익
+        "profit": [
+            rule(has=("총", "판관비", "차감", "이익"), without=("개당",)),
+            rule(has=("판관비", "차감", "이익"), without=("개당", "이베이", "11번가", "B2B")),
+            rule(has=("판관비", "차감", "이익"), without=("개당",)),
+            rule(has=("순이익",), any_of=(("총", "합계"),), without=("률", "개당")),
+            rule(has=("순이익",), without=("률", "개당")),
+        ],
+    },
+}
+
+
+def _matches(name: str, spec: dict) -> bool:
+    if spec["exact"] is not None:
+        return name == spec["exact"]
+    if not all(k in name for k in spec["has"]):
+        return False
+    if not all(any(k in name for k in group) for group in spec["any_of"]):
+        return False
+    return not any(k in name for k in spec["without"])
+
+
+def find_first(names, spec: dict):
+    """규칙에 맞는 첫 번째 컬럼의 위치 (없으면 None)"""
+    for i, name in enumerate(names):
+        if _matches(name, spec):
+            return i
+    return None
+
+
+@lru_cache(maxsize=256)
+def _resolve_positions(header: tuple, profile: str) -> tuple:
+    """헤더 튜플 → (역할, 컬럼 위치) 목록. 헤더 구성별로 한 번만 계산"""
+    positions = []
+    for role, rules in ROLE_RULES[profile].items():
+        for spec in rules:
+            idx = find_first(header, spec)
+            if idx is not None:
+                positions.append((role, idx))
+                break
+    return tuple(positions)
+
+
+def resolve_roles(columns, profile: str = "kpi") -> dict:
+    """
+    컬럼 목록을 역할별 컬럼명으로 매핑
+
+    Args:
+        columns: DataFrame.columns 또는 컬럼명 목록
+        profile: 시트 유형 ("kpi", "summary", "product")
+
+    Returns:
+        dict: {역할: 컬럼명 또는 None} (ROLES의 모든 역할 포함)
+    """
+    columns = list(columns)
+    roles = dict.fromkeys(ROLES)
+    for role, idx in _resolve_positions(tuple(str(c) for c in columns), profile):
+        roles[role] = columns[idx]
+    return roles
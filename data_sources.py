@@ -0,0 +1,237 @@
+"""
+데이터 소스 백엔드
+시트 원본 값(get_all_values 형식)을 어디서 가져올지 설정으로 선택
+
+- sheets: Google Sheets (서비스 계정, 기본값)
+- sheets:typed: Google Sheets 형식 없는 값 (숫자/날짜 일련번호, 파서의 문자열 정리 생략)
+- local:<디렉터리>: 기록해 둔 값을 재생 (JSON/CSV/xlsx, 네트워크 없음)
+- snapshot: sheet_snapshots.db에 저장된 마지막 스냅샷만 사용
+
+설정: 환경 변수 DASHBOARD_DATA_SOURCE (예: "local:mock_data", "sheets:typed"),
+      DASHBOARD_SOURCE_LATENCY_MS (로컬/스냅샷 소스의 조회당 지연 시간, 네트워크 흉내)
+
+로컬 디렉터리 구성:
+    <디렉터리>/<스프레드시트 ID>/<시트 이름>.json   (get_all_values 결과 그대로)
+    <디렉터리>/<스프레드시트 ID>/<시트 이름>.csv
+    <디렉터리>/<스프레드시트 ID>.xlsx               (시트 이름 = 워크시트 이름)
+    <디렉터리>/default/...                          (기록이 없는 스프레드시트 ID에 사용)
+
+기록:
+    python data_sources.py record mock_data [--from sheets|snapshot] [--spreadsheet ID] [--as-default] [시트 ...]
+"""
+
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from gspread.exceptions import WorksheetNotFound
+
+from local_archive import read_workbook_values
+from sheets_client import SHEET_ID, create_gspread_client, fetch_values, fetch_typed_values, list_sheet_titles
+from snapshot_cache import load_snapshot, list_snapshot_sheets
+
+DATA_SOURCE_ENV = "DASHBOARD_DATA_SOURCE"
+LATENCY_ENV = "DASHBOARD_SOURCE_LATENCY_MS"
+
+# 기록이 없는 스프레드시트 ID를 대신할 디렉터리 이름
+DEFAULT_RECORDING = "default"
+
+
+def _safe_name(name: str) -> str:
+    """파일 이름에 쓸 수 없는 문자 치환"""
+    return "".join("_" if c in '\\/:*?"<>|' else c for c in name)
+
+
+class DataSource(ABC):
+    """시트 원본 값 조회 인터페이스 (fetch_values/list_sheets를 구현하지 않은 소스는 생성 시 TypeError)"""
+
+    name = ""
+    # Google API를 쓰는 소스만 스냅샷 캐시/증분 동기화/Drive 카탈로그 대상
+    live = False
+    # 형식 없는 값(숫자/날짜 일련번호)으로 조회하는지 여부 (증분 동기화도 같은 형식으로 받음)
+    typed = False
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def _simulate_latency(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    @abstractmethod
+    def fetch_values(self, spreadsheet_id: str, sheet_name: str) -> list:
+        """시트 원본 값 (없는 시트는 WorksheetNotFound)"""
+
+    @abstractmethod
+    def list_sheets(self, spreadsheet_id: str) -> list:
+        """스프레드시트의 시트 이름 목록"""
+
+    def describe(self) -> str:
+        return self.name
+
+
+class SheetsSource(DataSource):
+    """Google Sheets (gspread)"""
+
+    name = "sheets"
+    live = True
+
+    def __init__(self, client_factory=None, typed: bool = False):
+        super().__init__()
+        self.typed = typed
+        self._client_factory = client_factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def client(self):
+        # 클라이언트 생성 함수가 없으면(CLI) 처음 한 번만 인증
+        if self._client_factory is not None:
+            gc = self._client_factory()
+        else:
+            with self._lock:
+                if self._client is None:
+                    self._client = create_gspread_client()
+                gc = self._client
+        if gc is None:
+            raise RuntimeError("Google Sheets 클라이언트를 만들 수 없습니다.")
+        return gc
+
+    def fetch_values(self, spreadsheet_id: str, sheet_name: str) -> list:
+        if self.typed:
+            return fetch_typed_values(self.client(), spreadsheet_id, sheet_name)
+        return fetch_values(self.client(), spreadsheet_id, sheet_name)
+
+    def list_sheets(self, spreadsheet_id: str) -> list:
+        return list_sheet_titles(self.client(), spreadsheet_id)
+
+    def describe(self) -> str:
+        return "sheets:typed" if self.typed else "sheets"
+
+
+class LocalDirectorySource(DataSource):
+    """기록해 둔 시트 값을 로컬 디렉터리에서 재생"""
+
+    name = "local"
+
+    def __init__(self, root: str, latency: float = 0.0):
+        super().__init__(latency)
+        self.root = root
+
+    def _bases(self, spreadsheet_id: str) -> list:
+        return [os.path.join(self.root, _safe_name(spreadsheet_id)), os.path.join(self.root, DEFAULT_RECORDING)]
+
+    def fetch_values(self, spreadsheet_id: str, sheet_name: str) -> list:
+        self._simulate_latency()
+        for base in self._bases(spreadsheet_id):
+            path = os.path.join(base, _safe_name(sheet_name))
+            if os.path.isfile(path + ".json"):
+                with open(path + ".json", encoding="utf-8") as f:
+                    return json.load(f)
+            if os.path.isfile(path + ".csv"):
+                with open(path + ".csv", encoding="utf-8-sig", newline="") as f:
+                    return [row for row in csv.reader(f)]
+            if os.path.isfile(base + ".xlsx"):
+                values = read_workbook_values(base + ".xlsx", [sheet_name])
+                if sheet_name in values:
+                    return values[sheet_name]
+        raise WorksheetNotFound(sheet_name)
+
+    def list_sheets(self, spreadsheet_id: str) -> list:
+        for base in self._bases(spreadsheet_id):
+            if os.path.isdir(base):
+                return sorted(
+                    os.path.splitext(f)[0] for f in os.listdir(base)
+                    if f.endswith((".json", ".csv"))
+                )
+            if os.path.isfile(base + ".xlsx"):
+                from openpyxl import load_workbook
+                wb = load_workbook(base + ".xlsx", read_only=True)
+                try:
+                    return list(wb.sheetnames)
+                finally:
+                    wb.close()
+        return []
+
+    def describe(self) -> str:
+        return f"local:{self.root}"
+
+
+class SnapshotSource(DataSource):
+    """sheet_snapshots.db의 마지막 스냅샷만 사용 (갱신하지 않음)"""
+
+    name = "snapshot"
+
+    def fetch_values(self, spreadsheet_id: str, sheet_name: str) -> list:
+        self._simulate_latency()
+        snapshot = load_snapshot(spreadsheet_id, sheet_name)
+        if snapshot is None:
+            raise WorksheetNotFound(sheet_name)
+        return snapshot[0]
+
+    def list_sheets(self, spreadsheet_id: str) -> list:
+        return list_snapshot_sheets(spreadsheet_id)
+
+
+def create_data_source(config: str = None, client_factory=None, latency_ms: float = None) -> DataSource:
+    """
+    설정 문자열로 데이터 소스 생성
+
+    Args:
+        config: "sheets", "sheets:typed", "local:<디렉터리>", "snapshot" (None이면 환경 변수 DASHBOARD_DATA_SOURCE, 기본 sheets)
+        client_factory: sheets 소스가 사용할 gspread 클라이언트 생성 함수 (앱에서는 공유 클라이언트)
+        latency_ms: 로컬/스냅샷 소스의 조회당 지연 시간 (None이면 환경 변수 DASHBOARD_SOURCE_LATENCY_MS)
+    """
+    config = (config or os.environ.get(DATA_SOURCE_ENV) or "sheets").strip()
+    if latency_ms is None:
+        latency_ms = float(os.environ.get(LATENCY_ENV) or 0)
+    latency = latency_ms / 1000
+
+    if config in ("sheets", "sheets:typed"):
+        return SheetsSource(client_factory, typed=config == "sheets:typed")
+    if config.startswith("local:"):
+        return LocalDirectorySource(config[len("local:"):], latency)
+    if config == "snapshot":
+        return SnapshotSource(latency)
+    raise ValueError(f"알 수 없는 데이터 소스: {config} (sheets, sheets:typed, local:<디렉터리>, snapshot 중 하나)")
+
+
+def record_values(root: str, spreadsheet_id: str, sheet_name: str, values: list) -> str:
+    """시트 값을 로컬 디렉터리 소스 형식(JSON)으로 저장하고 파일 경로 반환"""
+    base = os.path.join(root, _safe_name(spreadsheet_id))
+    os.makedirs(base, exist_ok=True)
+    path = os.path.join(base, _safe_name(sheet_name) + ".json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(values, f, ensure_ascii=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터 소스 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_record = sub.add_parser("record", help="시트 값을 로컬 디렉터리 소스로 기록")
+    p_record.add_argument("out", help="저장할 디렉터리")
+    p_record.add_argument("sheets", nargs="*", help="시트 이름 (없으면 스프레드시트의 모든 시트)")
+    p_record.add_argument("--from", dest="source", default="snapshot", help="기록할 원본 (sheets, sheets:typed, snapshot)")
+    p_record.add_argument("--spreadsheet", default=SHEET_ID, help="스프레드시트 ID")
+    p_record.add_argument("--as-default", action="store_true", help="모든 스프레드시트 ID에 재생되도록 default로 저장")
+    args = parser.parse_args()
+
+    source = create_data_source(args.source, latency_ms=0)
+    target_id = DEFAULT_RECORDING if args.as_default else args.spreadsheet
+    for sheet_name in args.sheets or source.list_sheets(args.spreadsheet):
+        try:
+            values = source.fetch_values(args.spreadsheet, sheet_name)
+        except WorksheetNotFound:
+            print(f"❌ {sheet_name}: 시트 없음")
+            continue
+        path = record_values(args.out, target_id, sheet_name, values)
+        print(f"✅ {sheet_name}: {len(values):,}행 → {path}")
+
+
+if __name__ == "__main__":
+    main()
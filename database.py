@@ -1,107 +1,287 @@
 import sqlite3
+import threading
+import time
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from profiler import timed
 
 DB_PATH = "dashboard_data.db"
 
+# 연결 풀 설정
+DB_TIMEOUT = 30  # 잠금 대기 시간(초)
+POOL_MAX_IDLE = 8  # DB 파일당 보관할 유휴 연결 수
+STATEMENT_CACHE_SIZE = 256  # 연결당 준비된 문장(prepared statement) 캐시 크기
+
+# 연결을 열 때 한 번 적용하는 설정
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # 읽기와 쓰기가 서로를 막지 않음
+    "PRAGMA synchronous=NORMAL",  # WAL에서는 체크포인트 때만 fsync (손상 위험 없음)
+    "PRAGMA cache_size=-16000",  # 연결당 페이지 캐시 약 16MB
+    "PRAGMA temp_store=MEMORY",
+)
+
+_pool_lock = threading.Lock()
+_idle_connections = {}  # DB 경로 → 유휴 연결 목록
+
+def _open_connection(path: str):
+    conn = sqlite3.connect(path, timeout=DB_TIMEOUT, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+    try:
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    except Exception:
+        # 설정에 실패한 연결은 풀에 넣지 않고 닫음
+        conn.close()
+        raise
+    return conn
+
+def acquire_connection(path: str = None):
+    """
+    프로세스 공용 연결 풀에서 연결을 빌림 (사용 후 release_connection으로 반납)
+    
+    반납 전까지는 빌린 스레드만 연결을 사용함.
+    연결을 매번 새로 열지 않으므로 설정(PRAGMA)과 준비된 문장 캐시가 유지됨.
+    
+    Args:
+        path: DB 파일 경로 (None이면 DB_PATH)
+    """
+    path = path or DB_PATH
+    with _pool_lock:
+        idle = _idle_connections.get(path)
+        conn = idle.pop() if idle else None
+    if conn is None:
+        conn = _open_connection(path)
+    return conn
+
+def release_connection(conn, path: str = None):
+    """빌린 연결을 풀에 반납 (커밋되지 않은 작업은 롤백)"""
+    path = path or DB_PATH
+    if conn.in_transaction:
+        conn.rollback()
+    with _pool_lock:
+        idle = _idle_connections.setdefault(path, [])
+        if len(idle) < POOL_MAX_IDLE:
+            idle.append(conn)
+            return
+    conn.close()
+
+@contextmanager
+def get_connection(path: str = None):
+    """with 블록 동안 풀에서 연결을 빌려 사용"""
+    conn = acquire_connection(path)
+    try:
+        yield conn
+    finally:
+        release_connection(conn, path)
+
+def close_connections():
+    """풀에 있는 유휴 연결을 모두 닫음 (DB 파일 교체 전 등)"""
+    with _pool_lock:
+        conns = [conn for idle in _idle_connections.values() for conn in idle]
+        _idle_connections.clear()
+    for conn in conns:
+        conn.close()
+
+def _add_missing_columns(cursor, table: str, columns):
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    for name, col_type in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
+
 def init_database():
     """데이터베이스 초기화 및 테이블 생성"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    conn = acquire_connection()
     
-    # 월별 요약 테이블
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS monthly_summary (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            year_month TEXT NOT NULL,
-            channel TEXT NOT NULL,
-            total_ad_cost REAL,
-            total_revenue REAL,
-            total_manufacturing_cost REAL,
-            total_profit REAL,
-            avg_profit_rate REAL,
-            roas REAL,
-            ad_coverage REAL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(year_month, channel)
-        )
-    """)
-    
-    # 일별 상세 테이블
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS daily_details (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            year_month TEXT NOT NULL,
-            date TEXT NOT NULL,
-            channel TEXT NOT NULL,
-            ad_cost REAL,
-            revenue REAL,
-            manufacturing_cost REAL,
-            profit REAL,
-            profit_rate REAL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(year_month, date, channel)
-        )
-    """)
-    
-    # 아카이빙 메타데이터 테이블
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS archive_metadata (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            year_month TEXT NOT NULL UNIQUE,
-            upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            file_name TEXT,
-            channels TEXT
-        )
-    """)
+    try:
+        cursor = conn.cursor()
     
-    conn.commit()
-    conn.close()
+        # 월별 요약 테이블
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS monthly_summary (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                year_month TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                total_ad_cost REAL,
+                total_revenue REAL,
+                total_manufacturing_cost REAL,
+                total_profit REAL,
+                avg_profit_rate REAL,
+                roas REAL,
+                ad_coverage REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(year_month, channel)
+            )
+        """)
+    
+        # 일별 상세 테이블
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_details (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                year_month TEXT NOT NULL,
+                date TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                ad_cost REAL,
+                revenue REAL,
+                manufacturing_cost REAL,
+                profit REAL,
+                profit_rate REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(year_month, date, channel)
+            )
+        """)
+    
+        # 아카이빙 메타데이터 테이블
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS archive_metadata (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                year_month TEXT NOT NULL UNIQUE,
+                upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                file_name TEXT,
+                channels TEXT,
+                file_id TEXT,
+                modified_time TEXT
+            )
+        """)
+        # 이전 버전 DB에는 없는 컬럼 추가 (Drive 파일 ID / 수정 시각)
+        _add_missing_columns(cursor, "archive_metadata", (("file_id", "TEXT"), ("modified_time", "TEXT")))
+    
+        # 채널별 일별 집계 테이블 (누적합 포함 → 기간 합계를 구간 조회로 계산)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS channel_daily_agg (
+                source_id TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                date TEXT NOT NULL,
+                revenue REAL,
+                profit REAL,
+                ad_cost REAL,
+                row_count INTEGER,
+                cum_revenue REAL,
+                cum_profit REAL,
+                cum_ad_cost REAL,
+                cum_row_count INTEGER,
+                PRIMARY KEY (source_id, channel, date)
+            )
+        """)
+    
+        # 일별 집계 원본 상태 (내용이 바뀐 경우에만 다시 계산)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS channel_daily_agg_state (
+                source_id TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                fingerprint TEXT,
+                has_ad_cost INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (source_id, channel)
+            )
+        """)
+    
+        # Drive 아카이브 폴더 파일 목록 (archive_catalog.py가 changes API로 갱신)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS archive_catalog (
+                folder_id TEXT NOT NULL,
+                file_id TEXT NOT NULL,
+                name TEXT,
+                modified_time TEXT,
+                PRIMARY KEY (folder_id, file_id)
+            )
+        """)
+    
+        # 폴더별 changes API 페이지 토큰과 마지막 확인 시각
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS archive_catalog_state (
+                folder_id TEXT PRIMARY KEY,
+                page_token TEXT,
+                checked_at REAL
+            )
+        """)
+    
+        conn.commit()
+    finally:
+        # DDL/PRAGMA 오류가 나도 연결은 풀에 반납 (커밋되지 않은 작업은 롤백)
+        release_connection(conn)
     print("✅ 데이터베이스 초기화 완료!")
 
-def save_monthly_data(year_month: str, channel: str, summary_data: dict, daily_df: pd.DataFrame):
-    """월별 데이터 저장"""
-    conn = sqlite3.connect(DB_PATH)
+# daily_details에 저장하는 DataFrame 컬럼과 기본값
+DAILY_DETAIL_COLUMNS = (
+    ("ad_cost", 0),
+    ("revenue", 0),
+    ("manufacturing_cost", 0),
+    ("profit", 0),
+    ("profit_rate", 0),
+)
+
+def _summary_row(year_month: str, channel: str, summary_data: dict):
+    return (
+        year_month,
+        channel,
+        summary_data.get('total_ad_cost', 0),
+        summary_data.get('total_revenue', 0),
+        summary_data.get('total_manufacturing_cost', 0),
+        summary_data.get('total_profit', 0),
+        summary_data.get('avg_profit_rate', 0),
+        summary_data.get('roas', 0),
+        summary_data.get('ad_coverage', 0)
+    )
+
+def _daily_detail_rows(year_month: str, channel: str, daily_df: pd.DataFrame):
+    """daily_df 컬럼을 통째로 꺼내 INSERT 파라미터 행으로 묶음 (행마다 Series를 만들지 않음)"""
+    n = len(daily_df)
+    if n == 0:
+        return []
+    
+    if 'date' in daily_df.columns:
+        dates = daily_df['date']
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            dates = dates.dt.strftime("%Y-%m-%d")
+        dates = dates.tolist()
+    else:
+        dates = [''] * n
+    
+    # tolist()는 numpy 값을 파이썬 int/float로 바꿔줌 (sqlite3 바인딩 가능)
+    values = [
+        daily_df[col].tolist() if col in daily_df.columns else [default] * n
+        for col, default in DAILY_DETAIL_COLUMNS
+    ]
+    return zip([year_month] * n, dates, [channel] * n, *values)
+
+def _insert_monthly_batches(cursor, batches):
+    """(월, 채널) 요약/일별 상세 INSERT (커밋은 호출한 쪽에서)"""
+    # 월별 요약 저장
+    cursor.executemany("""
+        INSERT OR REPLACE INTO monthly_summary 
+        (year_month, channel, total_ad_cost, total_revenue, 
+         total_manufacturing_cost, total_profit, avg_profit_rate, roas, ad_coverage)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [_summary_row(year_month, channel, summary_data) for year_month, channel, summary_data, _ in batches])
+    
+    # 일별 상세 저장
+    for year_month, channel, _, daily_df in batches:
+        cursor.executemany("""
+            INSERT OR REPLACE INTO daily_details
+            (year_month, date, channel, ad_cost, revenue, 
+             manufacturing_cost, profit, profit_rate)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, _daily_detail_rows(year_month, channel, daily_df))
+
+@timed("db.save_monthly_batches")
+def save_monthly_batches(batches):
+    """
+    여러 (월, 채널) 데이터를 한 트랜잭션으로 저장
+    
+    Args:
+        batches: (year_month, channel, summary_data, daily_df) 튜플 목록
+            daily_df: date, ad_cost, revenue, manufacturing_cost, profit, profit_rate 컬럼
+    
+    Returns:
+        bool: 성공 여부 (실패 시 전체 롤백)
+    """
+    batches = list(batches)
+    conn = acquire_connection()
     cursor = conn.cursor()
     
     try:
-        # 월별 요약 저장
-        cursor.execute("""
-            INSERT OR REPLACE INTO monthly_summary 
-            (year_month, channel, total_ad_cost, total_revenue, 
-             total_manufacturing_cost, total_profit, avg_profit_rate, roas, ad_coverage)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            year_month,
-            channel,
-            summary_data.get('total_ad_cost', 0),
-            summary_data.get('total_revenue', 0),
-            summary_data.get('total_manufacturing_cost', 0),
-            summary_data.get('total_profit', 0),
-            summary_data.get('avg_profit_rate', 0),
-            summary_data.get('roas', 0),
-            summary_data.get('ad_coverage', 0)
-        ))
-        
-        # 일별 상세 저장
-        for _, row in daily_df.iterrows():
-            cursor.execute("""
-                INSERT OR REPLACE INTO daily_details
-                (year_month, date, channel, ad_cost, revenue, 
-                 manufacturing_cost, profit, profit_rate)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                year_month,
-                row.get('date', ''),
-                channel,
-                row.get('ad_cost', 0),
-                row.get('revenue', 0),
-                row.get('manufacturing_cost', 0),
-                row.get('profit', 0),
-                row.get('profit_rate', 0)
-            ))
-        
+        _insert_monthly_batches(cursor, batches)
         conn.commit()
         return True
     except Exception as e:
@@ -109,63 +289,107 @@ def save_monthly_data(year_month: str, channel: str, summary_data: dict, daily_d
         print(f"❌ 데이터 저장 실패: {e}")
         return False
     finally:
-        conn.close()
+        release_connection(conn)
 
-def get_available_months():
-    """저장된 월 목록 조회"""
-    conn = sqlite3.connect(DB_PATH)
+@timed("db.replace_month_data")
+def replace_month_data(year_month: str, batches):
+    """
+    특정 월 데이터를 지우고 새 (월, 채널) 데이터로 교체 (삭제와 저장을 한 트랜잭션으로)
+    
+    Args:
+        year_month: 교체할 연월
+        batches: save_monthly_batches와 같은 형식의 튜플 목록
+    
+    Returns:
+        bool: 성공 여부 (실패 시 전체 롤백 → 기존 월 데이터 유지)
+    """
+    batches = list(batches)
+    conn = acquire_connection()
     cursor = conn.cursor()
     
-    cursor.execute("""
-        SELECT DISTINCT year_month 
-        FROM monthly_summary 
-        ORDER BY year_month DESC
-    """)
+    try:
+        cursor.execute("DELETE FROM monthly_summary WHERE year_month = ?", (year_month,))
+        cursor.execute("DELETE FROM daily_details WHERE year_month = ?", (year_month,))
+        cursor.execute("DELETE FROM archive_metadata WHERE year_month = ?", (year_month,))
+        _insert_monthly_batches(cursor, batches)
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ 월 데이터 교체 실패: {e}")
+        return False
+    finally:
+        release_connection(conn)
+
+def save_monthly_data(year_month: str, channel: str, summary_data: dict, daily_df: pd.DataFrame):
+    """월별 데이터 저장"""
+    return save_monthly_batches([(year_month, channel, summary_data, daily_df)])
+
+@timed("db.get_available_months")
+def get_available_months():
+    """저장된 월 목록 조회"""
+    conn = acquire_connection()
     
-    months = [row[0] for row in cursor.fetchall()]
-    conn.close()
+    try:
+        cursor = conn.execute("""
+            SELECT DISTINCT year_month 
+            FROM monthly_summary 
+            ORDER BY year_month DESC
+        """)
+        months = [row[0] for row in cursor.fetchall()]
+    finally:
+        release_connection(conn)
     
     return months
 
+@timed("db.get_monthly_summary")
 def get_monthly_summary(year_month: str = None):
     """월별 요약 데이터 조회"""
-    conn = sqlite3.connect(DB_PATH)
-    
     if year_month:
-        query = f"SELECT * FROM monthly_summary WHERE year_month = '{year_month}'"
+        query = "SELECT * FROM monthly_summary WHERE year_month = ?"
+        params = (year_month,)
     else:
         query = "SELECT * FROM monthly_summary ORDER BY year_month DESC"
+        params = ()
     
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    conn = acquire_connection()
+    try:
+        df = pd.read_sql_query(query, conn, params=params)
+    finally:
+        release_connection(conn)
     
     return df
 
+@timed("db.get_daily_details")
 def get_daily_details(year_month: str, channel: str = None):
     """일별 상세 데이터 조회"""
-    conn = sqlite3.connect(DB_PATH)
-    
     if channel:
-        query = f"""
+        query = """
             SELECT * FROM daily_details 
-            WHERE year_month = '{year_month}' AND channel = '{channel}'
+            WHERE year_month = ? AND channel = ?
             ORDER BY date
         """
+        params = (year_month, channel)
     else:
-        query = f"""
+        query = """
             SELECT * FROM daily_details 
-            WHERE year_month = '{year_month}'
+            WHERE year_month = ?
             ORDER BY date, channel
         """
+        params = (year_month,)
     
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    conn = acquire_connection()
+    try:
+        df = pd.read_sql_query(query, conn, params=params)
+    finally:
+        release_connection(conn)
     
     return df
 
+@timed("db.delete_month_data")
 def delete_month_data(year_month: str):
     """특정 월 데이터 삭제"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = acquire_connection()
     cursor = conn.cursor()
     
     try:
@@ -180,19 +404,20 @@ def delete_month_data(year_month: str):
         print(f"❌ 데이터 삭제 실패: {e}")
         return False
     finally:
-        conn.close()
+        release_connection(conn)
 
-def save_archive_metadata(year_month: str, file_name: str, channels: list):
+@timed("db.save_archive_metadata")
+def save_archive_metadata(year_month: str, file_name: str, channels: list, file_id: str = None, modified_time: str = None):
     """아카이빙 메타데이터 저장"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = acquire_connection()
     cursor = conn.cursor()
     
     try:
         cursor.execute("""
             INSERT OR REPLACE INTO archive_metadata 
-            (year_month, file_name, channels)
-            VALUES (?, ?, ?)
-        """, (year_month, file_name, ','.join(channels)))
+            (year_month, file_name, channels, file_id, modified_time)
+            VALUES (?, ?, ?, ?, ?)
+        """, (year_month, file_name, ','.join(channels), file_id, modified_time))
         
         conn.commit()
         return True
@@ -201,7 +426,308 @@ def save_archive_metadata(year_month: str, file_name: str, channels: list):
         print(f"❌ 메타데이터 저장 실패: {e}")
         return False
     finally:
-        conn.close()
+        release_connection(conn)
+
+@timed("db.get_archive_metadata")
+def get_archive_metadata():
+    """아카이빙 메타데이터 조회 (월 → {file_name, channels, file_id, modified_time, upload_date})"""
+    conn = acquire_connection()
+    
+    try:
+        rows = conn.execute("""
+            SELECT year_month, file_name, channels, file_id, modified_time, upload_date
+            FROM archive_metadata
+        """).fetchall()
+    finally:
+        release_connection(conn)
+    
+    return {
+        row[0]: {
+            "file_name": row[1],
+            "channels": row[2].split(',') if row[2] else [],
+            "file_id": row[3],
+            "modified_time": row[4],
+            "upload_date": row[5],
+        }
+        for row in rows
+    }
+
+@timed("db.get_archive_catalog")
+def get_archive_catalog(folder_id: str):
+    """아카이브 카탈로그 조회 (list_archive_files와 같은 {id, name, modifiedTime} 목록, 이름 역순)"""
+    conn = acquire_connection()
+    
+    try:
+        rows = conn.execute("""
+            SELECT file_id, name, modified_time
+            FROM archive_catalog
+            WHERE folder_id = ?
+            ORDER BY name DESC
+        """, (folder_id,)).fetchall()
+    finally:
+        release_connection(conn)
+    
+    return [{"id": row[0], "name": row[1], "modifiedTime": row[2]} for row in rows]
+
+@timed("db.get_archive_catalog_state")
+def get_archive_catalog_state(folder_id: str):
+    """카탈로그 동기화 상태 조회 ({page_token, checked_at}, 없으면 None)"""
+    conn = acquire_connection()
+    
+    try:
+        row = conn.execute("""
+            SELECT page_token, checked_at FROM archive_catalog_state
+            WHERE folder_id = ?
+        """, (folder_id,)).fetchone()
+    finally:
+        release_connection(conn)
+    
+    return {"page_token": row[0], "checked_at": row[1] or 0} if row else None
+
+@timed("db.save_archive_catalog")
+def save_archive_catalog(folder_id: str, page_token: str, upserts: list = (), removed_ids: list = (), replace: bool = False):
+    """
+    아카이브 카탈로그 반영 (한 트랜잭션)
+    
+    Args:
+        folder_id: Drive 폴더 ID
+        page_token: 다음 동기화에 사용할 changes API 페이지 토큰
+        upserts: 추가/수정된 파일 ({id, name, modifiedTime}) 목록
+        removed_ids: 폴더에서 빠진 파일 ID 목록 (삭제, 휴지통, 다른 폴더로 이동)
+        replace: True면 기존 목록을 지우고 upserts로 교체 (전체 목록 조회 결과)
+    
+    Returns:
+        bool: 성공 여부
+    """
+    conn = acquire_connection()
+    cursor = conn.cursor()
+    
+    try:
+        if replace:
+            cursor.execute("DELETE FROM archive_catalog WHERE folder_id = ?", (folder_id,))
+        cursor.executemany("""
+            DELETE FROM archive_catalog WHERE folder_id = ? AND file_id = ?
+        """, [(folder_id, file_id) for file_id in removed_ids])
+        cursor.executemany("""
+            INSERT OR REPLACE INTO archive_catalog (folder_id, file_id, name, modified_time)
+            VALUES (?, ?, ?, ?)
+        """, [(folder_id, f["id"], f.get("name"), f.get("modifiedTime")) for f in upserts])
+        cursor.execute("""
+            INSERT OR REPLACE INTO archive_catalog_state (folder_id, page_token, checked_at)
+            VALUES (?, ?, ?)
+        """, (folder_id, page_token, time.time()))
+        
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ 아카이브 카탈로그 저장 실패: {e}")
+        return False
+    finally:
+        release_connection(conn)
+
+@timed("db.get_channel_daily_agg_fingerprint")
+def get_channel_daily_agg_fingerprint(source_id: str, channel: str):
+    """일별 집계의 원본 fingerprint 조회 (없으면 None)"""
+    conn = acquire_connection()
+    
+    try:
+        row = conn.execute("""
+            SELECT fingerprint FROM channel_daily_agg_state
+            WHERE source_id = ? AND channel = ?
+        """, (source_id, channel)).fetchone()
+    finally:
+        release_connection(conn)
+    
+    return row[0] if row else None
+
+@timed("db.save_channel_daily_agg")
+def save_channel_daily_agg(source_id: str, channel: str, daily_df: pd.DataFrame, fingerprint: str, has_ad_cost: bool):
+    """
+    채널 일별 집계 저장 (기존 집계는 교체)
+    
+    Args:
+        source_id: 데이터 소스 (스프레드시트 ID)
+        channel: 채널명
+        daily_df: date(datetime), revenue, profit, ad_cost 컬럼을 가진 DataFrame
+        fingerprint: 원본 데이터 fingerprint
+        has_ad_cost: 광고비 컬럼 존재 여부
+    """
+    # 날짜별 합계 + 누적합 (벡터 연산)
+    daily = daily_df.dropna(subset=["date"]).copy()
+    daily["date"] = daily["date"].dt.strftime("%Y-%m-%d")
+    agg = daily.groupby("date", sort=True).agg(
+        revenue=("revenue", "sum"),
+        profit=("profit", "sum"),
+        ad_cost=("ad_cost", "sum"),
+        row_count=("revenue", "size"),
+    )
+    cum = agg.cumsum()
+    
+    rows = list(zip(
+        [source_id] * len(agg), [channel] * len(agg), agg.index,
+        agg["revenue"].astype(float), agg["profit"].astype(float), agg["ad_cost"].astype(float), agg["row_count"].astype(int).tolist(),
+        cum["revenue"].astype(float), cum["profit"].astype(float), cum["ad_cost"].astype(float), cum["row_count"].astype(int).tolist(),
+    ))
+    
+    conn = acquire_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("DELETE FROM channel_daily_agg WHERE source_id = ? AND channel = ?", (source_id, channel))
+        cursor.executemany("""
+            INSERT INTO channel_daily_agg
+            (source_id, channel, date, revenue, profit, ad_cost, row_count,
+             cum_revenue, cum_profit, cum_ad_cost, cum_row_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        cursor.execute("""
+            INSERT OR REPLACE INTO channel_daily_agg_state
+            (source_id, channel, fingerprint, has_ad_cost)
+            VALUES (?, ?, ?, ?)
+        """, (source_id, channel, fingerprint, int(has_ad_cost)))
+        
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ 일별 집계 저장 실패: {e}")
+        return False
+    finally:
+        release_connection(conn)
+
+@timed("db.get_channel_range_totals")
+def get_channel_range_totals(source_id: str, channels: list, start_date: str = None, end_date: str = None):
+    """
+    기간 합계 조회 (누적합 차이로 계산 → 채널당 인덱스 조회 2번)
+    
+    Args:
+        source_id: 데이터 소스 (스프레드시트 ID)
+        channels: 채널 목록
+        start_date: 시작일 "YYYY-MM-DD" (포함, None이면 처음부터)
+        end_date: 종료일 "YYYY-MM-DD" (포함, None이면 끝까지)
+    
+    Returns:
+        dict: {채널: {revenue, profit, ad_cost, rows, has_ad_cost}} (집계가 없는 채널은 제외)
+    """
+    conn = acquire_connection()
+    cursor = conn.cursor()
+    
+    # 종료일까지의 누적합 / 시작일 직전까지의 누적합
+    upto_query = """
+        SELECT cum_revenue, cum_profit, cum_ad_cost, cum_row_count
+        FROM channel_daily_agg
+        WHERE source_id = ? AND channel = ? AND date <= ?
+        ORDER BY date DESC
+        LIMIT 1
+    """
+    before_query = """
+        SELECT cum_revenue, cum_profit, cum_ad_cost, cum_row_count
+        FROM channel_daily_agg
+        WHERE source_id = ? AND channel = ? AND date < ?
+        ORDER BY date DESC
+        LIMIT 1
+    """
+    
+    totals = {}
+    try:
+        for channel in channels:
+            cursor.execute("""
+                SELECT has_ad_cost FROM channel_daily_agg_state
+                WHERE source_id = ? AND channel = ?
+            """, (source_id, channel))
+            state = cursor.fetchone()
+            if state is None:
+                continue
+            
+            cursor.execute(upto_query, (source_id, channel, end_date or "9999-12-31"))
+            upto = cursor.fetchone() or (0, 0, 0, 0)
+            before = (0, 0, 0, 0)
+            if start_date:
+                cursor.execute(before_query, (source_id, channel, start_date))
+                before = cursor.fetchone() or (0, 0, 0, 0)
+            
+            totals[channel] = {
+                "revenue": upto[0] - before[0],
+                "profit": upto[1] - before[1],
+                "ad_cost": upto[2] - before[2],
+                "rows": upto[3] - before[3],
+                "has_ad_cost": bool(state[0]),
+            }
+    finally:
+        release_connection(conn)
+    
+    return totals
+
+@timed("db.get_monthly_trend")
+def get_monthly_trend(months: list = None, channels: list = None):
+    """
+    월별 트렌드 조회 (여러 월/채널을 한 번의 쿼리로)
+
+    전월 대비(MoM), 전년 동월 대비(YoY) 증감률과 최근 3개월 평균을 윈도 함수로 계산
+    비교 기준은 달력 월 기준 (중간 월이 비어 있으면 해당 증감률은 NULL)
+    순이익 증감률은 기준 월이 적자여도 부호가 맞도록 기준값의 절댓값으로 나눔
+    선택하지 않은 월도 비교 기준으로 사용하도록 전체 월에서 계산한 뒤 선택한 월만 반환
+
+    Args:
+        months: "YYYY-MM" 목록 (None이면 전체)
+        channels: 채널 목록 (None이면 전체)
+
+    Returns:
+        pd.DataFrame: 월/채널별 한 행 (year_month, channel, revenue, profit, ad_cost, profit_rate, roas,
+                      revenue_mom, profit_mom, revenue_yoy, profit_yoy, revenue_3m_avg, profit_3m_avg)
+    """
+    channel_filter = ""
+    month_filter = ""
+    params = []
+    if channels:
+        channel_filter = f"WHERE channel IN ({', '.join('?' * len(channels))})"
+        params.extend(channels)
+    if months:
+        month_filter = f"WHERE year_month IN ({', '.join('?' * len(months))})"
+        params.extend(months)
+
+    query = f"""
+        WITH base AS (
+            SELECT year_month, channel,
+                   total_revenue AS revenue, total_profit AS profit, total_ad_cost AS ad_cost,
+                   avg_profit_rate AS profit_rate, roas,
+                   CAST(substr(year_month, 1, 4) AS INTEGER) * 12 + CAST(substr(year_month, 6, 2) AS INTEGER) AS month_index
+            FROM monthly_summary
+            {channel_filter}
+        ),
+        windowed AS (
+            SELECT *,
+                   SUM(revenue) OVER prev_month AS prev_revenue,
+                   SUM(profit) OVER prev_month AS prev_profit,
+                   SUM(revenue) OVER prev_year AS last_year_revenue,
+                   SUM(profit) OVER prev_year AS last_year_profit,
+                   AVG(revenue) OVER last_3m AS revenue_3m_avg,
+                   AVG(profit) OVER last_3m AS profit_3m_avg
+            FROM base
+            WINDOW
+                prev_month AS (PARTITION BY channel ORDER BY month_index RANGE BETWEEN 1 PRECEDING AND 1 PRECEDING),
+                prev_year AS (PARTITION BY channel ORDER BY month_index RANGE BETWEEN 12 PRECEDING AND 12 PRECEDING),
+                last_3m AS (PARTITION BY channel ORDER BY month_index RANGE BETWEEN 2 PRECEDING AND CURRENT ROW)
+        )
+        SELECT year_month, channel, revenue, profit, ad_cost, profit_rate, roas,
+               (revenue - prev_revenue) * 100.0 / NULLIF(prev_revenue, 0) AS revenue_mom,
+               (profit - prev_profit) * 100.0 / NULLIF(ABS(prev_profit), 0) AS profit_mom,
+               (revenue - last_year_revenue) * 100.0 / NULLIF(last_year_revenue, 0) AS revenue_yoy,
+               (profit - last_year_profit) * 100.0 / NULLIF(ABS(last_year_profit), 0) AS profit_yoy,
+               revenue_3m_avg, profit_3m_avg
+        FROM windowed
+        {month_filter}
+        ORDER BY year_month, channel
+    """
+
+    conn = acquire_connection()
+    try:
+        df = pd.read_sql_query(query, conn, params=params)
+    finally:
+        release_connection(conn)
+
+    return df
 
 if __name__ == "__main__":
     # 테스트: 데이터베이스 초기화
@@ -6,6 +6,8 @@ DataFrame을 직접 DB에 저장하는 유틸리티
 import pandas as pd
 from datetime import datetime
 
+from column_roles import resolve_roles
+
 def save_dataframe_to_db(df: pd.DataFrame, channel: str, year_month: str, save_monthly_data_func):
     """
     DataFrame을 직접 DB에 저장
@@ -46,21 +48,15 @@ def calculate_summary(df: pd.DataFrame) -> dict:
             'total_profit': 총 순이익,
             'avg_profit_rate': 평균 순이익률,
             'roas': ROAS,
-            'total_ad_cost': 총 광고비
+            'total_ad_cost': 총 광고비,
+            'total_manufacturing_cost': 총 제조원가
         }
     """
     summary = {}
     
-    # 정산매출 찾기 (정확한 매칭 우선)
-    revenue_col = None
-    for col in df.columns:
-        if col == "정산매출":  # 정확히 일치
-            revenue_col = col
-            break
-    
-    # 정확히 일치하는 게 없으면 부분 매칭
-    if not revenue_col:
-        revenue_col = find_column(df, ["정산매출", "총매출", "매출"], exclude=["전환", "광고", "센터"])
+    # 역할별 컬럼 찾기 (정산매출은 정확한 매칭 우선, 헤더 구성별로 캐시됨)
+    roles = resolve_roles(df.columns, "summary")
+    revenue_col = roles["revenue"]
     
     if revenue_col:
         summary['total_revenue'] = float(pd.to_numeric(df[revenue_col], errors='coerce').sum())
@@ -68,14 +64,14 @@ def calculate_summary(df: pd.DataFrame) -> dict:
         summary['total_revenue'] = 0.0
     
     # 순이익 찾기
-    profit_col = find_column(df, ["순이익", "순손익"], exclude=["률", "율"])
+    profit_col = roles["profit"]
     if profit_col:
         summary['total_profit'] = float(pd.to_numeric(df[profit_col], errors='coerce').sum())
     else:
         summary['total_profit'] = 0.0
     
     # 순이익률 찾기
-    profit_rate_col = find_column(df, ["순이익률", "순손익률"])
+    profit_rate_col = roles["profit_rate"]
     if profit_rate_col:
         summary['avg_profit_rate'] = float(pd.to_numeric(df[profit_rate_col], errors='coerce').mean())
     else:
@@ -85,19 +81,26 @@ def calculate_summary(df: pd.DataFrame) -> dict:
             summary['avg_profit_rate'] = 0.0
     
     # ROAS 찾기
-    roas_col = find_column(df, ["ROAS", "로아스"])
+    roas_col = roles["roas"]
     if roas_col:
         summary['roas'] = float(pd.to_numeric(df[roas_col], errors='coerce').mean())
     else:
         summary['roas'] = 0.0
     
     # 광고비 찾기
-    ad_cost_col = find_column(df, ["광고비", "마케팅비", "광고 비용"])
+    ad_cost_col = roles["ad_cost"]
     if ad_cost_col:
         summary['total_ad_cost'] = float(pd.to_numeric(df[ad_cost_col], errors='coerce').sum())
     else:
         summary['total_ad_cost'] = 0.0
     
+    # 제조원가 찾기
+    cost_col = roles["manufacturing_cost"]
+    if cost_col:
+        summary['total_manufacturing_cost'] = float(pd.to_numeric(df[cost_col], errors='coerce').sum())
+    else:
+        summary['total_manufacturing_cost'] = 0.0
+    
     return summary
 
 
@@ -106,51 +109,29 @@ def prepare_daily_data(df: pd.DataFrame) -> pd.DataFrame:
     날짜별 데이터 준비 (DB 저장용)
     
     Returns:
-        DataFrame: 날짜별 데이터
+        DataFrame: daily_details 형식 (date, ad_cost, revenue, manufacturing_cost, profit, profit_rate)
     """
     # 날짜 컬럼이 있는지 확인
     if '날짜' not in df.columns:
         # 날짜 컬럼이 없으면 빈 DataFrame 반환
         return pd.DataFrame()
     
-    # 날짜별로 그룹화하여 합계 계산
-    daily_df = df.copy()
+    # 시트 컬럼명 → DB 컬럼 (요약과 같은 역할 판별 규칙 사용)
+    roles = resolve_roles(df.columns, "summary")
     
-    # 필요한 컬럼만 선택 (존재하는 컬럼만)
-    columns_to_keep = ['날짜']
-    for col in df.columns:
-        if col != '날짜' and pd.api.types.is_numeric_dtype(df[col]):
-            columns_to_keep.append(col)
+    def numeric(col):
+        return pd.to_numeric(df[col], errors='coerce').fillna(0) if col else 0.0
     
-    daily_df = daily_df[columns_to_keep]
+    daily_df = pd.DataFrame({
+        'date': pd.to_datetime(df['날짜'], errors='coerce'),
+        'ad_cost': numeric(roles['ad_cost']),
+        'revenue': numeric(roles['revenue']),
+        'manufacturing_cost': numeric(roles['manufacturing_cost']),
+        'profit': numeric(roles['profit']),
+    }).dropna(subset=['date'])
     
-    return daily_df
-
-
-def find_column(df: pd.DataFrame, keywords: list, exclude: list = None) -> str:
-    """
-    DataFrame에서 키워드가 포함된 컬럼 찾기
+    # 같은 날짜가 여러 행이면 합산 (daily_details는 날짜당 한 행)
+    daily_df = daily_df.groupby('date', as_index=False).sum()
+    daily_df['profit_rate'] = (daily_df['profit'] / daily_df['revenue'] * 100).where(daily_df['revenue'] > 0, 0.0)
     
-    Args:
-        df: DataFrame
-        keywords: 찾을 키워드 리스트
-        exclude: 제외할 키워드 리스트
-    
-    Returns:
-        str: 찾은 컬럼명 (없으면 None)
-    """
-    if exclude is None:
-        exclude = []
-    
-    for col in df.columns:
-        col_str = str(col)
-        
-        # 키워드가 포함되어 있는지 확인
-        for keyword in keywords:
-            if keyword in col_str:
-                # 제외 키워드 확인
-                if exclude and any(ex in col_str for ex in exclude):
-                    continue
-                return col
-    
-    return None
\ No newline at end of file
+    return daily_df
@@ -0,0 +1,93 @@
+"""
+시계열 차트 다운샘플링
+LTTB(Largest-Triangle-Three-Buckets)로 긴 일별 시계열을 차트 폭에 맞는 점 개수로 줄임
+구간마다 앞뒤 점과 만드는 삼각형 넓이가 가장 큰 점을 고르므로 최고점/최저점이 유지됨
+"""
+
+import numpy as np
+import pandas as pd
+
+# 와이드 레이아웃에서 차트 영역 최대 폭(px)과 점 하나당 픽셀 수
+CHART_LAYOUT_WIDTH_PX = 1400
+PX_PER_POINT = 3
+
+
+def chart_point_budget(width_ratio: float = 1.0) -> int:
+    """
+    차트 폭에 맞는 최대 점 개수
+
+    Args:
+        width_ratio: 레이아웃 전체 폭 대비 차트 폭 비율 (st.columns([2, 1])의 왼쪽이면 2/3)
+    """
+    return max(int(CHART_LAYOUT_WIDTH_PX * width_ratio / PX_PER_POINT), 3)
+
+
+def _numeric_x(x: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    if pd.api.types.is_numeric_dtype(x):
+        return x.to_numpy(dtype=float)
+    # 날짜/숫자가 아닌 축은 순서만 사용
+    return np.arange(len(x), dtype=float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    LTTB로 남길 점의 위치 (x 오름차순 정렬된 유한한 값 기준)
+
+    Returns:
+        np.ndarray: 선택된 점의 위치 (첫 점과 마지막 점 포함, 오름차순)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # 첫/마지막 점을 제외한 나머지를 threshold - 2개 구간으로 나눔
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # 다음 구간의 평균점 (마지막 구간이면 마지막 점)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # 이전 선택점 a, 후보점, 다음 구간 평균점이 만드는 삼각형 넓이(의 2배)
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample(df: pd.DataFrame, x_col, y_col, threshold: int) -> pd.DataFrame:
+    """
+    y_col 기준 LTTB 다운샘플링
+
+    점 개수가 threshold 이하면 그대로 반환하고, 값이 없는 행(NaN)은 제외하고 계산
+
+    Returns:
+        pd.DataFrame: 선택된 행 (원래 순서 유지)
+    """
+    if len(df) <= threshold:
+        return df
+
+    y = pd.to_numeric(df[y_col], errors="coerce").to_numpy(dtype=float)
+    valid = np.flatnonzero(np.isfinite(y))
+    if len(valid) <= threshold:
+        return df.iloc[valid]
+
+    x = _numeric_x(df[x_col])[valid]
+    order = np.argsort(x, kind="stable")
+    picked = lttb_indices(x[order], y[valid][order], threshold)
+    return df.iloc[np.sort(valid[order[picked]])]
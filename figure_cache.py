@@ -0,0 +1,131 @@
+"""
+Plotly 차트 캐시
+(차트 종류, 데이터 내용 해시, 필터, 채널 선택)을 키로 직렬화된 차트 JSON을 재사용
+관련 없는 위젯(내보내기 expander 등)으로 재실행될 때 차트를 다시 만들지 않음
+LRU 방식으로 오래 안 쓴 차트부터 제거하고, 전체 JSON 크기가 상한을 넘지 않게 유지
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.io as pio
+
+from profiler import count, section
+
+# 캐시 상한 (직렬화된 JSON 기준)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FIGURE_CACHE_MAX_ENTRIES = 256
+
+
+def _update_fingerprint(h, value):
+    if isinstance(value, pd.DataFrame):
+        h.update(b"df")
+        h.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(b"series")
+        h.update(repr((value.name, str(value.dtype))).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, dict):
+        h.update(b"dict")
+        for k in sorted(value, key=repr):
+            h.update(repr(k).encode())
+            _update_fingerprint(h, value[k])
+    elif isinstance(value, (list, tuple)):
+        h.update(b"seq%d" % len(value))
+        for item in value:
+            _update_fingerprint(h, item)
+    else:
+        h.update(repr(value).encode())
+
+
+def fingerprint(*parts) -> str:
+    """DataFrame/Series는 내용 해시, dict/list는 재귀, 나머지 값은 repr 기준 지문"""
+    h = hashlib.sha1()
+    for part in parts:
+        _update_fingerprint(h, part)
+    return h.hexdigest()
+
+
+class FigureCache:
+    """직렬화된 차트 JSON의 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_MAX_BYTES, max_entries: int = FIGURE_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # 키 → 차트 JSON
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            figure_json = self._entries.get(key)
+            if figure_json is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return figure_json
+
+    def put(self, key, figure_json: str):
+        size = len(figure_json)
+        with self._lock:
+            # 상한보다 큰 차트는 저장하지 않음 (다른 차트를 모두 밀어내지 않도록)
+            if size > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = figure_json
+            self._size += size
+            while self._entries and (self._size > self.max_bytes or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+# 프로세스 전체에서 공유 (Streamlit 재실행/세션 간 재사용)
+_figure_cache = FigureCache()
+
+
+def get_figure_cache() -> FigureCache:
+    return _figure_cache
+
+
+def cached_figure(kind: str, key_parts, build_func):
+    """
+    캐시된 차트 반환, 없으면 build_func()로 만들어 저장
+
+    Args:
+        kind: 차트 종류 (예: "combo", "trend")
+        key_parts: 차트 모양을 결정하는 값들 (DataFrame, 필터, 채널 선택 등)
+        build_func: 인자 없이 go.Figure(또는 None)를 반환하는 함수
+
+    Returns:
+        go.Figure 또는 None (build_func가 None을 반환한 경우, 저장하지 않음)
+    """
+    key = (kind, fingerprint(key_parts))
+    figure_json = _figure_cache.get(key)
+    if figure_json is not None:
+        count("figure.hit")
+        with section(f"chart.{kind} (cache)"):
+            return pio.from_json(figure_json)
+
+    count("figure.miss")
+    with section(f"chart.{kind}"):
+        fig = build_func()
+    if fig is not None:
+        _figure_cache.put(key, fig.to_json())
+    return fig
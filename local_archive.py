@@ -0,0 +1,136 @@
+"""
+로컬 아카이브 읽기
+archives/YYYY/MM/*.xlsx 파일을 네트워크 없이 읽어 load_sheet와 같은 형태의 DataFrame으로 변환
+파싱 결과는 파일 수정 시각(mtime) 기준으로 캐시
+"""
+
+import os
+import re
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+
+from sheet_parser import parse_sheet_values
+
+LOCAL_ARCHIVE_DIR = "archives"
+
+# 데이터 소스 ID 접두사 (load_sheet의 spreadsheet_id 자리에 "local:<경로>" 형태로 사용)
+LOCAL_SOURCE_PREFIX = "local:"
+
+_ARCHIVE_PATH_RE = re.compile(r"(\d{4})[\\/](\d{2})[\\/][^\\/]+\.xlsx$")
+
+_cache = {}  # 파일 경로 → (mtime, {시트 이름: DataFrame})
+_cache_lock = threading.Lock()
+
+
+def list_local_archives(root: str = LOCAL_ARCHIVE_DIR) -> list:
+    """
+    로컬 아카이브 파일 목록 (최신 파일 우선)
+
+    Returns:
+        list: {"id", "name", "path", "year_month", "mtime"} 목록 (id는 데이터 소스 ID)
+    """
+    archives = []
+    if not os.path.isdir(root):
+        return archives
+
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            match = _ARCHIVE_PATH_RE.search(path)
+            # 엑셀 임시 파일(~$...)은 제외
+            if match is None or filename.startswith("~$"):
+                continue
+            archives.append({
+                "id": LOCAL_SOURCE_PREFIX + path,
+                "name": os.path.splitext(filename)[0],
+                "path": path,
+                "year_month": f"{match.group(1)}-{match.group(2)}",
+                "mtime": os.path.getmtime(path),
+            })
+
+    archives.sort(key=lambda a: a["name"], reverse=True)
+    return archives
+
+
+def is_local_source(source_id) -> bool:
+    return isinstance(source_id, str) and source_id.startswith(LOCAL_SOURCE_PREFIX)
+
+
+def local_source_path(source_id: str) -> str:
+    return source_id[len(LOCAL_SOURCE_PREFIX):]
+
+
+def _format_number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _cell_text(cell) -> str:
+    """셀 값을 Google Sheets get_all_values와 같은 문자열 형태로 변환"""
+    value = cell.value
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, (int, float)):
+        # 백분율 서식 셀은 시트 표시값처럼 "12.5%"로 (값은 0.125로 저장됨)
+        if "%" in (cell.number_format or ""):
+            return _format_number(round(value * 100, 10)) + "%"
+        return _format_number(value)
+    return str(value)
+
+
+def read_workbook_values(path: str, sheet_names) -> dict:
+    """
+    엑셀 파일에서 지정한 시트만 읽기 (openpyxl 읽기 전용 스트리밍)
+
+    Returns:
+        dict: {시트 이름: get_all_values 형식의 2차원 리스트} (파일에 없는 시트는 제외)
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        values = {}
+        for name in sheet_names:
+            if name not in wb.sheetnames:
+                continue
+            rows = [[_cell_text(cell) for cell in row] for row in wb[name].iter_rows()]
+            # 끝의 빈 행 제거 (서식만 남은 행)
+            while rows and not any(rows[-1]):
+                rows.pop()
+            values[name] = rows
+        return values
+    finally:
+        wb.close()
+
+
+def load_archive_sheets(path: str, sheet_names) -> dict:
+    """
+    로컬 아카이브의 시트들을 DataFrame으로 로드 (load_sheet와 같은 헤더 탐지/정리)
+
+    같은 파일을 동시에 여러 번 읽지 않도록 잠금 안에서 읽고,
+    파일이 바뀌지 않았으면(mtime 동일) 캐시된 결과를 반환
+
+    Returns:
+        dict: {시트 이름: DataFrame} (파일에 없는 시트는 빈 DataFrame)
+    """
+    wanted = list(dict.fromkeys(sheet_names))
+    mtime = os.path.getmtime(path)
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        frames = dict(cached[1]) if cached and cached[0] == mtime else {}
+        missing = [name for name in wanted if name not in frames]
+        if missing:
+            raw = read_workbook_values(path, missing)
+            for name in missing:
+                frames[name] = parse_sheet_values(raw[name]) if name in raw else pd.DataFrame()
+            _cache[path] = (mtime, frames)
+
+    return {name: frames[name] for name in wanted}
@@ -0,0 +1,167 @@
+"""
+재실행 프로파일러 (opt-in)
+한 번의 Streamlit 재실행을 이름 붙은 구간(데이터 로딩, KPI 계산, 탭, 차트, SQLite 호출)으로 나눠 시간을 재고
+캐시 적중/미스 횟수를 세어 JSONL 로그에 한 줄씩 기록
+
+켜는 방법: 환경 변수 DASHBOARD_PROFILE=1 또는 URL에 ?profile=1
+꺼져 있으면 구간 측정은 하지 않고 카운터만 올림 (스레드 로컬 조회 한 번)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_LOG_PATH = "profile_log.jsonl"
+
+_local = threading.local()
+
+# 프로세스 전체 카운터 (캐시 적중/미스 등, 워커 스레드에서도 올림)
+_counters = Counter()
+_counter_lock = threading.Lock()
+
+
+def profiling_enabled(query_params=None) -> bool:
+    """환경 변수나 URL 쿼리(?profile=1)로 프로파일링을 켰는지 여부"""
+    if os.environ.get(PROFILE_ENV, "") not in ("", "0"):
+        return True
+    return bool(query_params) and query_params.get("profile") == "1"
+
+
+def count(name: str, n: int = 1):
+    with _counter_lock:
+        _counters[name] += n
+
+
+def _counter_snapshot() -> dict:
+    with _counter_lock:
+        return dict(_counters)
+
+
+class RerunProfile:
+    """재실행 한 번의 구간 기록"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.started = time.perf_counter()
+        self.cpu_started = time.thread_time()
+        self.sections = []
+        self._depth = 0
+        self._phase = None  # mark로 연 최상위 구간 (이름, 시작 시각)
+        self._counters_start = _counter_snapshot()
+
+    def _record(self, name: str, start: float, end: float, depth: int):
+        self.sections.append({
+            "name": name,
+            "start_ms": round((start - self.started) * 1000, 2),
+            "ms": round((end - start) * 1000, 2),
+            "depth": depth,
+        })
+
+    @contextmanager
+    def section(self, name: str):
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._record(name, start, time.perf_counter(), self._depth + 1)
+
+    def mark(self, name: str):
+        """최상위 단계 전환 (이전 단계를 닫고 새 단계를 시작)"""
+        now = time.perf_counter()
+        if self._phase is not None:
+            self._record(self._phase[0], self._phase[1], now, 0)
+        self._phase = (name, now) if name else None
+
+    def finish(self) -> dict:
+        self.mark(None)
+        counters_end = _counter_snapshot()
+        counters = {
+            name: value - self._counters_start.get(name, 0)
+            for name, value in counters_end.items()
+            if value != self._counters_start.get(name, 0)
+        }
+        return {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "label": self.label,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "cpu_ms": round((time.thread_time() - self.cpu_started) * 1000, 2),
+            # 시작 시각 순 (중첩 구간은 바깥 구간 뒤에 오도록 깊이로 정렬)
+            "sections": sorted(self.sections, key=lambda s: (s["start_ms"], s["depth"])),
+            "counters": counters,
+        }
+
+
+def start_rerun(label: str = "", enabled: bool = True):
+    """현재 스레드(스크립트 실행 스레드)에서 재실행 기록 시작 (enabled가 False면 기록하지 않음)"""
+    _local.profile = RerunProfile(label) if enabled else None
+    return _local.profile
+
+
+def current():
+    return getattr(_local, "profile", None)
+
+
+def mark(name: str):
+    profile = current()
+    if profile is not None:
+        profile.mark(name)
+
+
+@contextmanager
+def section(name: str):
+    """구간 측정 (기록 중이 아니거나 다른 스레드면 아무것도 하지 않음)"""
+    profile = current()
+    if profile is None:
+        yield
+        return
+    with profile.section(name):
+        yield
+
+
+def timed(name: str):
+    """함수 호출을 구간으로 측정하고 "<name>.calls" 카운터를 올리는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            count(f"{name}.calls")
+            profile = current()
+            if profile is None:
+                return func(*args, **kwargs)
+            with profile.section(name):
+                return func(*args, **kwargs)
+
+        # st.cache_data 함수의 clear() 등은 그대로 사용할 수 있게 노출
+        if hasattr(func, "clear"):
+            wrapper.clear = func.clear
+        return wrapper
+    return decorator
+
+
+def finish_rerun(log_path: str = PROFILE_LOG_PATH):
+    """
+    재실행 기록 종료 및 JSONL 로그 추가
+
+    Returns:
+        dict: 이번 재실행 기록 (기록 중이 아니었으면 None)
+    """
+    profile = current()
+    if profile is None:
+        return None
+    _local.profile = None
+
+    record = profile.finish()
+    if log_path:
+        try:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"❌ 프로파일 로그 저장 실패: {e}")
+    return record
@@ -0,0 +1,247 @@
+"""
+시트 원본 값(get_all_values 결과)을 DataFrame으로 변환하는 파서
+헤더 탐지, 합계 행 제거, 컬럼 타입 추론 및 숫자 변환을 담당
+
+서식 있는 문자열("1,234", "12.5%", "2025-11-01")과 형식 없는 값
+(sheets_client.fetch_typed_values: 숫자, 날짜 일련번호)을 모두 받음
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# 숫자 변환 대상에서 제외하는 텍스트 컬럼
+TEXT_COLUMNS = ("날짜", "Model", "카테고리")
+
+# 컬럼 타입 추론에 사용할 샘플 셀 수
+TYPE_SAMPLE_SIZE = 64
+
+# 고유값 비율이 이 값 이하인 텍스트 컬럼은 category로 저장
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# "1,234", "-12.5%", "1e3" 등 숫자로 볼 수 있는 셀
+_NUMBER_RE = re.compile(r"^\s*[-+]?(?:\d[\d,]*)?(?:\.\d+)?(?:[eE][-+]?\d+)?\s*%?\s*$")
+_STRIP_TABLE = str.maketrans("", "", ",%")
+
+# 시트 날짜 일련번호의 기준일
+SERIAL_DATE_ORIGIN = "1899-12-30"
+
+
+def is_text_column(col) -> bool:
+    """숫자 변환을 하지 않는 컬럼인지 여부"""
+    return col in TEXT_COLUMNS or "모델" in col
+
+
+def parse_sheet_values(values: list) -> pd.DataFrame:
+    """
+    시트 원본 값을 정리된 DataFrame으로 변환
+
+    행 목록을 object DataFrame으로 만들지 않고 컬럼 하나씩 꺼내 바로 최종 타입 배열로 변환
+    (모든 셀을 담는 object 배열이 없으므로 최대 메모리는 결과 + 컬럼 하나 수준)
+
+    Args:
+        values: get_all_values 형식의 2차원 리스트 (셀은 문자열 또는 형식 없는 숫자)
+
+    Returns:
+        DataFrame: 헤더/합계 행이 정리되고 숫자 컬럼이 변환된 데이터
+    """
+    if len(values) < 2:
+        return pd.DataFrame()
+
+    header_row_idx = find_header_row(values)
+    columns = dedupe_header(values[header_row_idx])
+    first_row_idx = header_row_idx + 1
+
+    # "합계" 행 건너뛰기 (첫 데이터 행만 확인)
+    if first_row_idx < len(values) and is_total_row(values[first_row_idx], columns):
+        first_row_idx += 1
+
+    data = {}
+    for i, (name, cells) in enumerate(zip(columns, _iter_columns(values[first_row_idx:], len(columns)))):
+        data[i] = convert_column(name, cells)
+
+    # 중복 컬럼명이 있어도 순서대로 붙도록 위치 키로 만든 뒤 이름 지정
+    df = pd.DataFrame(data, copy=False)
+    df.columns = columns
+    return df
+
+
+def is_total_row(row: list, columns: list) -> bool:
+    """첫 데이터 행이 합계 행인지 여부 ("날짜" 컬럼 또는 첫 컬럼이 "합계")"""
+    def cell(i):
+        return row[i] if i < len(row) else None
+
+    if "날짜" in columns and str(cell(columns.index("날짜"))) == "합계":
+        return True
+    return bool(columns) and str(cell(0)) == "합계"
+
+
+def _iter_columns(rows: list, width: int):
+    """
+    행 목록을 컬럼(셀 튜플) 단위로 하나씩 반환 (한 번에 한 컬럼만 메모리에 있음)
+
+    짧은 행은 None으로 채우고, 가장 긴 행이 헤더와 길이가 다르면 ValueError (DataFrame 생성과 같은 동작)
+    """
+    if not rows:
+        return iter([()] * width)
+
+    lengths = set(map(len, rows))
+    if lengths == {width}:
+        # 모든 행 길이가 같으면(get_all_values 기본) zip이 컬럼을 하나씩 만듦
+        return zip(*rows)
+
+    longest = max(lengths)
+    if longest != width:
+        raise ValueError(f"{width} columns passed, passed data had {longest} columns")
+    return (tuple(row[i] if i < len(row) else None for row in rows) for i in range(width))
+
+
+def find_header_row(values: list) -> int:
+    """
+    헤더 행 위치
+
+    상품 시트와 엑셀로 내보낸 아카이브(제목 행 없음)는 첫 행, 일별 시트는 제목 행 다음
+    """
+    if "Model" in values[0] or "모델" in values[0]:
+        return 0
+    if "날짜" in values[0] and (len(values) < 2 or "날짜" not in values[1]):
+        return 0
+    return 1
+
+
+def dedupe_header(header: list) -> list:
+    """중복된 컬럼명 처리 (두 번째부터 _1, _2 ... 접미사)"""
+    seen = {}
+    new_header = []
+    for col in header:
+        if col in seen:
+            seen[col] += 1
+            new_header.append(f"{col}_{seen[col]}")
+        else:
+            seen[col] = 0
+            new_header.append(col)
+    return new_header
+
+
+def convert_column(name, cells):
+    """
+    컬럼 하나의 셀(튜플 또는 object 배열)을 컬럼 이름/샘플에 맞는 최종 타입 배열로 변환
+
+    - 날짜 컬럼: 날짜 문자열 또는 일련번호 → datetime64
+    - 숫자 컬럼: 천 단위 콤마와 % 기호를 한 번의 패스로 제거하고 변환
+      (정수 → int64, 빈 셀 포함 → float64, % 컬럼 → float32)
+    - 숫자로 변환되지 않는 셀이 섞인 컬럼은 정리된 문자열로 유지
+    - 카테고리/모델 컬럼: 고유값이 적으면 category
+    """
+    if name == "날짜":
+        return _parse_dates(cells)
+    if is_text_column(name):
+        return _compact_text(cells)
+    return _convert_numeric(cells)
+
+
+def convert_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """object DataFrame의 컬럼을 convert_column으로 변환 (이미 만든 DataFrame용)"""
+    for c in df.columns:
+        df[c] = pd.Series(convert_column(c, df[c].to_numpy(dtype=object)), index=df.index, name=c)
+    return df
+
+
+def _object_array(cells) -> np.ndarray:
+    """셀 시퀀스를 object 배열로 (이미 배열이면 그대로)"""
+    if isinstance(cells, np.ndarray):
+        return cells
+    return np.fromiter(cells, dtype=object, count=len(cells))
+
+
+def _sample(values) -> list:
+    """비어 있지 않은 셀을 최대 TYPE_SAMPLE_SIZE개 추출"""
+    sample = []
+    for v in values:
+        if v != "":
+            sample.append(v)
+            if len(sample) >= TYPE_SAMPLE_SIZE:
+                break
+    return sample
+
+
+def _is_number(v) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _parse_dates(cells) -> np.ndarray:
+    cells = _object_array(cells)
+    sample = _sample(cells)
+    # 형식 없는 값: 일련번호 → 날짜 (문자열 해석 없이 한 번에 변환)
+    if sample and all(_is_number(v) for v in sample):
+        serials = pd.to_numeric(cells, errors="coerce")
+        return pd.to_datetime(serials, unit="D", origin=SERIAL_DATE_ORIGIN).round("s").to_numpy()
+    return pd.to_datetime(cells, errors="coerce").to_numpy()
+
+
+def _convert_numeric(cells) -> np.ndarray:
+    sample = _sample(cells)
+
+    # 형식 없는 값: 이미 숫자이므로 빈 셀만 NaN으로 바꿔 바로 배열로
+    if sample and all(_is_number(v) for v in sample):
+        return _convert_typed(_object_array(cells))
+
+    # 샘플에 숫자가 아닌 셀("#DIV/0!", "N/A" 등)이 있으면 정리 후 변환 시도
+    # (실패해도 콤마/%를 뗀 문자열로 남겨 to_numeric(errors="coerce")로 나머지 값을 살릴 수 있게)
+    if not all(isinstance(v, str) and _NUMBER_RE.match(v) for v in sample):
+        return _convert_numeric_slow(cells)
+
+    is_percent = any(v.rstrip().endswith("%") for v in sample)
+    nan = float("nan")
+    try:
+        # 콤마(%) 제거와 float 변환을 셀당 한 번에 처리 (중간 리스트 없이 float64 배열에 바로 기록)
+        if is_percent:
+            parsed = (float(v.replace(",", "").replace("%", "")) if v else nan for v in cells)
+        else:
+            parsed = (float(v.replace(",", "")) if v else nan for v in cells)
+        arr = np.fromiter(parsed, dtype=np.float64, count=len(cells))
+    except (ValueError, TypeError, AttributeError):
+        return _convert_numeric_slow(cells)
+
+    if is_percent:
+        return arr.astype(np.float32)
+    return _narrow_integers(arr)
+
+
+def _convert_typed(cells: np.ndarray) -> np.ndarray:
+    filled = cells.copy()
+    filled[cells == ""] = np.nan
+    try:
+        arr = filled.astype(np.float64)
+    except (ValueError, TypeError):
+        # 오류 셀("#DIV/0!" 등)이 섞인 컬럼
+        return _convert_numeric_slow(cells)
+    return _narrow_integers(arr)
+
+
+def _narrow_integers(arr: np.ndarray) -> np.ndarray:
+    """빈 셀 없이 모두 정수인 float 배열은 int64로"""
+    if len(arr) and not np.isnan(arr).any() and np.array_equal(arr, np.floor(arr)) and np.abs(arr).max() < 2**53:
+        return arr.astype(np.int64)
+    return arr
+
+
+def _convert_numeric_slow(cells) -> np.ndarray:
+    """빠른 변환이 실패한 컬럼: 정리 후 pandas 변환, 그래도 실패하면 정리된 문자열 유지"""
+    cleaned = np.array([str(v).translate(_STRIP_TABLE).strip() for v in cells], dtype=object)
+    try:
+        return pd.to_numeric(cleaned)
+    except (ValueError, TypeError):
+        # 숫자가 아닌 셀이 섞여 있음 → 정리된 문자열 유지
+        return cleaned
+
+
+def _compact_text(cells):
+    cells = _object_array(cells)
+    if len(cells) == 0:
+        return cells
+    # 셀은 문자열이므로 파이썬 집합으로 고유값 수 계산 (pandas 해시 테이블보다 빠름)
+    if len(set(cells)) / len(cells) <= CATEGORY_MAX_UNIQUE_RATIO:
+        return pd.Categorical(cells)
+    return cells
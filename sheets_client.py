@@ -0,0 +1,357 @@
+"""
+Google Sheets / Drive 클라이언트
+Streamlit 없이도(CLI, 백그라운드 작업) 같은 인증 방식으로 시트와 아카이브 폴더에 접근
+"""
+
+import json
+import os
+import threading
+import time
+from http import HTTPStatus
+
+import gspread
+from google.oauth2.service_account import Credentials
+from gspread.exceptions import APIError, SpreadsheetNotFound, WorksheetNotFound
+from gspread.utils import DateTimeOption, ValueRenderOption, rowcol_to_a1
+from gspread.worksheet import Worksheet
+
+from api_scheduler import PRIORITY_LIVE, PRIORITY_VISIBLE, call_api, current_priority
+from profiler import count
+from sheet_parser import dedupe_header, find_header_row, is_text_column, is_total_row
+
+SHEET_ID = "1lIiU5_agxG4PLsvMEIcGAJ6eVqHxLBBlzwxjiKX1mHE"
+JSON_PATH = "supermurray-dashboard-1ee87560d47f.json"
+
+# 아카이브 폴더 ID (Google Drive의 "supermurray 아카이브" 폴더)
+# 사용법: Google Drive에서 폴더 열기 → URL에서 folders/ 뒤의 ID 복사
+ARCHIVE_FOLDER_ID = "1buSvKM-TxFO6cwcHFmVuzMfAsyTp5veD"
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+SPREADSHEET_MIME_TYPE = "application/vnd.google-apps.spreadsheet"
+
+# 형식 없는 값 조회: 숫자는 숫자, 날짜는 일련번호(1899-12-30 기준 일수)로 받음
+TYPED_RENDER_OPTIONS = {
+    "value_render_option": ValueRenderOption.unformatted,
+    "date_time_render_option": DateTimeOption.serial_number,
+}
+
+# % 서식 컬럼을 찾기 위해 서식 있는 값으로 함께 받는 데이터 행 수
+TYPED_SAMPLE_ROWS = 10
+
+# 스프레드시트 메타데이터(워크시트 id/제목/행·열 수) 보관 시간 (초)
+SPREADSHEET_CACHE_TTL_SECONDS = 600
+
+# 증분 동기화: 머리 행(제목/헤더/합계)과 마지막 몇 행만 다시 받음
+SYNC_HEAD_ROWS = 3
+SYNC_OVERLAP_ROWS = 7  # 최근 며칠은 광고비 등이 늦게 입력·수정되므로 다시 받음
+
+
+def sheet_priority(spreadsheet_id: str) -> int:
+    """요청 우선순위: 보고 있는 탭의 요청 중 실시간 스프레드시트(SHEET_ID)는 가장 먼저"""
+    priority = current_priority()
+    if priority == PRIORITY_VISIBLE and spreadsheet_id == SHEET_ID:
+        return PRIORITY_LIVE
+    return priority
+
+
+def load_credentials():
+    """
+    서비스 계정 인증 정보 생성
+
+    Railway 등 서버 환경에서는 환경 변수 GOOGLE_SHEETS_JSON, 로컬에서는 JSON_PATH 파일 사용
+    (환경 변수 JSON 형식이 잘못되면 json.JSONDecodeError)
+    """
+    if "GOOGLE_SHEETS_JSON" in os.environ:
+        creds_dict = json.loads(os.environ["GOOGLE_SHEETS_JSON"])
+        return Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+    return Credentials.from_service_account_file(JSON_PATH, scopes=SCOPES)
+
+
+def create_gspread_client(creds=None):
+    return gspread.authorize(creds or load_credentials())
+
+
+def create_drive_service(creds=None):
+    from googleapiclient.discovery import build
+    # discovery 문서 파일 캐시는 oauth2client 전용이라 끔 (경고만 출력됨)
+    return build('drive', 'v3', credentials=creds or load_credentials(), cache_discovery=False)
+
+
+def list_archive_files(drive_service=None, folder_id: str = ARCHIVE_FOLDER_ID) -> list:
+    """아카이브 폴더의 스프레드시트 목록 ({id, name, modifiedTime}, 이름 역순, 모든 페이지)"""
+    drive_service = drive_service or create_drive_service()
+    query = f"'{folder_id}' in parents and mimeType='{SPREADSHEET_MIME_TYPE}' and trashed=false"
+    files = []
+    page_token = None
+    while True:
+        request = drive_service.files().list(
+            q=query,
+            fields="nextPageToken, files(id, name, modifiedTime)",
+            orderBy="name desc",
+            pageSize=1000,
+            pageToken=page_token
+        )
+        results = call_api("drive", request.execute)
+        files.extend(results.get('files', []))
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return files
+
+
+class _MetadataSpreadsheet(gspread.Spreadsheet):
+    """
+    생성할 때(공개 생성자) 받은 전체 메타데이터(시트 목록 포함)를 보관하는 Spreadsheet
+
+    gspread.Spreadsheet 생성자는 메타데이터를 조회한 뒤 properties만 남기므로,
+    같은 응답의 시트 목록으로 워크시트 객체를 만들 수 있게 가로채 둠 (시트 목록을 따로 조회하지 않음)
+    """
+
+    metadata = None
+
+    def fetch_sheet_metadata(self, params=None):
+        metadata = super().fetch_sheet_metadata(params=params)
+        if params is None:
+            self.metadata = metadata
+        return metadata
+
+
+class SpreadsheetCache:
+    """
+    열어 둔 Spreadsheet와 워크시트 메타데이터를 스프레드시트 ID별로 보관 (프로세스 공유, 스레드 안전)
+
+    open_by_key + worksheet(이름)은 시트마다 메타데이터를 두 번 조회하지만,
+    여기서는 스프레드시트당 한 번(spreadsheets.get) 받아 모든 워크시트 객체를 만들어 둠
+    → 같은 스프레드시트의 시트 N개 조회 = 메타데이터 1회 + 값 N회
+    """
+
+    def __init__(self, ttl: float = SPREADSHEET_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries = {}  # ID → (조회 시각, Spreadsheet, {제목: Worksheet})
+        self._loading = {}  # ID → 조회 잠금 (같은 스프레드시트를 동시에 여러 번 조회하지 않도록)
+        self._lock = threading.Lock()
+
+    def _fetch(self, gc, spreadsheet_id: str):
+        try:
+            spreadsheet = call_api("sheets", _MetadataSpreadsheet, gc.http_client, {"id": spreadsheet_id},
+                                   priority=sheet_priority(spreadsheet_id))
+        except APIError as e:
+            # open_by_key와 같은 예외로 변환
+            if e.response.status_code == HTTPStatus.NOT_FOUND:
+                raise SpreadsheetNotFound(e.response) from e
+            if e.response.status_code == HTTPStatus.FORBIDDEN:
+                raise PermissionError from e
+            raise
+        count("sheets.metadata_fetch")
+
+        worksheets = {}
+        for sheet in spreadsheet.metadata.get("sheets", []):
+            ws = Worksheet(spreadsheet, sheet["properties"], spreadsheet_id, gc.http_client)
+            # 같은 제목이 여러 개면 첫 번째 (Spreadsheet.worksheet와 동일)
+            worksheets.setdefault(ws.title, ws)
+        return spreadsheet, worksheets
+
+    def get(self, gc, spreadsheet_id: str, refresh: bool = False):
+        """(Spreadsheet, {제목: Worksheet}) 반환 (refresh면 보관 시간과 관계없이 다시 조회)"""
+        requested_at = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(spreadsheet_id)
+            if entry and not refresh and requested_at - entry[0] < self.ttl:
+                return entry[1], entry[2]
+            loading = self._loading.setdefault(spreadsheet_id, threading.Lock())
+
+        with loading:
+            # 기다리는 동안 다른 스레드가 조회했으면 그 결과 사용
+            with self._lock:
+                entry = self._entries.get(spreadsheet_id)
+            if entry and (entry[0] >= requested_at or (not refresh and time.monotonic() - entry[0] < self.ttl)):
+                return entry[1], entry[2]
+
+            spreadsheet, worksheets = self._fetch(gc, spreadsheet_id)
+            with self._lock:
+                self._entries[spreadsheet_id] = (time.monotonic(), spreadsheet, worksheets)
+            return spreadsheet, worksheets
+
+    def worksheet(self, gc, spreadsheet_id: str, sheet_name: str):
+        _, worksheets = self.get(gc, spreadsheet_id)
+        ws = worksheets.get(sheet_name)
+        if ws is None:
+            # 보관 이후에 추가된 시트일 수 있으므로 한 번 다시 조회
+            _, worksheets = self.get(gc, spreadsheet_id, refresh=True)
+            ws = worksheets.get(sheet_name)
+            if ws is None:
+                raise WorksheetNotFound(sheet_name)
+        return ws
+
+    def titles(self, gc, spreadsheet_id: str) -> list:
+        _, worksheets = self.get(gc, spreadsheet_id)
+        return list(worksheets)
+
+    def invalidate(self, spreadsheet_id: str = None):
+        with self._lock:
+            if spreadsheet_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(spreadsheet_id, None)
+
+
+# 프로세스 전체에서 공유 (load_sheet 워커, 시트 목록, 아카이브 저장 CLI)
+_spreadsheet_cache = SpreadsheetCache()
+
+
+def open_worksheet(gc, spreadsheet_id: str, sheet_name: str):
+    """보관된 메타데이터로 워크시트 객체 반환 (없으면 스프레드시트 메타데이터를 한 번 조회)"""
+    return _spreadsheet_cache.worksheet(gc, spreadsheet_id, sheet_name)
+
+
+def list_sheet_titles(gc, spreadsheet_id: str) -> list:
+    """스프레드시트의 시트 이름 목록 (시트 순서)"""
+    return _spreadsheet_cache.titles(gc, spreadsheet_id)
+
+
+def invalidate_spreadsheet_cache(spreadsheet_id: str = None):
+    """보관된 메타데이터 삭제 (spreadsheet_id가 None이면 전체)"""
+    _spreadsheet_cache.invalidate(spreadsheet_id)
+
+
+def _read_worksheet(gc, spreadsheet_id: str, sheet_name: str, read):
+    ws = open_worksheet(gc, spreadsheet_id, sheet_name)
+    try:
+        return read(ws)
+    except APIError as e:
+        # 보관된 제목이 바뀌었거나 삭제된 시트면 범위 오류(400) → 메타데이터를 다시 받아 한 번 더 시도
+        if e.response.status_code != HTTPStatus.BAD_REQUEST:
+            raise
+        invalidate_spreadsheet_cache(spreadsheet_id)
+        return read(open_worksheet(gc, spreadsheet_id, sheet_name))
+
+
+def fetch_values(gc, spreadsheet_id: str, sheet_name: str) -> list:
+    """시트 원본 값(get_all_values) 조회"""
+    return _read_worksheet(gc, spreadsheet_id, sheet_name, lambda ws: call_api(
+        "sheets", ws.get_all_values, priority=sheet_priority(spreadsheet_id)))
+
+
+def column_letter(col: int) -> str:
+    """열 번호(1부터) → A1 표기 열 문자 (27 → "AA")"""
+    return rowcol_to_a1(1, col).rstrip("0123456789")
+
+
+def _column_range(col_idx: int, first_row: int, last_row: int) -> str:
+    column = column_letter(col_idx + 1)
+    return f"{column}{first_row}:{column}{last_row}"
+
+
+def apply_typed_formats(ws, rows: list, first_row: int, header: list) -> list:
+    """
+    형식 없는 값으로 받은 데이터 행을 서식 있는 값 기준으로 맞춤 (rows를 직접 수정)
+
+    - % 서식 컬럼: 0.125 → "12.5%" (시트 표시 자릿수로 get_all_values와 같은 문자열,
+      파서가 서식 있는 값과 같은 값/타입(float32)으로 변환)
+    - 텍스트 컬럼(Model/카테고리): 서식 있는 문자열 (숫자처럼 보이는 모델명 유지)
+    서식 있는 값은 앞쪽 샘플 행과 텍스트 컬럼만 한 번의 batch_get으로 받음
+
+    Args:
+        ws: gspread 워크시트
+        rows: 헤더 아래 데이터 행 (형식 없는 값)
+        first_row: rows[0]의 시트 행 번호 (1부터)
+        header: 헤더 행
+    """
+    if not rows:
+        return rows
+
+    last_row = first_row + len(rows) - 1
+    # 날짜는 일련번호 그대로 둠 (파서가 한 번에 변환)
+    text_cols = [i for i, col in enumerate(header) if isinstance(col, str) and col != "날짜" and is_text_column(col)]
+    ranges = [f"{first_row}:{min(last_row, first_row + TYPED_SAMPLE_ROWS - 1)}"]
+    ranges += [_column_range(i, first_row, last_row) for i in text_cols]
+    sample, *text_values = call_api("sheets", ws.batch_get, ranges, priority=sheet_priority(ws.spreadsheet_id))
+
+    # % 서식 컬럼별 표시 소수 자릿수 (샘플의 서식 있는 값 기준, "12.5%" → 1)
+    percent_decimals = {}
+    for row in sample:
+        for i, cell in enumerate(row):
+            if i not in text_cols and isinstance(cell, str) and cell.rstrip().endswith("%"):
+                number = cell.strip()[:-1]
+                decimals = len(number.split(".", 1)[1]) if "." in number else 0
+                percent_decimals[i] = max(percent_decimals.get(i, 0), decimals)
+    if percent_decimals:
+        # 0.125 * 100 = 12.500000000000002 같은 오차 없이 표시값과 같게
+        for row in rows:
+            for i, decimals in percent_decimals.items():
+                if i < len(row) and isinstance(row[i], (int, float)) and not isinstance(row[i], bool):
+                    row[i] = f"{row[i] * 100:.{decimals}f}%"
+
+    for i, column in zip(text_cols, text_values):
+        for row, cell in zip(rows, column):
+            if i < len(row):
+                row[i] = cell[0] if cell else ""
+        # API는 끝의 빈 셀을 생략하므로 남은 행은 빈 문자열
+        for row in rows[len(column):]:
+            if i < len(row):
+                row[i] = ""
+    return rows
+
+
+def fetch_typed_values(gc, spreadsheet_id: str, sheet_name: str) -> list:
+    """
+    시트 원본 값을 형식 없는 값으로 조회 (get_all_values와 같은 2차원 리스트)
+
+    숫자 셀은 int/float, 날짜 셀은 일련번호로 받으므로 파서가 콤마/% 문자열을 다시 해석하지 않음
+    (% 서식 컬럼과 텍스트 컬럼은 apply_typed_formats로 서식 있는 값 기준에 맞춤)
+    """
+    def read(ws):
+        values = call_api("sheets", ws.get_all_values, priority=sheet_priority(spreadsheet_id), **TYPED_RENDER_OPTIONS)
+        if len(values) < 2:
+            return values
+
+        header_idx = find_header_row(values)
+        first_idx = header_idx + 1
+        # 합계 행은 파서가 버리므로 그대로 둠 (증분 동기화의 머리 행과 같은 형태 유지, 파서와 같은 판정)
+        if first_idx < len(values) and is_total_row(values[first_idx], dedupe_header(values[header_idx])):
+            first_idx += 1
+        apply_typed_formats(ws, values[first_idx:], first_idx + 1, values[header_idx])
+        return values
+
+    return _read_worksheet(gc, spreadsheet_id, sheet_name, read)
+
+
+def fetch_tail_values(gc, spreadsheet_id: str, sheet_name: str, previous_values: list, typed: bool = False):
+    """
+    일별 시트 증분 조회: 머리 행과 이전 마지막 행 근처부터 끝까지만 받아 이전 값에 병합
+
+    아래로만 행이 추가된다는 가정이 깨진 것으로 보이면(헤더/기준 행 불일치) None을 반환해
+    전체 조회로 대체하게 함. typed면 다시 받는 구간도 형식 없는 값으로 받음 (fetch_typed_values와 같은 형태)
+    """
+    # 기준 행: 다시 받는 구간 바로 위 행 (위쪽 행이 밀리거나 지워졌는지 확인용)
+    anchor_idx = len(previous_values) - SYNC_OVERLAP_ROWS - 1
+    if anchor_idx < SYNC_HEAD_ROWS:
+        return None
+
+    ws = open_worksheet(gc, spreadsheet_id, sheet_name)
+    # 끝 행은 열어 둠 (보관된 메타데이터의 행 수는 그 뒤에 늘었을 수 있음)
+    last_column = column_letter(max(ws.col_count, len(previous_values[0])))
+    head, tail = call_api("sheets", ws.batch_get, [
+        f"1:{SYNC_HEAD_ROWS}",
+        f"A{anchor_idx + 1}:{last_column}",
+    ], priority=sheet_priority(spreadsheet_id), **(TYPED_RENDER_OPTIONS if typed else {}))
+
+    # get_all_values와 같은 직사각형 형태로 맞춤 (API는 끝의 빈 셀을 생략함)
+    width = max(len(row) for row in [previous_values[0], *head, *tail])
+    def pad(row):
+        return list(row) + [""] * (width - len(row))
+    head = [pad(row) for row in head] + [[""] * width] * (SYNC_HEAD_ROWS - len(head))
+    tail = [pad(row) for row in tail]
+
+    header_idx = find_header_row(previous_values)
+    if typed and tail:
+        # 이전 값과 같은 기준(% 컬럼 단위)으로 맞춘 뒤 비교
+        apply_typed_formats(ws, tail, anchor_idx + 1, pad(previous_values[header_idx]))
+    if not tail or tail[0] != pad(previous_values[anchor_idx]) or head[header_idx] != pad(previous_values[header_idx]):
+        return None
+
+    middle = [pad(row) for row in previous_values[SYNC_HEAD_ROWS:anchor_idx]]
+    return head + middle + tail
@@ -0,0 +1,85 @@
+"""
+동시 요청 합치기 (single-flight)
+같은 키의 작업이 이미 진행 중이면 새로 실행하지 않고 그 결과(또는 예외)를 함께 받음
+
+캐시 TTL이 끝나는 순간 여러 세션이 같은 시트를 동시에 놓쳐도 Google API 요청은 키당 한 번만 나감
+결과 객체는 기다린 호출 모두가 공유하므로 받은 쪽에서 수정하지 않아야 함
+"""
+
+import threading
+
+from profiler import count
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키별로 진행 중인 작업 하나만 실행 (스레드 안전)"""
+
+    def __init__(self):
+        self._flights = {}  # 키 → _Flight
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        func(*args, **kwargs)를 키당 한 번만 실행하고 결과 반환
+
+        같은 키로 실행 중인 작업이 있으면 끝날 때까지 기다렸다가 같은 결과를 반환하고,
+        작업이 예외로 끝났으면 같은 예외를 다시 발생시킴 (실패도 합쳐서 재시도 폭주를 막음)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+                self.leaders += 1
+            else:
+                leader = False
+                self.shared += 1
+
+        if not leader:
+            count("single_flight.shared")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            # 끝난 작업은 바로 지움 → 다음 호출은 새로 실행 (결과를 캐시하지 않음)
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._flights), "leaders": self.leaders, "shared": self.shared}
+
+
+# 프로세스 전체에서 공유 (모든 세션/워커 스레드)
+_group = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    return _group
+
+
+def single_flight(key, func, *args, **kwargs):
+    """공유 그룹으로 실행 (SingleFlight.do 참고)"""
+    return _group.do(key, func, *args, **kwargs)
@@ -0,0 +1,302 @@
+"""
+시트 스냅샷 로컬 캐시 (stale-while-revalidate)
+마지막으로 성공한 시트 원본 값을 SQLite에 저장해두고,
+재시작/캐시 만료 시에도 Google API를 기다리지 않고 즉시 반환한 뒤 백그라운드에서 갱신
+
+아래로만 행이 추가되는 시트는 증분 동기화(바뀐 끝부분만 조회) 후 스냅샷에 병합하고,
+내용 해시가 같으면 스냅샷을 다시 쓰거나 메모리 캐시를 비우지 않음
+"""
+
+import hashlib
+import json
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from api_scheduler import PRIORITY_BACKGROUND, api_priority
+from database import acquire_connection, release_connection
+from profiler import count, timed
+from single_flight import single_flight
+
+SNAPSHOT_DB_PATH = "sheet_snapshots.db"
+
+# 이 시간(초) 이내의 스냅샷은 갱신 없이 그대로 사용
+SNAPSHOT_FRESH_SECONDS = 300
+# 이 시간(초)보다 오래된 스냅샷은 동기적으로 다시 가져옴 (실패 시에만 스냅샷 사용)
+SNAPSHOT_MAX_STALE_SECONDS = 7 * 24 * 3600
+# 백그라운드 갱신 워커 수
+REFRESH_WORKERS = 4
+# 증분 동기화를 하더라도 이 시간(초)마다 한 번은 전체를 다시 받음 (중간 행 수정 반영)
+FULL_SYNC_SECONDS = 3600
+
+_refresh_executor = None
+_refresh_lock = threading.Lock()
+_refreshing = set()
+_initialized_paths = set()
+
+
+# 기존 스냅샷 DB에 없을 수 있는 동기화 상태 컬럼
+_SYNC_COLUMNS = (
+    ("row_count", "INTEGER"),
+    ("content_hash", "TEXT"),
+    ("full_synced_at", "REAL"),
+)
+
+
+def _connect():
+    """연결 풀(database.py)에서 스냅샷 DB 연결을 빌림. 테이블은 DB 파일당 한 번만 생성"""
+    conn = acquire_connection(SNAPSHOT_DB_PATH)
+    if SNAPSHOT_DB_PATH not in _initialized_paths:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sheet_snapshots (
+                spreadsheet_id TEXT NOT NULL,
+                sheet_name TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                fetched_at REAL NOT NULL,
+                row_count INTEGER,
+                content_hash TEXT,
+                full_synced_at REAL,
+                PRIMARY KEY (spreadsheet_id, sheet_name)
+            )
+        """)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(sheet_snapshots)")}
+        for name, col_type in _SYNC_COLUMNS:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE sheet_snapshots ADD COLUMN {name} {col_type}")
+        _initialized_paths.add(SNAPSHOT_DB_PATH)
+    return conn
+
+
+def _release(conn):
+    release_connection(conn, SNAPSHOT_DB_PATH)
+
+
+def content_hash(values: list) -> str:
+    """시트 원본 값의 내용 해시"""
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+@timed("snapshot.save")
+def save_snapshot(spreadsheet_id: str, sheet_name: str, values: list, digest: str = None, full_sync: bool = True):
+    """
+    시트 원본 값(get_all_values 결과)을 압축해서 저장
+
+    Args:
+        digest: 내용 해시 (None이면 계산)
+        full_sync: 전체 조회 결과인지 여부 (증분 병합 결과면 전체 동기화 시각을 유지)
+    """
+    payload = zlib.compress(json.dumps(values, ensure_ascii=False).encode("utf-8"))
+    digest = digest or content_hash(values)
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("""
+            INSERT INTO sheet_snapshots
+            (spreadsheet_id, sheet_name, payload, fetched_at, row_count, content_hash, full_synced_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (spreadsheet_id, sheet_name) DO UPDATE SET
+                payload = excluded.payload,
+                fetched_at = excluded.fetched_at,
+                row_count = excluded.row_count,
+                content_hash = excluded.content_hash,
+                full_synced_at = CASE WHEN ? THEN excluded.full_synced_at ELSE sheet_snapshots.full_synced_at END
+        """, (spreadsheet_id, sheet_name, payload, now, len(values), digest, now if full_sync else 0, int(full_sync)))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ 스냅샷 저장 실패: {e}")
+        return False
+    finally:
+        _release(conn)
+
+
+def touch_snapshot(spreadsheet_id: str, sheet_name: str, full_sync: bool = True):
+    """내용이 그대로인 스냅샷의 조회 시각만 갱신"""
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("""
+            UPDATE sheet_snapshots
+            SET fetched_at = ?, full_synced_at = CASE WHEN ? THEN ? ELSE full_synced_at END
+            WHERE spreadsheet_id = ? AND sheet_name = ?
+        """, (now, int(full_sync), now, spreadsheet_id, sheet_name))
+        conn.commit()
+    finally:
+        _release(conn)
+
+
+@timed("snapshot.load")
+def load_snapshot(spreadsheet_id: str, sheet_name: str):
+    """저장된 스냅샷 조회. (values, fetched_at) 또는 None 반환"""
+    conn = _connect()
+    try:
+        row = conn.execute("""
+            SELECT payload, fetched_at FROM sheet_snapshots
+            WHERE spreadsheet_id = ? AND sheet_name = ?
+        """, (spreadsheet_id, sheet_name)).fetchone()
+    finally:
+        _release(conn)
+
+    if row is None:
+        return None
+    return json.loads(zlib.decompress(row[0]).decode("utf-8")), row[1]
+
+
+def load_sync_state(spreadsheet_id: str, sheet_name: str):
+    """마지막 동기화 상태 조회. {"row_count", "content_hash", "full_synced_at"} 또는 None"""
+    conn = _connect()
+    try:
+        row = conn.execute("""
+            SELECT row_count, content_hash, full_synced_at FROM sheet_snapshots
+            WHERE spreadsheet_id = ? AND sheet_name = ?
+        """, (spreadsheet_id, sheet_name)).fetchone()
+    finally:
+        _release(conn)
+
+    if row is None:
+        return None
+    return {"row_count": row[0], "content_hash": row[1], "full_synced_at": row[2] or 0}
+
+
+def list_snapshot_sheets(spreadsheet_id: str) -> list:
+    """스냅샷이 저장된 시트 이름 목록"""
+    conn = _connect()
+    try:
+        rows = conn.execute("""
+            SELECT sheet_name FROM sheet_snapshots
+            WHERE spreadsheet_id = ?
+            ORDER BY sheet_name
+        """, (spreadsheet_id,)).fetchall()
+    finally:
+        _release(conn)
+
+    return [row[0] for row in rows]
+
+
+def invalidate_snapshots(spreadsheet_id: str = None):
+    """스냅샷을 만료 처리 (다음 로딩 때 동기적으로 전체를 새로 가져옴, 실패 시 대체용으로는 유지)"""
+    conn = _connect()
+    try:
+        if spreadsheet_id:
+            conn.execute("UPDATE sheet_snapshots SET fetched_at = 0, full_synced_at = 0 WHERE spreadsheet_id = ?", (spreadsheet_id,))
+        else:
+            conn.execute("UPDATE sheet_snapshots SET fetched_at = 0, full_synced_at = 0")
+        conn.commit()
+    finally:
+        _release(conn)
+
+
+@timed("snapshot.fetch")
+def _fetch_and_save(spreadsheet_id, sheet_name, fetch_func, incremental_func=None, previous=None):
+    """
+    원격 조회 후 스냅샷 저장. (values, changed) 반환
+
+    이전 값이 있고 전체 동기화 주기 안이면 incremental_func로 끝부분만 받아 병합하고,
+    증분 조회가 불가능하면(None/오류) 전체 조회로 대체
+    """
+    state = load_sync_state(spreadsheet_id, sheet_name) if previous else None
+
+    values = None
+    full_sync = True
+    if incremental_func and state and time.time() - state["full_synced_at"] < FULL_SYNC_SECONDS:
+        try:
+            values = incremental_func(spreadsheet_id, sheet_name, previous)
+            full_sync = values is None
+        except Exception as e:
+            print(f"❌ 증분 동기화 실패, 전체 조회로 대체 {(spreadsheet_id, sheet_name)}: {e}")
+    if values is None:
+        values = fetch_func(spreadsheet_id, sheet_name)
+
+    # 빈 결과는 "마지막 정상 데이터"를 덮어쓰지 않음
+    if not values or len(values) < 2:
+        return values, False
+
+    digest = content_hash(values)
+    if state and digest == state["content_hash"]:
+        touch_snapshot(spreadsheet_id, sheet_name, full_sync)
+        return values, False
+    save_snapshot(spreadsheet_id, sheet_name, values, digest, full_sync)
+    return values, True
+
+
+def _fetch_and_save_once(spreadsheet_id, sheet_name, fetch_func, incremental_func=None, previous=None):
+    """_fetch_and_save를 시트당 하나만 실행 (동기 조회와 백그라운드 갱신이 겹치면 결과를 함께 받음)"""
+    return single_flight(("snapshot", spreadsheet_id, sheet_name), _fetch_and_save,
+                         spreadsheet_id, sheet_name, fetch_func, incremental_func, previous)
+
+
+def _refresh_job(key, fetch_func, on_refreshed, incremental_func, previous):
+    try:
+        # 화면에 이미 스냅샷을 보여 준 뒤의 갱신이므로 보고 있는 탭의 요청보다 뒤로
+        with api_priority(PRIORITY_BACKGROUND):
+            _, changed = _fetch_and_save_once(key[0], key[1], fetch_func, incremental_func, previous)
+        # 내용이 바뀐 경우에만 메모리 캐시를 비움 (다시 파싱하지 않도록)
+        if changed and on_refreshed:
+            on_refreshed()
+    except Exception as e:
+        print(f"❌ 스냅샷 백그라운드 갱신 실패 {key}: {e}")
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(key)
+
+
+def refresh_in_background(spreadsheet_id: str, sheet_name: str, fetch_func, on_refreshed=None,
+                          incremental_func=None, previous=None) -> bool:
+    """스냅샷 백그라운드 갱신 예약. 같은 시트가 이미 갱신 중이면 False"""
+    global _refresh_executor
+    key = (spreadsheet_id, sheet_name)
+    with _refresh_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="snapshot_refresh")
+    _refresh_executor.submit(_refresh_job, key, fetch_func, on_refreshed, incremental_func, previous)
+    return True
+
+
+def get_sheet_values(spreadsheet_id: str, sheet_name: str, fetch_func, on_refreshed=None,
+                     incremental_func=None) -> list:
+    """
+    스냅샷 우선으로 시트 원본 값을 반환
+
+    Args:
+        spreadsheet_id: 스프레드시트 ID
+        sheet_name: 시트 이름
+        fetch_func: (spreadsheet_id, sheet_name) -> values 원격 조회 함수
+        on_refreshed: 백그라운드 갱신으로 내용이 바뀐 뒤 호출할 함수 (메모리 캐시 비우기 등)
+        incremental_func: (spreadsheet_id, sheet_name, previous_values) -> values 또는 None
+            아래로만 행이 추가되는 시트의 증분 조회 함수 (None이면 항상 전체 조회)
+
+    Returns:
+        list: get_all_values 형식의 2차원 리스트
+    """
+    try:
+        snapshot = load_snapshot(spreadsheet_id, sheet_name)
+    except Exception as e:
+        print(f"❌ 스냅샷 조회 실패: {e}")
+        snapshot = None
+
+    previous = None
+    if snapshot is not None:
+        previous, fetched_at = snapshot
+        age = time.time() - fetched_at
+        if age < SNAPSHOT_FRESH_SECONDS:
+            count("snapshot.fresh")
+            return previous
+        if age < SNAPSHOT_MAX_STALE_SECONDS:
+            count("snapshot.stale")
+            # 오래된 스냅샷을 바로 반환하고 갱신은 백그라운드에서
+            refresh_in_background(spreadsheet_id, sheet_name, fetch_func, on_refreshed, incremental_func, previous)
+            return previous
+
+    # 스냅샷이 없거나 만료된 경우: 동기 조회 (실패하면 남아있는 스냅샷으로 대체)
+    count("snapshot.miss")
+    try:
+        return _fetch_and_save_once(spreadsheet_id, sheet_name, fetch_func, incremental_func, previous)[0]
+    except Exception:
+        if snapshot is not None:
+            return previous
+        raise
@@ -0,0 +1,110 @@
+"""api_scheduler 재시도/우선순위 테스트 (가짜 시계와 sleep, APIError를 던지는 가짜 호출)"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+import api_scheduler
+from api_scheduler import MAX_RETRIES, PRIORITY_ARCHIVE, PRIORITY_LIVE, ApiScheduler
+
+
+def api_error(status: int) -> APIError:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({"error": {"code": status, "message": "테스트", "status": "TEST"}}).encode("utf-8")
+    return APIError(response)
+
+
+class FlakyCall:
+    """처음 failures번은 지정한 상태 코드의 APIError, 그 뒤로는 "ok" 반환"""
+
+    def __init__(self, status: int, failures: int):
+        self.status = status
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise api_error(self.status)
+        return "ok"
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """time.monotonic/time.sleep을 가짜 시계로 바꾸고 백오프는 항상 상한값 (sleep 기록)"""
+    clock = SimpleNamespace(now=1000.0, sleeps=[])
+
+    def sleep(seconds):
+        clock.sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(api_scheduler, "time", SimpleNamespace(monotonic=lambda: clock.now, sleep=sleep))
+    monkeypatch.setattr(api_scheduler.random, "uniform", lambda low, high: high)
+    return clock
+
+
+def test_throttled_call_is_retried_with_backoff(fake_clock):
+    scheduler = ApiScheduler({"sheets": 60})
+    func = FlakyCall(429, failures=2)
+
+    assert scheduler.call("sheets", func) == "ok"
+
+    assert func.calls == 3
+    assert fake_clock.sleeps == [1.0, 2.0]
+    stats = scheduler.stats()
+    assert (stats["calls"], stats["retries"], stats["throttled"], stats["failures"]) == (3, 2, 2, 0)
+
+
+def test_retries_stop_after_max_retries(fake_clock):
+    scheduler = ApiScheduler({"sheets": 60})
+    func = FlakyCall(503, failures=MAX_RETRIES + 1)
+
+    with pytest.raises(APIError):
+        scheduler.call("sheets", func)
+
+    assert func.calls == MAX_RETRIES + 1
+    assert scheduler.stats()["failures"] == 1
+
+
+def test_non_retryable_client_error_is_raised_immediately(fake_clock):
+    scheduler = ApiScheduler({"sheets": 60})
+    func = FlakyCall(404, failures=1)
+
+    with pytest.raises(APIError):
+        scheduler.call("sheets", func)
+
+    assert func.calls == 1
+    assert fake_clock.sleeps == []
+    assert scheduler.stats()["retries"] == 0
+
+
+def test_higher_priority_request_goes_first():
+    scheduler = ApiScheduler({"sheets": 600})
+    # 쿼터 초과로 잠시 멈춘 동안 낮은 우선순위 요청이 먼저 줄을 서게 함
+    scheduler._pause("sheets", 0.3)
+    order = []
+
+    def request(name, priority):
+        scheduler.call("sheets", order.append, name, priority=priority)
+
+    def wait_queued(n):
+        deadline = time.monotonic() + 5
+        while scheduler.stats()["queued"]["sheets"] < n and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    archive = threading.Thread(target=request, args=("archive", PRIORITY_ARCHIVE))
+    archive.start()
+    wait_queued(1)
+    live = threading.Thread(target=request, args=("live", PRIORITY_LIVE))
+    live.start()
+    wait_queued(2)
+    archive.join(5)
+    live.join(5)
+
+    assert order == ["live", "archive"]
@@ -0,0 +1,85 @@
+"""database 조회 테스트 (임시 SQLite 파일 사용)"""
+
+import pandas as pd
+import pytest
+
+import database
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "dashboard.db"))
+    database.init_database()
+    yield
+    database.close_connections()
+
+
+def save_daily(channel: str, start: str, revenues: list):
+    daily = pd.DataFrame({
+        "date": pd.date_range(start, periods=len(revenues), freq="D"),
+        "revenue": revenues,
+        "profit": [r // 10 for r in revenues],
+        "ad_cost": [r // 20 for r in revenues],
+    })
+    assert database.save_channel_daily_agg("sheet-id", channel, daily, "fp", has_ad_cost=True)
+
+
+def test_range_totals_single_day(db):
+    save_daily("이베이", "2025-11-01", [100, 200, 300])
+
+    totals = database.get_channel_range_totals("sheet-id", ["이베이"], "2025-11-02", "2025-11-02")
+
+    assert totals["이베이"] == {"revenue": 200, "profit": 20, "ad_cost": 10, "rows": 1, "has_ad_cost": True}
+
+
+def test_range_totals_past_last_day(db):
+    save_daily("이베이", "2025-11-01", [100, 200, 300])
+
+    # 마지막 날 이후까지 걸친 구간 → 마지막 날까지만 합산
+    totals = database.get_channel_range_totals("sheet-id", ["이베이"], "2025-11-02", "2025-12-31")
+    assert (totals["이베이"]["revenue"], totals["이베이"]["rows"]) == (500, 2)
+
+    # 통째로 마지막 날 이후인 구간 → 0
+    totals = database.get_channel_range_totals("sheet-id", ["이베이"], "2025-12-01", "2025-12-31")
+    assert (totals["이베이"]["revenue"], totals["이베이"]["rows"]) == (0, 0)
+
+
+def test_range_totals_skip_channels_without_aggregates(db):
+    save_daily("이베이", "2025-11-01", [100])
+
+    totals = database.get_channel_range_totals("sheet-id", ["이베이", "B2B"])
+
+    assert list(totals) == ["이베이"]
+
+
+def save_month(year_month: str, channel: str, revenue: int, profit: int):
+    summary = {"total_revenue": revenue, "total_profit": profit}
+    assert database.save_monthly_data(year_month, channel, summary, pd.DataFrame())
+
+
+def test_monthly_trend_missing_month_gives_null_comparison(db):
+    save_month("2024-10", "이베이", 1000, 100)
+    save_month("2025-10", "이베이", 1500, -50)
+    save_month("2025-11", "이베이", 3000, 150)
+
+    trend = database.get_monthly_trend(channels=["이베이"]).set_index("year_month")
+
+    # 2024-11이 없으므로 2025-11의 전년 동월 대비는 NULL, 전월 대비는 계산됨
+    assert pd.isna(trend.loc["2025-11", "revenue_yoy"])
+    assert pd.isna(trend.loc["2025-11", "profit_yoy"])
+    assert trend.loc["2025-11", "revenue_mom"] == pytest.approx(100.0)
+    # 적자 기준월이어도 부호 유지 (-50 → 150은 +400%)
+    assert trend.loc["2025-11", "profit_mom"] == pytest.approx(400.0)
+    assert trend.loc["2025-10", "revenue_yoy"] == pytest.approx(50.0)
+    # 2025-09가 없으므로 2025-10의 전월 대비는 NULL (12개월 전과 비교하지 않음)
+    assert pd.isna(trend.loc["2025-10", "revenue_mom"])
+
+
+def test_monthly_trend_compares_against_unselected_months(db):
+    save_month("2024-10", "이베이", 1000, 100)
+    save_month("2025-10", "이베이", 1500, 150)
+
+    trend = database.get_monthly_trend(months=["2025-10"])
+
+    assert trend["year_month"].tolist() == ["2025-10"]
+    assert trend.loc[0, "revenue_yoy"] == pytest.approx(50.0)
@@ -0,0 +1,48 @@
+"""sheet_parser 회귀 테스트"""
+
+import pandas as pd
+
+from dataframe_to_db import calculate_summary
+from sheet_parser import parse_sheet_values
+
+
+def test_error_token_in_sample_keeps_cleaned_strings():
+    # 타입 샘플에 오류 셀이 섞여도 콤마/%를 뗀 문자열로 남아 나머지 값을 살릴 수 있어야 함
+    values = [
+        ["Model", "순이익률", "정산매출"],
+        ["A", "#DIV/0!", "1,234"],
+        ["B", "12.5%", "N/A"],
+        ["C", "", "2,000"],
+    ]
+    df = parse_sheet_values(values)
+
+    assert df["순이익률"].tolist() == ["#DIV/0!", "12.5", ""]
+    assert df["정산매출"].tolist() == ["1234", "N/A", "2000"]
+    assert pd.to_numeric(df["순이익률"], errors="coerce").mean() == 12.5
+    assert calculate_summary(df)["avg_profit_rate"] == 12.5
+
+
+def test_error_token_in_typed_sample():
+    # 형식 없는 값(숫자)과 오류 문자열이 섞인 컬럼
+    values = [
+        ["Model", "순이익률"],
+        ["A", "#DIV/0!"],
+        ["B", 12.5],
+    ]
+    df = parse_sheet_values(values)
+
+    assert df["순이익률"].tolist() == ["#DIV/0!", "12.5"]
+    assert pd.to_numeric(df["순이익률"], errors="coerce").tolist()[1] == 12.5
+
+
+def test_numeric_columns_without_errors():
+    values = [
+        ["Model", "판매수량", "순이익률"],
+        ["A", "1,200", "10.5%"],
+        ["B", "3", "-2%"],
+    ]
+    df = parse_sheet_values(values)
+
+    assert df["판매수량"].dtype == "int64"
+    assert df["판매수량"].tolist() == [1200, 3]
+    assert df["순이익률"].dtype == "float32"
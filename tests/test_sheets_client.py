@@ -0,0 +1,66 @@
+"""sheets_client 스프레드시트 메타데이터 캐시 테스트 (네트워크 없이 가짜 HTTP 클라이언트 사용)"""
+
+from gspread.http_client import HTTPClient
+
+from sheets_client import SpreadsheetCache
+
+
+class FakeHTTP(HTTPClient):
+    def __init__(self, sheets):
+        self.sheets = sheets
+        self.metadata_calls = 0
+        self.ranges = []
+
+    def fetch_sheet_metadata(self, id, params=None):
+        self.metadata_calls += 1
+        return {
+            "spreadsheetId": id,
+            "properties": {"title": "테스트"},
+            "sheets": [
+                {"properties": {"sheetId": i, "title": title, "index": i,
+                                "gridProperties": {"rowCount": len(values), "columnCount": len(values[0])}}}
+                for i, (title, values) in enumerate(self.sheets.items())
+            ],
+        }
+
+    def values_get(self, id, range, params=None):
+        self.ranges.append(range)
+        title = range.split("!")[0].strip("'")
+        return {"range": range, "majorDimension": "ROWS", "values": self.sheets[title]}
+
+
+class FakeClient:
+    def __init__(self, sheets):
+        self.http_client = FakeHTTP(sheets)
+
+
+SHEETS = {
+    "이베이": [["날짜", "매출"], ["2025-11-01", "1,000"]],
+    "B2B": [["날짜", "매출"], ["2025-11-02", "2,000"]],
+}
+
+
+def test_cached_spreadsheet_builds_worksheets_from_one_metadata_fetch():
+    gc = FakeClient(SHEETS)
+    cache = SpreadsheetCache()
+
+    spreadsheet, worksheets = cache.get(gc, "sheet-id")
+
+    assert gc.http_client.metadata_calls == 1
+    assert spreadsheet.id == "sheet-id"
+    assert spreadsheet.title == "테스트"
+    assert list(worksheets) == ["이베이", "B2B"]
+    assert cache.titles(gc, "sheet-id") == ["이베이", "B2B"]
+    assert cache.worksheet(gc, "sheet-id", "B2B").get_all_values() == SHEETS["B2B"]
+    assert gc.http_client.metadata_calls == 1
+
+
+def test_cached_spreadsheet_supports_gspread_worksheet_api():
+    # 캐시된 Spreadsheet 객체가 gspread 공개 API(worksheets/worksheet)로도 동작해야 함
+    gc = FakeClient(SHEETS)
+    spreadsheet, _ = SpreadsheetCache().get(gc, "sheet-id")
+
+    assert [ws.title for ws in spreadsheet.worksheets()] == ["이베이", "B2B"]
+    ws = spreadsheet.worksheet("이베이")
+    assert ws.id == 0
+    assert ws.get_all_values() == SHEETS["이베이"]
@@ -0,0 +1,70 @@
+"""single_flight 동시 요청 합치기 테스트 (스레드 여러 개가 같은 키를 동시에 요청)"""
+
+import threading
+import time
+
+from single_flight import SingleFlight
+
+THREADS = 8
+
+
+def run_concurrently(group, func):
+    """THREADS개 스레드가 같은 키로 동시에 group.do 호출. 스레드별 (결과, 예외) 목록 반환"""
+    barrier = threading.Barrier(THREADS)
+    outcomes = [None] * THREADS
+
+    def worker(i):
+        barrier.wait()
+        try:
+            outcomes[i] = (group.do("sheet", func), None)
+        except Exception as e:
+            outcomes[i] = (None, e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return outcomes
+
+
+def blocking_call(group, calls, release, outcome):
+    """나머지 스레드가 모두 합류할 때까지 끝나지 않는 작업 (호출 횟수 기록)"""
+    def func():
+        calls.append(1)
+        deadline = time.monotonic() + 5
+        while group.stats()["shared"] < THREADS - 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        release.set()
+        return outcome()
+    return func
+
+
+def test_concurrent_callers_share_one_call():
+    group = SingleFlight()
+    calls, release = [], threading.Event()
+    result = {"rows": 3}
+
+    outcomes = run_concurrently(group, blocking_call(group, calls, release, lambda: result))
+
+    assert release.is_set()
+    assert len(calls) == 1
+    assert all(value is result and error is None for value, error in outcomes)
+    assert group.stats() == {"in_flight": 0, "leaders": 1, "shared": THREADS - 1}
+
+
+def test_error_reaches_every_waiter():
+    group = SingleFlight()
+    calls, release = [], threading.Event()
+    error = RuntimeError("조회 실패")
+
+    def fail():
+        raise error
+
+    outcomes = run_concurrently(group, blocking_call(group, calls, release, fail))
+
+    assert len(calls) == 1
+    assert all(value is None and raised is error for value, raised in outcomes)
+    # 끝난 작업은 캐시하지 않음 → 다음 호출은 새로 실행
+    assert group.do("sheet", lambda: "ok") == "ok"
+    assert group.stats()["leaders"] == 2
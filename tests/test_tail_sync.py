@@ -0,0 +1,131 @@
+"""일별 시트 증분 동기화 테스트 (끝부분 병합 + 스냅샷 저장, 네트워크 없이 가짜 HTTP 클라이언트 사용)"""
+
+import pytest
+from gspread.http_client import HTTPClient
+from gspread.utils import a1_range_to_grid_range
+
+import snapshot_cache
+from database import close_connections
+from sheets_client import fetch_tail_values, invalidate_spreadsheet_cache
+
+HEADER = ["날짜", "정산매출 합계", "순이익"]
+
+
+def make_values(days: int) -> list:
+    """제목 행 + 헤더 + 합계 행 + 일별 행 (get_all_values 형식)"""
+    rows = [[f"2025-11-{day:02d}", f"{day * 1000:,}", f"{day * 100:,}"] for day in range(1, days + 1)]
+    return [["이베이 11월", "", ""], HEADER, ["합계", "", ""]] + rows
+
+
+class FakeHTTP(HTTPClient):
+    def __init__(self, sheets):
+        self.sheets = sheets
+        self.full_fetches = 0
+        self.batch_ranges = []
+
+    def _slice(self, range):
+        title, _, cells = range.partition("!")
+        values = self.sheets[title.strip("'")]
+        grid = a1_range_to_grid_range(cells) if cells else {}
+        rows = values[grid.get("startRowIndex", 0):grid.get("endRowIndex", len(values))]
+        return [list(row[grid.get("startColumnIndex", 0):grid.get("endColumnIndex", len(row))]) for row in rows]
+
+    def fetch_sheet_metadata(self, id, params=None):
+        return {
+            "spreadsheetId": id,
+            "properties": {"title": "테스트"},
+            "sheets": [
+                {"properties": {"sheetId": i, "title": title, "index": i,
+                                "gridProperties": {"rowCount": len(values), "columnCount": len(values[0])}}}
+                for i, (title, values) in enumerate(self.sheets.items())
+            ],
+        }
+
+    def values_get(self, id, range, params=None):
+        self.full_fetches += 1
+        return {"range": range, "majorDimension": "ROWS", "values": self._slice(range)}
+
+    def values_batch_get(self, id, ranges, params=None):
+        self.batch_ranges.append(list(ranges))
+        return {"valueRanges": [{"range": r, "majorDimension": "ROWS", "values": self._slice(r)} for r in ranges]}
+
+
+class FakeClient:
+    def __init__(self, sheets):
+        self.http_client = FakeHTTP(sheets)
+
+
+@pytest.fixture
+def gc():
+    invalidate_spreadsheet_cache()
+    yield FakeClient({"이베이": make_values(20)})
+    invalidate_spreadsheet_cache()
+
+
+@pytest.fixture
+def snapshot_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_cache, "SNAPSHOT_DB_PATH", str(tmp_path / "snapshots.db"))
+    yield
+    close_connections()
+
+
+def test_appended_rows_are_merged_from_one_batch_get(gc):
+    previous = make_values(20)
+    gc.http_client.sheets["이베이"] = make_values(23)
+
+    merged = fetch_tail_values(gc, "sheet-id", "이베이", previous)
+
+    assert merged == make_values(23)
+    assert gc.http_client.full_fetches == 0
+    assert len(gc.http_client.batch_ranges) == 1
+
+
+def test_edited_tail_row_is_picked_up(gc):
+    previous = make_values(20)
+    current = make_values(20)
+    current[-1][2] = "-5,000"  # 최근 행의 순이익 수정 (다시 받는 구간 안)
+    gc.http_client.sheets["이베이"] = current
+
+    assert fetch_tail_values(gc, "sheet-id", "이베이", previous) == current
+
+
+def test_changed_header_forces_full_refetch(gc):
+    previous = make_values(20)
+    current = make_values(21)
+    current[1] = ["날짜", "정산매출 합계", "광고비"]
+    gc.http_client.sheets["이베이"] = current
+
+    assert fetch_tail_values(gc, "sheet-id", "이베이", previous) is None
+
+
+def test_fetch_and_save_merges_increments_and_falls_back_to_full_fetch(gc, snapshot_db):
+    full_fetches = []
+
+    def fetch(spreadsheet_id, sheet_name):
+        full_fetches.append(sheet_name)
+        return gc.http_client.sheets[sheet_name]
+
+    def incremental(spreadsheet_id, sheet_name, previous):
+        return fetch_tail_values(gc, spreadsheet_id, sheet_name, previous)
+
+    values, changed = snapshot_cache._fetch_and_save("sheet-id", "이베이", fetch, incremental)
+    assert changed and len(full_fetches) == 1
+
+    # 아래로 행 추가 → 끝부분만 받아 병합 (전체 조회 없음)
+    gc.http_client.sheets["이베이"] = make_values(22)
+    values, changed = snapshot_cache._fetch_and_save("sheet-id", "이베이", fetch, incremental, values)
+    assert changed and len(full_fetches) == 1
+    assert values == make_values(22)
+    assert snapshot_cache.load_snapshot("sheet-id", "이베이")[0] == make_values(22)
+
+    # 내용이 그대로면 스냅샷을 다시 쓰지 않음
+    values, changed = snapshot_cache._fetch_and_save("sheet-id", "이베이", fetch, incremental, values)
+    assert not changed and len(full_fetches) == 1
+
+    # 헤더가 바뀌면 병합하지 않고 전체를 다시 받음
+    current = make_values(22)
+    current[1] = ["날짜", "정산매출 합계", "광고비"]
+    gc.http_client.sheets["이베이"] = current
+    values, changed = snapshot_cache._fetch_and_save("sheet-id", "이베이", fetch, incremental, values)
+    assert changed and len(full_fetches) == 2
+    assert snapshot_cache.load_snapshot("sheet-id", "이베이")[0] == current